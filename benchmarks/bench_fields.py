@@ -0,0 +1,145 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark extracting only the fields required for a version-only diff.
+
+Usage: python -m benchmarks.bench_fields [NUMBER_OF_COMPONENTS]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.diff import process_packages
+from sbomdiff.fields import ALL_FIELDS, required_fields
+from sbomdiff.spdx_parser import SPDXParser
+
+LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause", "GPL-2.0-only", "ISC"]
+
+
+def generate_components(count):
+    components = []
+    for i in range(count):
+        license = LICENSES[i % len(LICENSES)]
+        if i % 3 == 0:
+            licenses = [{"license": {"id": license}}]
+        elif i % 3 == 1:
+            licenses = [{"expression": f"{license} OR MIT"}]
+        else:
+            licenses = [{"license": {"name": f"Custom {license}"}}]
+        components.append(
+            {
+                "type": "library",
+                "name": f"pkg{i}",
+                "version": f"1.{i % 10}.0",
+                "licenses": licenses,
+                "hashes": [{"alg": "SHA-256", "content": f"{i:064x}"}],
+            }
+        )
+    return components
+
+
+def lib4sbom_packages(components):
+    # Packages in the form returned by lib4sbom
+    return [
+        {
+            "name": component["name"],
+            "version": component["version"],
+            "type": "LIBRARY",
+            "licenseconcluded": LICENSES[i % len(LICENSES)],
+            "checksum": [["SHA256", component["hashes"][0]["content"]]],
+        }
+        for i, component in enumerate(components)
+    ]
+
+
+def write_spdx_tag(filename, components):
+    lines = ["SPDXVersion: SPDX-2.3", "DataLicense: CC0-1.0"]
+    for i, component in enumerate(components):
+        lines.append(f"PackageName: {component['name']}")
+        lines.append(f"SPDXID: SPDXRef-Package-{i}")
+        lines.append(f"PackageVersion: {component['version']}")
+        lines.append(f"PackageLicenseConcluded: {LICENSES[i % len(LICENSES)]}")
+    filename.write_text("\n".join(lines) + "\n")
+
+
+def write_spdx_rdf(filename, components):
+    lines = ['<rdf:RDF xmlns:spdx="http://spdx.org/rdf/terms#">']
+    for i, component in enumerate(components):
+        license = LICENSES[i % len(LICENSES)]
+        lines.append("  <spdx:Package>")
+        lines.append(f"    <spdx:name>{component['name']}</spdx:name>")
+        lines.append(
+            f"    <spdx:versionInfo>{component['version']}</spdx:versionInfo>"
+        )
+        lines.append(
+            "    <spdx:licenseConcluded "
+            f'rdf:resource="http://spdx.org/licenses/{license}"/>'
+        )
+        lines.append("  </spdx:Package>")
+    lines.append("</rdf:RDF>")
+    filename.write_text("\n".join(lines) + "\n")
+
+
+def benchmark(name, function, count, repeat=3):
+    elapsed = min(_time(function) for _ in range(repeat))
+    print(f"{name:44} {elapsed:8.3f}s {count / elapsed:12.0f} components/s")
+    return elapsed
+
+
+def _time(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def compare(name, function, count):
+    version_only = required_fields(exclude_license=True)
+    full = benchmark(f"{name} (all fields)", lambda: function(ALL_FIELDS), count)
+    projected = benchmark(
+        f"{name} (version only)", lambda: function(version_only), count
+    )
+    print(f"{'':44} speed-up {full / projected:6.2f}x")
+
+
+def main(count):
+    components = generate_components(count)
+    packages = lib4sbom_packages(components)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = Path(tmpdir)
+        cyclonedx_file = directory / "sbom.json"
+        sbom = {"bomFormat": "CycloneDX", "specVersion": "1.5"}
+        sbom["components"] = components
+        cyclonedx_file.write_text(json.dumps(sbom))
+        tag_file = directory / "sbom.spdx"
+        write_spdx_tag(tag_file, components)
+        rdf_file = directory / "sbom.spdx.rdf"
+        write_spdx_rdf(rdf_file, components)
+
+        compare(
+            "process_packages",
+            lambda fields: process_packages(packages, fields=fields),
+            count,
+        )
+        compare(
+            "CycloneDXParser JSON",
+            lambda fields: CycloneDXParser(fields=fields).parse(str(cyclonedx_file)),
+            count,
+        )
+        compare(
+            "SPDXParser tag",
+            lambda fields: SPDXParser(fields=fields).parse(str(tag_file)),
+            count,
+        )
+        compare(
+            "SPDXParser RDF",
+            lambda fields: SPDXParser(fields=fields).parse(str(rdf_file)),
+            count,
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
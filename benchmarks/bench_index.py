@@ -0,0 +1,83 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark comparing index files against comparing SBOMs.
+
+Usage: python -m benchmarks.bench_index [NUMBER_OF_COMPONENTS]
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.index import create_index
+from sbomdiff.table import open_table
+
+LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause", "GPL-2.0-only"]
+
+
+def write_sbom(filename, count, changed):
+    components = []
+    for i in range(count):
+        version = f"1.{i % 10}.{1 if i % changed == 0 else 0}"
+        components.append(
+            {
+                "type": "library",
+                "name": f"pkg{i}",
+                "version": version,
+                "licenses": [{"license": {"id": LICENSES[i % len(LICENSES)]}}],
+                "purl": f"pkg:pypi/pkg{i}@{version}",
+            }
+        )
+    sbom = {"bomFormat": "CycloneDX", "specVersion": "1.5", "components": components}
+    filename.write_text(json.dumps(sbom))
+
+
+def diff_sboms(file1, file2):
+    packages1, _ = parse_sbom(file1)
+    packages2, _ = parse_sbom(file2)
+    return list(SBOMDiff().compare(packages1, packages2))
+
+
+def diff_indexes(file1, file2):
+    return list(SBOMDiff().compare(open_table(file1), open_table(file2)))
+
+
+def benchmark(name, function, count):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:28} {elapsed:8.3f}s {count / elapsed:12.0f} components/s")
+    return elapsed, result
+
+
+def main(count):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = Path(tmpdir)
+        sbom1 = str(directory / "old.json")
+        sbom2 = str(directory / "new.json")
+        # One component in 100 is changed
+        write_sbom(Path(sbom1), count, count + 1)
+        write_sbom(Path(sbom2), count, 100)
+        index1 = sbom1 + ".sbomidx"
+        index2 = sbom2 + ".sbomidx"
+        benchmark("create index (once)", lambda: create_index(sbom1, index1), count)
+        create_index(sbom2, index2)
+        for filename in (sbom1, index1):
+            size = Path(filename).stat().st_size / 1024 / 1024
+            print(f"{Path(filename).name:28} {size:8.1f} MiB")
+        sbom_time, expected = benchmark(
+            "diff SBOMs", lambda: diff_sboms(sbom1, sbom2), count
+        )
+        index_time, records = benchmark(
+            "diff index files", lambda: diff_indexes(index1, index2), count
+        )
+        assert records == expected
+        print(f"{'':28} speed-up {sbom_time / index_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
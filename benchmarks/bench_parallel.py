@@ -0,0 +1,64 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark comparing package tables using several worker processes.
+
+Usage: python -m benchmarks.bench_parallel [NUMBER_OF_PACKAGES]
+"""
+
+import os
+import sys
+import time
+
+from benchmarks.bench_summary import generate_tables
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.parallel import parallel_compare, parallel_count
+
+
+def compare(packages1, packages2, jobs):
+    sbom_diff = SBOMDiff()
+    if jobs == 1:
+        return list(sbom_diff.compare(packages1, packages2))
+    return list(parallel_compare(sbom_diff, packages1, packages2, jobs))
+
+
+def count(packages1, packages2, jobs):
+    sbom_diff = SBOMDiff()
+    if jobs == 1:
+        sbom_diff.count_differences(packages1, packages2)
+    else:
+        parallel_count(sbom_diff, packages1, packages2, jobs)
+    return sbom_diff.get_summary()
+
+
+def benchmark(name, function, count):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:24} {elapsed:8.3f}s {count / elapsed:12.0f} packages/s")
+    return elapsed
+
+
+def main(number):
+    packages1, packages2 = generate_tables(number)
+    cpus = os.cpu_count() or 1
+    jobs = sorted({1, 2, 4, cpus})
+    print(f"{cpus} CPUs")
+    assert compare(packages1, packages2, 1) == compare(packages1, packages2, 2)
+    for function in (compare, count):
+        single = benchmark(
+            f"{function.__name__} (1 job)",
+            lambda: function(packages1, packages2, 1),
+            number,
+        )
+        for job_count in jobs[1:]:
+            elapsed = benchmark(
+                f"{function.__name__} ({job_count} jobs)",
+                lambda: function(packages1, packages2, job_count),
+                number,
+            )
+            print(f"{'':24} speed-up {single / elapsed:6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,69 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark rolling up differences by path prefix.
+
+The records are added to a PathTrie once; each rollup then only visits
+the nodes above the requested depth. The alternative is to scan every
+record again for each depth.
+
+Usage: python -m benchmarks.bench_pathtrie [NUMBER_OF_RECORDS]
+"""
+
+import sys
+import time
+from collections import Counter
+
+from sbomdiff.pathtrie import PathTrie, classify, split_path
+
+STATUSES = ("add", "remove", "change")
+DEPTHS = (1, 2, 3, 4)
+
+
+def generate_records(count):
+    records = []
+    for i in range(count):
+        path = f"/opt/team{i % 20}/service{i % 400}/bin/app{i % 2000}"
+        record = {"package": f"pkg{i}", "path": path, "status": STATUSES[i % 3]}
+        if record["status"] == "change":
+            record["version"] = {"from": "1.0", "to": "1.1", "direction": "upgrade"}
+        records.append(record)
+    return records
+
+
+def scan(records, depth):
+    groups = {}
+    for record in records:
+        prefix = "/".join(split_path(record["path"])[:depth])
+        groups.setdefault(prefix, Counter())[classify(record)] += 1
+    return groups
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main(count):
+    records = generate_records(count)
+    path_trie = PathTrie()
+    elapsed, _ = timed(lambda: path_trie.add_records(records))
+    print(f"{'build trie (once)':28} {elapsed:8.3f}s")
+    scan_total = 0
+    trie_total = 0
+    for depth in DEPTHS:
+        scan_time, expected = timed(lambda: scan(records, depth))
+        trie_time, groups = timed(lambda: dict(path_trie.groups(depth)))
+        assert groups == expected
+        scan_total += scan_time
+        trie_total += trie_time
+        print(
+            f"depth {depth}: {len(groups):6} groups   "
+            f"scan {scan_time:8.3f}s   trie {trie_time:8.4f}s"
+        )
+    print(f"{'':28} rollups {scan_total / trie_total:8.0f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
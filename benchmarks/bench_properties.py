@@ -0,0 +1,96 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark identification of location properties.
+
+Usage: python -m benchmarks.bench_properties [NUMBER_OF_COMPONENTS]
+"""
+
+import random
+import sys
+import time
+
+from sbomdiff.diff import process_packages
+from sbomdiff.properties import PathPropertyClassifier
+
+# Properties typically generated by syft, trivy and cdxgen
+PROPERTY_NAMES = [
+    "syft:package:foundBy",
+    "syft:package:language",
+    "syft:package:type",
+    "syft:package:metadataType",
+    "syft:cpe23",
+    "syft:location:0:layerID",
+    "aquasecurity:trivy:PkgID",
+    "aquasecurity:trivy:PkgType",
+    "aquasecurity:trivy:LayerDigest",
+    "aquasecurity:trivy:LayerDiffID",
+    "cdx:npm:package:development",
+    "cdx:maven:component_scope",
+    "cdx:pypi:requiresPython",
+    "internal:build:timestamp",
+    "internal:build:host",
+]
+
+
+def generate_components(count, properties_per_component=20):
+    random.seed(1)
+    components = []
+    for i in range(count):
+        properties = [
+            [random.choice(PROPERTY_NAMES), f"value{j}"]
+            for j in range(properties_per_component - 1)
+        ]
+        # Location is the last property so every property is examined
+        properties.append(["syft:location:0:path", f"/usr/bin/binary{i % 50}"])
+        components.append(
+            {
+                "name": f"pkg{i}",
+                "version": "1.0.0",
+                "licenseconcluded": "MIT",
+                "property": properties,
+            }
+        )
+    return components
+
+
+def inline_find_path(properties):
+    # Classification used before the classifier was introduced
+    for prop_name, prop_value in properties:
+        prop_name = prop_name.lower()
+        if ("location" in prop_name and "path" in prop_name) or prop_name.endswith(
+            ":path"
+        ):
+            return prop_value or ""
+    return ""
+
+
+def benchmark(name, function, count):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:40} {elapsed:8.3f}s {count / elapsed:12.0f} components/s")
+
+
+def main(count):
+    components = generate_components(count)
+    classifier = PathPropertyClassifier(["trivy", "cdxgen"])
+
+    def inline():
+        for component in components:
+            inline_find_path(component["property"])
+
+    def classify():
+        for component in components:
+            classifier.find_path(component["property"])
+
+    def process():
+        process_packages(components, path_classifier=classifier)
+
+    benchmark("inline classification", inline, count)
+    benchmark("PathPropertyClassifier", classify, count)
+    benchmark("process_packages", process, count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,83 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark counting differences against generating the full report.
+
+Usage: python -m benchmarks.bench_summary [NUMBER_OF_PACKAGES]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from sbomdiff.diff import SBOMDiff, format_record
+
+LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause", "GPL-2.0-only"]
+
+
+def generate_tables(count, change_ratio=0.3):
+    random.seed(1)
+    packages1 = {}
+    packages2 = {}
+    for i in range(count):
+        key = (f"pkg{i}", f"/usr/bin/binary{i % 50}")
+        license = random.choice(LICENSES)
+        packages1[key] = [f"1.{i % 10}.0", license, None]
+        change = random.random()
+        if change < change_ratio / 3:
+            # Package removed
+            continue
+        if change < change_ratio:
+            packages2[key] = [f"1.{i % 10}.1", random.choice(LICENSES), None]
+        else:
+            packages2[key] = packages1[key]
+    for i in range(int(count * change_ratio / 3)):
+        packages2[(f"new{i}", "")] = ["1.0.0", "MIT", None]
+    return packages1, packages2
+
+
+def full_report(packages1, packages2):
+    # Records and text lines built when the full report is generated
+    sbom_diff = SBOMDiff()
+    records = list(sbom_diff.compare(packages1, packages2))
+    lines = [line for record in records for line in format_record(record)]
+    lines.extend(sbom_diff.summary_lines())
+    return lines
+
+
+def summary_only(packages1, packages2):
+    sbom_diff = SBOMDiff()
+    sbom_diff.count_differences(packages1, packages2)
+    return sbom_diff.summary_lines()
+
+
+def benchmark(name, function, count):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:20} {elapsed:8.3f}s {count / elapsed:12.0f} packages/s "
+        f"{peak / 1024 / 1024:10.1f} MiB peak"
+    )
+    return elapsed
+
+
+def main(count):
+    packages1, packages2 = generate_tables(count)
+    assert full_report(packages1, packages2)[-5:] == summary_only(
+        packages1, packages2
+    )
+    full = benchmark("full report", lambda: full_report(packages1, packages2), count)
+    summary = benchmark(
+        "summary only", lambda: summary_only(packages1, packages2), count
+    )
+    print(f"{'':20} speed-up {full / summary:6.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,63 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark handing a package table to a worker process.
+
+A pickled table must be unpickled in full by every worker; a table in
+shared memory is attached to without copying and only the packages which
+are accessed are decoded.
+
+Usage: python -m benchmarks.bench_table [NUMBER_OF_PACKAGES]
+"""
+
+import pickle
+import random
+import sys
+import time
+
+from benchmarks.bench_summary import generate_tables
+from sbomdiff.table import SharedPackageTable
+
+LOOKUPS = 10000
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def report(name, elapsed, detail=""):
+    print(f"{name:36} {elapsed:8.3f}s {detail}")
+
+
+def main(count):
+    packages, _ = generate_tables(count)
+    random.seed(2)
+    keys = random.sample(list(packages), min(LOOKUPS, len(packages)))
+
+    elapsed, pickled = timed(lambda: pickle.dumps(packages, pickle.HIGHEST_PROTOCOL))
+    report("pickle: dumps (once)", elapsed, f"{len(pickled) / 1024 / 1024:8.1f} MiB")
+    unpickle, table = timed(lambda: pickle.loads(pickled))
+    report("pickle: loads (each worker)", unpickle)
+    elapsed, _ = timed(lambda: [table[key] for key in keys])
+    report(f"pickle: {len(keys)} lookups", elapsed)
+
+    elapsed, shared = timed(lambda: SharedPackageTable.create(packages))
+    size = shared.memory.size / 1024 / 1024
+    report("shared: encode (once)", elapsed, f"{size:8.1f} MiB")
+    try:
+        attach, attached = timed(lambda: SharedPackageTable.attach(shared.name))
+        report("shared: attach (each worker)", attach)
+        elapsed, _ = timed(lambda: [attached.table[key] for key in keys])
+        report(f"shared: {len(keys)} lookups", elapsed)
+        elapsed, _ = timed(lambda: sum(1 for _ in attached.table.items()))
+        report("shared: decode every package", elapsed)
+        attached.close()
+    finally:
+        shared.close()
+    print(f"{'':36} hand-off per worker {unpickle / attach:10.0f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
@@ -0,0 +1,68 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Benchmark classification of version changes.
+
+Usage: python -m benchmarks.bench_versions [NUMBER_OF_CHANGES]
+"""
+
+import random
+import sys
+import time
+
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.versions import classify_version_change, parse_version
+
+
+def generate_versions(count):
+    random.seed(1)
+    templates = [
+        "{0}.{1}.{2}",
+        "v{0}.{1}.{2}",
+        "go1.{0}.{1}",
+        "{0}.{1}-{2}ubuntu{1}",
+        "{0}.{1}.{2}-{1}.el8",
+        "{0}.{1}rc{2}",
+    ]
+    pairs = []
+    for _ in range(count):
+        template = random.choice(templates)
+        values = [random.randint(0, 30) for _ in range(3)]
+        version1 = template.format(*values)
+        values[random.randint(0, 2)] += random.choice([-1, 1])
+        version2 = template.format(*values)
+        pairs.append((version1, version2))
+    return pairs
+
+
+def benchmark(name, function, count):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:40} {elapsed:8.3f}s {count / elapsed:12.0f} changes/s")
+
+
+def main(count):
+    pairs = generate_versions(count)
+
+    def classify():
+        for version1, version2 in pairs:
+            classify_version_change(version1, version2)
+
+    parse_version.cache_clear()
+    benchmark("classify (cold cache)", classify, count)
+    benchmark("classify (warm cache)", classify, count)
+    print("cache", parse_version.cache_info())
+
+    packages1 = {(f"pkg{i}", ""): [v1, "MIT", None] for i, (v1, _) in enumerate(pairs)}
+    packages2 = {(f"pkg{i}", ""): [v2, "MIT", None] for i, (_, v2) in enumerate(pairs)}
+
+    def compare():
+        for _ in SBOMDiff().compare(packages1, packages2):
+            pass
+
+    benchmark("SBOMDiff.compare", compare, count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
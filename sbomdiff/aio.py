@@ -0,0 +1,114 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""asyncio interface for parsing and comparing SBOMs.
+
+Reading and parsing a SBOM is performed in an executor so that the event
+loop is never blocked. By default the loop's default executor is used; a
+ProcessPoolExecutor can be provided for CPU heavy workloads.
+"""
+
+import asyncio
+import functools
+
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.fields import required_fields
+from sbomdiff.source import source_name
+
+
+def _next_batch(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            break
+    return batch
+
+
+class AsyncSBOMDiff:
+    """Compares two SBOMs without blocking the event loop.
+
+    Each instance maintains its own counts of differences so many
+    comparisons can be run concurrently using separate instances. The
+    counts are reset at the start of each comparison, so the summary is
+    that of the last comparison.
+
+    Args:
+        sbom_type: Type of SBOM (auto, spdx or cyclonedx)
+        exclude_license: Suppress reporting of license differences
+        checksum: Checksum algorithm to use in the comparison
+        executor: Executor used to read and parse SBOMs
+        batch_size: Number of records generated in each step of a comparison
+    """
+
+    def __init__(
+        self,
+        sbom_type="auto",
+        exclude_license=False,
+        checksum="",
+        executor=None,
+        batch_size=1000,
+    ):
+        self.sbom_type = sbom_type
+        self.executor = executor
+        self.batch_size = batch_size
+        self.sbom_diff = SBOMDiff(exclude_license=exclude_license, checksum=checksum)
+        self.fields = required_fields(exclude_license, checksum)
+
+    async def parse(self, sbom_file):
+        """Return the package table and SBOM type of a SBOM.
+
+        The SBOM is a filename or its content as a buffer or binary file
+        object (see load_sbom).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                parse_sbom, sbom_file, self.sbom_type, fields=self.fields
+            ),
+        )
+
+    async def compare(self, packages1, packages2):
+        """Asynchronously generate the difference records of two package tables.
+
+        Records are generated in batches in a worker thread, so large
+        comparisons do not block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self.sbom_diff.reset()
+        records = self.sbom_diff.compare(packages1, packages2)
+        while True:
+            batch = await loop.run_in_executor(
+                None, _next_batch, records, self.batch_size
+            )
+            for record in batch:
+                yield record
+            if len(batch) < self.batch_size:
+                break
+
+    async def diff(self, file1, file2):
+        """Asynchronously generate the difference records of two SBOM files."""
+        (packages1, _), (packages2, _) = await asyncio.gather(
+            self.parse(file1), self.parse(file2)
+        )
+        async for record in self.compare(packages1, packages2):
+            yield record
+
+    def has_differences(self):
+        return self.sbom_diff.has_differences()
+
+    def get_summary(self):
+        return self.sbom_diff.get_summary()
+
+    def generate_document(self, file1, file2, differences):
+        return self.sbom_diff.generate_document(file1, file2, differences)
+
+
+async def diff_sboms(file1, file2, **kwargs):
+    """Return the document reported by --format json for two SBOMs."""
+    sbom_diff = AsyncSBOMDiff(**kwargs)
+    differences = [record async for record in sbom_diff.diff(file1, file2)]
+    return sbom_diff.generate_document(
+        source_name(file1), source_name(file2), differences
+    )
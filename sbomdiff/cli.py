@@ -8,63 +8,33 @@ import sys
 import textwrap
 from collections import ChainMap
 
-from lib4sbom.data.package import SBOMPackage
 from lib4sbom.output import SBOMOutput
-from lib4sbom.parser import SBOMParser
 
+from sbomdiff.diff import (  # noqa: F401
+    SBOMDiff,
+    format_dependencies,
+    format_package_display,
+    format_record,
+    load_packages,
+    load_sbom,
+    parse_sbom,
+    process_packages,
+)
+from sbomdiff.fields import required_fields
+from sbomdiff.filters import PackageFilter
+from sbomdiff.graph import dependency_edges
+from sbomdiff.multimap import get_instances
+from sbomdiff.parallel import parallel_compare, parallel_count
+from sbomdiff.pathtrie import PathTrie
+from sbomdiff.properties import PathPropertyClassifier
+from sbomdiff.purl import PurlIndex
+from sbomdiff.render import TextRenderer
+from sbomdiff.source import STDIN
+from sbomdiff.stringpool import StringPool, table_strings
+from sbomdiff.table import is_table_file, open_table
 from sbomdiff.version import VERSION
-
-
-def format_package_display(package_key):
-    """Format package key for display.
-
-    Package keys are tuples of (name, path). When path is present,
-    show the binary name in parentheses for context.
-
-    Args:
-        package_key: Tuple of (name, path)
-
-    Returns:
-        Formatted string like "name" or "name (binary)"
-    """
-    name, path = package_key
-    if path:
-        # Extract filename from path
-        binary = path.rsplit("/", 1)[-1]
-        return f"{name} ({binary})"
-    return name
-
-
-def process_packages(package_list):
-    packages = {}
-    thepackage = SBOMPackage()
-    for package in package_list:
-        thepackage.initialise()
-        thepackage.copy_package(package)
-        name = thepackage.get_name()
-        version = thepackage.get_value("version")
-        name = thepackage.get_name()
-        license = thepackage.get_value("licenseconcluded")
-        if license is None:
-            license = "UNKNOWN"
-        checksums = thepackage.get_value("checksum")
-        properties = thepackage.get_value("properties")
-        # Special handling for Syft SBOMs
-        path = ""
-        properties = thepackage.get_value("properties")
-        if properties is not None:
-            for prop in properties:
-                prop_name = prop.get("name", "").lower()
-                # Look for properties with location/path semantics
-                if (
-                    "location" in prop_name and "path" in prop_name
-                ) or prop_name.endswith(":path"):
-                    path = prop.get("value", "")
-                    break
-        package_key = (name, path) if path else (name, "")
-        if package_key not in packages and version is not None:
-            packages[package_key] = [version, license, checksums]
-    return packages
+from sbomdiff.versions import DOWNGRADE, UPGRADE
+from sbomdiff.watch import WatchedFile, watch
 
 
 # CLI processing
@@ -72,6 +42,14 @@ def process_packages(package_list):
 
 def main(argv=None):
     argv = argv or sys.argv
+    if len(argv) > 1 and argv[1] == "serve":
+        from sbomdiff import server
+
+        return server.main(argv[2:])
+    if len(argv) > 1 and argv[1] == "index":
+        from sbomdiff import index
+
+        return index.main(argv[2:])
     parser = argparse.ArgumentParser(
         prog="sbomdiff",
         description=textwrap.dedent("""
@@ -112,6 +90,55 @@ def main(argv=None):
         default="",
         help="specify checksum algorithm to use in comparison",
     )
+    input_group.add_argument(
+        "--match",
+        action="store",
+        default="name",
+        choices=["name", "purl"],
+        help="specify how packages are matched; purl falls back to name "
+        "for packages without a purl (default: name)",
+    )
+    input_group.add_argument(
+        "--path-property",
+        action="append",
+        metavar="NAME",
+        help="name of a property which holds the location of a package, or "
+        "the name of a tool (syft, trivy, cdxgen) to use its properties; "
+        "may be repeated",
+    )
+    input_group.add_argument(
+        "--dependencies",
+        action="store_true",
+        help="report differences in the dependencies between components",
+    )
+    input_group.add_argument(
+        "--include",
+        action="append",
+        metavar="FILTER",
+        help="only compare packages matching FILTER (FIELD:PATTERN where FIELD is "
+        "name, purl, type or path, e.g. purl:npm or path:/usr/bin/); "
+        "may be repeated",
+    )
+    input_group.add_argument(
+        "--exclude",
+        action="append",
+        metavar="FILTER",
+        help="do not compare packages matching FILTER; may be repeated",
+    )
+    input_group.add_argument(
+        "--renames",
+        action="store_true",
+        help="report removed and added packages with similar names as renamed",
+    )
+    input_group.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=int,
+        default=1,
+        help="number of worker processes used to compare the packages "
+        "(default: 1)",
+    )
     output_group = parser.add_argument_group("Output")
     output_group.add_argument(
         "-d",
@@ -135,10 +162,71 @@ def main(argv=None):
         choices=["text", "json", "yaml"],
         help="specify format of output file (default: text)",
     )
+    output_group.add_argument(
+        "--sort",
+        action="store",
+        choices=["name", "path", "status"],
+        help="report differences sorted by name, path or status "
+        "(default: order of packages in the SBOMs)",
+    )
+    output_group.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="only report the number of differences",
+    )
+    output_group.add_argument(
+        "--group-by-path",
+        action="store_true",
+        help="also report the number of differences at each package location "
+        "(e.g. each binary)",
+    )
+    output_group.add_argument(
+        "--path-depth",
+        action="store",
+        type=int,
+        metavar="DEPTH",
+        help="with --group-by-path, combine the locations within each path of "
+        "DEPTH components (e.g. 2 for /usr/bin)",
+    )
+    output_group.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="do not report differences; only set the return code",
+    )
+    output_group.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="with --quiet, stop comparing at the first difference",
+    )
+    output_group.add_argument(
+        "--watch",
+        action="store_true",
+        help="report the differences again whenever either SBOM file changes",
+    )
+    output_group.add_argument(
+        "--interval",
+        action="store",
+        type=float,
+        default=1.0,
+        help="number of seconds between checks for changes in watch mode "
+        "(default: 1.0)",
+    )
+    direction_group = output_group.add_mutually_exclusive_group()
+    direction_group.add_argument(
+        "--only-upgrades",
+        action="store_true",
+        help="only report packages whose version has been upgraded",
+    )
+    direction_group.add_argument(
+        "--only-downgrades",
+        action="store_true",
+        help="only report packages whose version has been downgraded",
+    )
     parser.add_argument("-V", "--version", action="version", version=VERSION)
 
-    parser.add_argument("FILE1", help="first SBOM file")
-    parser.add_argument("FILE2", help="second SBOM file")
+    parser.add_argument("FILE1", help="first SBOM file (- for standard input)")
+    parser.add_argument("FILE2", help="second SBOM file (- for standard input)")
 
     defaults = {
         "output_file": "",
@@ -146,7 +234,24 @@ def main(argv=None):
         "exclude_license": False,
         "debug": False,
         "format": "text",
-        "checksum": ""
+        "checksum": "",
+        "dependencies": False,
+        "renames": False,
+        "jobs": 1,
+        "include": [],
+        "exclude": [],
+        "match": "name",
+        "path_property": [],
+        "sort": None,
+        "summary_only": False,
+        "group_by_path": False,
+        "path_depth": None,
+        "quiet": False,
+        "fail_fast": False,
+        "watch": False,
+        "interval": 1.0,
+        "only_upgrades": False,
+        "only_downgrades": False,
     }
     raw_args = parser.parse_args(argv[1:])
     args = {key: value for key, value in vars(raw_args).items() if value}
@@ -156,12 +261,10 @@ def main(argv=None):
     if args["FILE1"] != args["FILE2"]:
         # Check both files exist
         file_found = True
-        if not pathlib.Path(args["FILE1"]).exists():
-            print(f"{args['FILE1']} does not exist")
-            file_found = False
-        if not pathlib.Path(args["FILE2"]).exists():
-            print(f"{args['FILE2']} does not exist")
-            file_found = False
+        for filename in (args["FILE1"], args["FILE2"]):
+            if filename != STDIN and not pathlib.Path(filename).exists():
+                print(f"{filename} does not exist")
+                file_found = False
         if not file_found:
             return -1
     else:
@@ -169,16 +272,102 @@ def main(argv=None):
         print("Must specify different filenames")
         return -1
 
-    sbom_parser = SBOMParser(sbom_type=args["sbom"])
+    # Checked on raw_args as falsy values (e.g. 0) are not in args
+    if raw_args.jobs < 1:
+        print("Number of jobs must be at least 1")
+        return -1
+
+    if raw_args.path_depth is not None:
+        if not args["group_by_path"]:
+            print("--path-depth requires --group-by-path")
+            return -1
+        if raw_args.path_depth < 1:
+            print("Path depth must be at least 1")
+            return -1
+
+    if raw_args.interval <= 0:
+        print("Interval must be greater than 0")
+        return -1
+
+    if args["watch"] and STDIN in (args["FILE1"], args["FILE2"]):
+        print("--watch cannot be used with standard input")
+        return -1
+
+    # Same index used for both files so that purls are only held once
+    purl_index = PurlIndex() if args["match"] == "purl" else None
+    # Strings shared by both files are only held once
+    string_pool = StringPool()
+    path_classifier = PathPropertyClassifier(args["path_property"])
+    try:
+        package_filter = PackageFilter(args["include"], args["exclude"])
+    except ValueError as error:
+        print(error)
+        return -1
+
+    # Only extract the package fields which are compared
+    fields = required_fields(args["exclude_license"], args["checksum"])
+
+    # Index files hold the packages of a SBOM which has already been parsed
+    indexed = is_table_file(args["FILE1"]) or is_table_file(args["FILE2"])
+    if indexed:
+        for option in ("dependencies", "include", "exclude", "path_property"):
+            if args[option]:
+                print(f"--{option.replace('_', '-')} cannot be used with index files")
+                return -1
+        if args["match"] != "name":
+            print("--match cannot be used with index files")
+            return -1
+
+    if args["fail_fast"] and not args["quiet"]:
+        print("--fail-fast requires --quiet")
+        return -1
+    # Both SBOMs are parsed as for the full comparison, which then stops at
+    # the first difference. Version directions need every difference and
+    # index files are compared by a merge join.
+    stop_early = args["fail_fast"] and not (
+        args["only_upgrades"] or args["only_downgrades"] or indexed
+    )
+
+    def load(filename):
+        if is_table_file(filename):
+            return None, open_table(filename)
+        return load_packages(
+            filename,
+            args["sbom"],
+            purl_index,
+            string_pool,
+            path_classifier,
+            package_filter,
+            fields,
+        )
+
+    def load_error(watched, error):
+        # Previous content of the file is still compared
+        reason = str(error) or type(error).__name__
+        print(f"Unable to load {watched.filename}: {reason}")
+
+    def load_file(filename):
+        watched = WatchedFile(filename, load, load_error)
+        if filename == STDIN:
+            # Standard input can only be read once so is never watched
+            watched.data = load(filename)
+        else:
+            watched.refresh()
+        return watched
+
     # Extract packages from each file
-    sbom_parser.parse_file(args["FILE1"])
-    packages1 = process_packages(sbom_parser.get_packages())
-    file1_type = sbom_parser.get_type()
-    # Ensure parser is set to default
-    sbom_parser.set_type(sbom_type=args["sbom"])
-    sbom_parser.parse_file(args["FILE2"])
-    packages2 = process_packages(sbom_parser.get_packages())
-    file2_type = sbom_parser.get_type()
+    file1 = load_file(args["FILE1"])
+    sbom_parser1, packages1 = file1.data
+    file1_type = "index" if sbom_parser1 is None else sbom_parser1.get_type()
+    file2 = load_file(args["FILE2"])
+    sbom_parser2, packages2 = file2.data
+    file2_type = "index" if sbom_parser2 is None else sbom_parser2.get_type()
+
+    version_filter = None
+    if args["only_upgrades"]:
+        version_filter = UPGRADE
+    elif args["only_downgrades"]:
+        version_filter = DOWNGRADE
 
     if args["debug"]:
         print("SBOM type", args["sbom"])
@@ -190,175 +379,150 @@ def main(argv=None):
         print("SBOM File2", args["FILE2"])
         print("SBOM File2 - type", file2_type)
         print("SBOM File2 - packages", len(packages2))
+        print("String pool - strings", len(string_pool))
+        print("String pool - bytes saved", string_pool.saved)
         print("Exclude Licences", args["exclude_license"])
         print("Checksum algorithm", args["checksum"])
+        print("Match", args["match"])
+        print("Path properties", args["path_property"])
+        print("Include", args["include"])
+        print("Exclude", args["exclude"])
+        print("Version filter", version_filter)
+        print("Sort", args["sort"])
+        print("Dependencies", args["dependencies"])
+        print("Renames", args["renames"])
+        print("Jobs", args["jobs"])
+        print("Summary only", args["summary_only"])
+        print("Group by path", args["group_by_path"])
+        print("Path depth", args["path_depth"])
+        print("Quiet", args["quiet"])
+        print("Fail fast", args["fail_fast"])
+        print("Watch", args["watch"])
 
-    # Keep count of differences
-    version_changes = 0
-    new_packages = 0
-    removed_packages = 0
-    license_changes = 0
-    checksum_changes = 0
-
-    sbom_out = SBOMOutput(args["output_file"], args["format"])
-
-    if args["format"] != "text":
-        diff_doc = []
-
-    for package_key in packages1:
-        package_info = dict()
-        package_display = format_package_display(package_key)
-        package_name, package_path = package_key
-        if package_key in packages2:
-            # Compare values for common package
-            version1, license1, checksums1 = packages1[package_key]
-            version2, license2, checksums2 = packages2[package_key]
-            version1 = version1.upper()
-            version2 = version2.upper()
-            package_info["package"] = package_name
-            if package_path:
-                package_info["path"] = package_path
-            diff_record = False
-            if version1 != version2:
-                if len(version1) == 0:
-                    version1 = "UNKNOWN"
-                if len(version2) == 0:
-                    version2 = "UNKNOWN"
-                if args["format"] == "text":
-                    sbom_out.send_output(
-                        f"[VERSION] {package_display}: "
-                        f"Version changed from {version1} to {version2}"
-                    )
-                package_info["status"] = "change"
-                version_info = dict()
-                version_info["from"] = version1
-                version_info["to"] = version2
-                package_info["version"] = version_info
-                version_changes += 1
-                diff_record = True
-            if not args["exclude_license"] and license1 != license2:
-                if args["format"] == "text":
-                    sbom_out.send_output(
-                        f"[LICENSE] {package_display}: "
-                        f"License changed from {license1} to {license2}"
-                    )
-                package_info["status"] = "change"
-                license_info = dict()
-                license_info["from"] = license1
-                license_info["to"] = license2
-                package_info["license"] = license_info
-                license_changes += 1
-                diff_record = True
-            if args["checksum"] != "" and checksums1 is not None and checksums2 is not None:
-                # compare checksums
-                value1 = value2 = None
-                for checksum in checksums1:
-                    if checksum[0] == args["checksum"]:
-                        value1 = checksum[1]
-                        break
-                for checksum in checksums2:
-                    if checksum[0] == args["checksum"]:
-                        value2 = checksum[1]
-                        break
-                if value1 is not None and value2 is not None:
-                    if value1 != value2:
-                        if args["format"] == "text":
-                            sbom_out.send_output(
-                                f"[CHECKSUM] {package_display}: "
-                                f"Checksum changed from {value1} to {value2}"
-                            )
-                        package_info["status"] = "change"
-                        checksum_info = dict()
-                        checksum_info["from"] = value1
-                        checksum_info["to"] = value2
-                        package_info["checksum"] = checksum_info
-                        checksum_changes += 1
-                        diff_record = True
+    sbom_diff = SBOMDiff(
+        exclude_license=args["exclude_license"],
+        checksum=args["checksum"],
+        version_filter=version_filter,
+        purl_index=purl_index,
+    )
+
+    def compare(packages1, packages2):
+        if args["jobs"] > 1:
+            return parallel_compare(
+                sbom_diff, packages1, packages2, args["jobs"], args["sort"]
+            )
+        if args["sort"] is None:
+            return sbom_diff.compare(packages1, packages2)
+        return sbom_diff.compare_sorted(packages1, packages2, args["sort"])
+
+    def count(packages1, packages2):
+        if args["jobs"] > 1:
+            parallel_count(sbom_diff, packages1, packages2, args["jobs"])
         else:
-            # Package must have been removed
-            version1, license1, _ = packages1[package_key]
-            version1 = version1.upper()
-            package_info["package"] = package_name
-            if package_path:
-                package_info["path"] = package_path
-            if len(version1) == 0:
-                version1 = "UNKNOWN"
+            sbom_diff.count_differences(packages1, packages2)
+
+    def report(changed_files=None):
+        sbom_parser1, packages1 = file1.data
+        sbom_parser2, packages2 = file2.data
+        if changed_files is not None:
+            sbom_diff.reset()
+            # Strings and purls only used by the previous content of the
+            # changed files are released
+            tables = [
+                packages
+                for sbom_parser, packages in (file1.data, file2.data)
+                if sbom_parser is not None
+            ]
+            string_pool.retain(
+                value for packages in tables for value in table_strings(packages)
+            )
+            if purl_index is not None:
+                purl_index.retain(
+                    package_key[0] for packages in tables for package_key in packages
+                )
+            if args["debug"]:
+                for changed_file in changed_files:
+                    print("SBOM changed", changed_file.filename)
+        if args["dependencies"]:
+            sbom_diff.compare_dependencies(
+                dependency_edges(sbom_parser1.get_relationships()),
+                dependency_edges(sbom_parser2.get_relationships()),
+            )
+
+        # Differences are grouped by location as the records are generated
+        path_trie = PathTrie() if args["group_by_path"] else None
+        path_depth = args["path_depth"]
+
+        if args["quiet"] and stop_early:
+            # Only the first difference is needed for the return code
+            difference = sbom_diff.first_difference(
+                packages1,
+                (
+                    (package_key, instance)
+                    for package_key, package in packages2.items()
+                    for instance in get_instances(package)
+                ),
+            )
+            if args["debug"]:
+                print("First difference", difference)
+            if difference is not None:
+                return 1
+        elif args["quiet"]:
+            # Renamed packages are still differences
+            count(packages1, packages2)
+        elif args["summary_only"]:
+            if args["renames"] or path_trie is not None:
+                records = compare(packages1, packages2)
+                if args["renames"]:
+                    # Renames are identified from the removed and added records
+                    records = sbom_diff.detect_renames(records)
+                if path_trie is not None:
+                    path_trie.add_records(records)
+            else:
+                count(packages1, packages2)
             if args["format"] == "text":
-                sbom_out.send_output(
-                    f"[REMOVED] {package_display}: (Version {version1})"
+                TextRenderer(args["output_file"]).render_summary(
+                    sbom_diff, path_trie, path_depth
                 )
-            package_info["status"] = "remove"
-            version_info = dict()
-            version_info["from"] = version1
-            package_info["version"] = version_info
-            removed_packages += 1
-            diff_record = True
-        if args["format"] != "text" and diff_record:
-            diff_doc.append(package_info)
-    # Check for any new packages
-    for package_key in packages2:
-        if package_key not in packages1:
-            package_display = format_package_display(package_key)
-            package_name, package_path = package_key
-            version2, license2, _ = packages2[package_key]
-            version2 = version2.upper()
-            if len(version2) == 0:
-                version2 = "UNKNOWN"
+            else:
+                sbom_out = SBOMOutput(args["output_file"], args["format"])
+                diff_doc = sbom_diff.generate_document(args["FILE1"], args["FILE2"])
+                if path_trie is not None:
+                    diff_doc["paths"] = path_trie.generate_document(path_depth)
+                sbom_out.generate_output(diff_doc)
+        else:
+            records = compare(packages1, packages2)
+            if args["renames"]:
+                records = sbom_diff.detect_renames(records)
+            if path_trie is not None:
+                records = path_trie.collect(records)
+
             if args["format"] == "text":
-                sbom_out.send_output(
-                    f"[ADDED  ] {package_display}: (Version {version2}) (License {license2})"
-                )  # HPE Added license to text output
+                TextRenderer(args["output_file"]).render(
+                    sbom_diff, records, path_trie, path_depth
+                )
             else:
-                package_info = dict()
-                package_info["package"] = package_name
-                if package_path:
-                    package_info["path"] = package_path
-                package_info["status"] = "add"
-                version_info = dict()
-                version_info["from"] = version2
-                package_info["version"] = version_info
-                license_info = dict()  # HPE - Adding license dictionary
-                license_info["to"] = license2  # HPE - Adding the new license
-                package_info["license"] = (
-                    license_info  # HPE - Adding license_info to package_info
+                sbom_out = SBOMOutput(args["output_file"], args["format"])
+                diff_doc = sbom_diff.generate_document(
+                    args["FILE1"], args["FILE2"], list(records)
                 )
-                diff_doc.append(package_info)
-            new_packages += 1
-    if args["format"] == "text":
-        sbom_out.send_output("\nSummary\n-------")
-        sbom_out.send_output(f"Version changes:  {version_changes}")
-        if not args["exclude_license"]:
-            sbom_out.send_output(f"License changes:  {license_changes}")
-        sbom_out.send_output(f"Removed packages: {removed_packages}")
-        sbom_out.send_output(f"New packages:     {new_packages}")
-        if args["checksum"] != "":
-            sbom_out.send_output(f"Checksum changes: {checksum_changes}")
-
-    if args["format"] != "text":
-        json_doc = {}
-        tool = dict()
-        tool["name"] = "sbomdiff"
-        tool["version"] = VERSION
-        json_doc["tool"] = tool
-        json_doc["file_1"] = args["FILE1"]
-        json_doc["file_2"] = args["FILE2"]
-        json_doc["differences"] = diff_doc
-        summary = dict()
-        summary["version_changes"] = version_changes
-        summary["new_packages"] = new_packages
-        summary["removed_packages"] = removed_packages
-        if not args["exclude_license"]:
-            summary["license_changes"] = license_changes
-        if args["checksum"] != "":
-            summary["checksum_changes"] = checksum_changes
-        json_doc["summary"] = summary
-        sbom_out.generate_output(json_doc)
-
-    # Return code indicates if any differences have been detected
-    if (version_changes or license_changes or removed_packages or new_packages or checksum_changes) != 0:
-        return 1
-
-    return 0
+                if path_trie is not None:
+                    diff_doc["paths"] = path_trie.generate_document(path_depth)
+                sbom_out.generate_output(diff_doc)
+
+        # Return code indicates if any differences have been detected
+        if sbom_diff.has_differences():
+            return 1
+
+        return 0
+
+    result = report()
+    if args["watch"]:
+        # Only the files which have changed are parsed again
+        changed_result = watch([file1, file2], report, args["interval"])
+        if changed_result is not None:
+            result = changed_result
+    return result
 
 
 if __name__ == "__main__":
@@ -5,34 +5,140 @@ import json
 
 import defusedxml.ElementTree as ET
 
+from sbomdiff.detect import detect_format
+from sbomdiff.fields import ALL_FIELDS, LICENSE
+from sbomdiff.multimap import add_instance
+from sbomdiff.properties import DEFAULT_CLASSIFIER
+from sbomdiff.source import open_binary, open_text, resolve
+
+# Types of component which are compared as packages
+PACKAGE_TYPES = ("library", "application", "operating-system")
+
+_END = object()
+
+
+def walk_components(components, get_children, get_reference):
+    """Generate (component, parent reference) for a hierarchy of components.
+
+    Components nested within other components are generated after their
+    parent in document order. An explicit stack of iterators is used
+    rather than recursion, so only one iterator is held for each level
+    of nesting however deep or wide the hierarchy is.
+
+    Args:
+        components: Iterable of top level components
+        get_children: Function returning the nested components of a
+            component, or None
+        get_reference: Function returning the reference of a component
+
+    Returns:
+        Generator of (component, parent reference); the parent reference
+        of a top level component is None
+    """
+    stack = [(iter(components), None)]
+    while stack:
+        children, parent = stack[-1]
+        component = next(children, _END)
+        if component is _END:
+            stack.pop()
+            continue
+        yield component, parent
+        nested = get_children(component)
+        if nested is not None:
+            stack.append((iter(nested), get_reference(component)))
+
 
 class CycloneDXParser:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        purl_index=None,
+        path_classifier=None,
+        package_filter=None,
+        fields=ALL_FIELDS,
+        component_types=PACKAGE_TYPES,
+    ):
+        # If a PurlIndex is provided, packages are matched using purls
+        self.purl_index = purl_index
+        # If a PackageFilter is provided, only selected packages are stored
+        self.package_filter = package_filter or None
+        # Licenses are only extracted if they are in the projected fields
+        self.licenses = LICENSE in fields
+        # Types of component which are packages; None selects every type
+        self.component_types = component_types
+        if path_classifier is None:
+            path_classifier = DEFAULT_CLASSIFIER
+        self.path_classifier = path_classifier
+        self.dependencies = []
+        self.parents = {}
 
-    def parse(self, sbom_file):
-        """parses CycloneDX BOM file extracting package name, version and license"""
-        if sbom_file.endswith("json"):
+    def get_dependencies(self):
+        """Return (source, target) package names of the last SBOM parsed."""
+        return self.dependencies
+
+    def get_parents(self):
+        """Return the parent references of the packages of the last SBOM parsed.
+
+        The table has the same keys and instances as the package table.
+        The parent reference (bom-ref, or name if there is no bom-ref) is
+        None for a package which is not nested within another component.
+        """
+        return self.parents
+
+    def parse(self, sbom_file, sbom_format=None):
+        """parses CycloneDX BOM file extracting package name, version and license
+
+        Args:
+            sbom_file: Filename of the SBOM, "-" for the standard input, or
+                the content of the SBOM as a buffer or binary file object
+            sbom_format: Format of the SBOM (json or xml); identified from
+                the filename or the content if not specified
+        """
+        if sbom_format is None:
+            sbom_format = self._get_format(sbom_file)
+        if sbom_format == "json":
             return self.parse_cyclonedx_json(sbom_file)
-        elif sbom_file.endswith(".xml"):
+        elif sbom_format == "xml":
             return self.parse_cyclonedx_xml(sbom_file)
-        else:
-            return {}
+        return {}
 
-    def _get_package_key(self, name, path):
+    def _get_format(self, sbom_file):
+        # Format is identified from the filename extension or else the content
+        if isinstance(sbom_file, str):
+            if sbom_file.endswith("json"):
+                return "json"
+            elif sbom_file.endswith(".xml"):
+                return "xml"
+        sbom_type, sbom_format = detect_format(resolve(sbom_file))
+        if sbom_type != "cyclonedx":
+            return None
+        return sbom_format
+
+    def _is_package_type(self, component_type):
+        if component_type is None:
+            # Type is required
+            return False
+        if self.component_types is None:
+            return True
+        return component_type in self.component_types
+
+    def _get_package_key(self, name, path, purl=None):
         """Create a unique key for a package.
 
         Uses (name, path) tuple when path is available to handle packages
         that appear at multiple locations (e.g., Go stdlib in multiple binaries).
-        Falls back to (name, "") when no path is present.
+        Falls back to (name, "") when no path is present. When matching
+        using purls, the canonical purl is used instead of the name.
 
         Args:
             name: Package name
             path: File path where package is located
+            purl: Package URL of the package
 
         Returns:
             Tuple of (name, path) for use as dictionary key
         """
+        if self.purl_index is not None:
+            return self.purl_index.get_key(name, path or "", purl)
         return (name, path) if path else (name, "")
 
     def parse_cyclonedx_json(self, sbom_file):
@@ -42,51 +148,89 @@ class CycloneDXParser:
         [version, license] lists. This allows tracking the same package at
         multiple locations.
         """
-        with open(sbom_file) as f:
+        with open_text(sbom_file) as f:
             data = json.load(f)
         packages = {}
+        self.dependencies = []
+        self.parents = {}
         # Check that valid CycloneDX JSON file is being processed
         if "components" in data:
-            for d in data["components"]:
-                if d["type"] in ["library", "application", "operating-system"]:
-                    name = d["name"]
-                    # Extract path from properties
-                    path = ""
-                    properties = d.get("properties", [])
-                    for prop in properties:
-                        prop_name = prop.get("name", "").lower()
-                        # Look for properties with location/path semantics
-                        if ("location" in prop_name and "path" in prop_name) or prop_name.endswith(":path"):
-                            path = prop.get("value", "")
-                            break
-                    package_key = self._get_package_key(name, path)
-                    version = d["version"] if "version" in d else "UNKNOWN"
-                    license = "NOT FOUND"
-                    license_data = None
-                    # Multiple ways of defining license data
-                    if "licenses" in d and len(d["licenses"]) > 0:
-                        license_data = d["licenses"][0]
-                    elif "evidence" in d:
-                        if "licenses" in d["evidence"]:
-                            license_data = d["evidence"]["licenses"]
-                    if license_data is not None:
-                        license = None
-                        if "license" in license_data:
-                            if "id" in license_data["license"]:
-                                license = license_data["license"]["id"]
-                            elif "name" in license_data["license"]:
-                                license = license_data["license"]["name"]
-                            elif "expression" in license_data["license"]:
-                                license = license_data["license"]["expression"]
-                        elif "expression" in license_data:
-                            license = license_data["expression"]
-                        if license is None:
-                            license = "UNKNOWN"
-                    if package_key not in packages:
-                        packages[package_key] = [version, license]
+            for d, parent in walk_components(
+                data["components"], _json_children, _json_reference
+            ):
+                package = self._get_package_json(d)
+                if package is not None:
+                    package_key, record = package
+                    add_instance(packages, package_key, record)
+                    add_instance(self.parents, package_key, parent)
+            self._parse_dependencies_json(data)
 
         return packages
 
+    def _get_package_json(self, d):
+        # Returns (package key, [version, license]) or None if not selected
+        component_type = d.get("type")
+        name = d.get("name")
+        if name is None or not self._is_package_type(component_type):
+            # Incomplete components are ignored
+            return None
+        # Extract path from properties
+        path = self.path_classifier.find_path(
+            (prop.get("name", ""), prop.get("value", ""))
+            for prop in d.get("properties", [])
+        )
+        if self.package_filter is not None and not (
+            self.package_filter.matches(name, path, d.get("purl"), component_type)
+        ):
+            return None
+        package_key = self._get_package_key(name, path, d.get("purl"))
+        version = d["version"] if "version" in d else "UNKNOWN"
+        license = self._get_license_json(d) if self.licenses else None
+        return package_key, [version, license]
+
+    def _get_license_json(self, d):
+        license = "NOT FOUND"
+        license_data = None
+        # Multiple ways of defining license data
+        if "licenses" in d and len(d["licenses"]) > 0:
+            license_data = d["licenses"][0]
+        elif "evidence" in d:
+            if "licenses" in d["evidence"]:
+                license_data = d["evidence"]["licenses"]
+        if license_data is not None:
+            license = None
+            if "license" in license_data:
+                if "id" in license_data["license"]:
+                    license = license_data["license"]["id"]
+                elif "name" in license_data["license"]:
+                    license = license_data["license"]["name"]
+                elif "expression" in license_data["license"]:
+                    license = license_data["license"]["expression"]
+            elif "expression" in license_data:
+                license = license_data["expression"]
+            if license is None:
+                license = "UNKNOWN"
+        return license
+
+    def _parse_dependencies_json(self, data):
+        # Dependencies refer to components using their bom-ref
+        names = {}
+        root = data.get("metadata", {}).get("component")
+        components = walk_components(
+            data["components"], _json_children, _json_reference
+        )
+        for component in [root] + [component for component, _ in components]:
+            if component is not None and "bom-ref" in component:
+                names[component["bom-ref"]] = component.get("name")
+        for dependency in data.get("dependencies", []):
+            source = names.get(dependency.get("ref"))
+            if source is None:
+                continue
+            for ref in dependency.get("dependsOn", []):
+                target = names.get(ref)
+                if target is not None:
+                    self.dependencies.append((source, target))
+
     def parse_cyclonedx_xml(self, sbom_file):
         """parses CycloneDX XML BOM file extracting package name, version and license
 
@@ -95,20 +239,36 @@ class CycloneDXParser:
         so path will usually be empty.
         """
         packages = {}
-        tree = ET.parse(sbom_file)
+        self.dependencies = []
+        self.parents = {}
+        with open_binary(sbom_file) as f:
+            tree = ET.parse(f)
         # Find root element
         root = tree.getroot()
         # Extract schema
         schema = root.tag[: root.tag.find("}") + 1]
+
+        def get_children(component):
+            nested = component.find(schema + "components")
+            if nested is None:
+                return None
+            return nested.findall(schema + "component")
+
+        def get_reference(component):
+            if "bom-ref" in component.attrib:
+                return component.attrib["bom-ref"]
+            component_name = component.find(schema + "name")
+            return None if component_name is None else component_name.text
+
         for components in root.findall(schema + "components"):
             try:
-                for component in components.findall(schema + "component"):
+                for component, parent in walk_components(
+                    components.findall(schema + "component"),
+                    get_children,
+                    get_reference,
+                ):
                     # Only application, library and operating-systems components
-                    if component.attrib["type"] in [
-                        "library",
-                        "application",
-                        "operating-system",
-                    ]:
+                    if self._is_package_type(component.attrib.get("type")):
                         component_name = component.find(schema + "name")
                         if component_name is None:
                             raise KeyError(f"Could not find package in {component}")
@@ -119,28 +279,63 @@ class CycloneDXParser:
                         path = ""
                         properties = component.find(schema + "properties")
                         if properties is not None:
-                            for prop in properties.findall(schema + "property"):
-                                prop_name = prop.attrib.get("name", "").lower()
-                                # Look for properties with location/path semantics
-                                if ("location" in prop_name and "path" in prop_name) or prop_name.endswith(":path"):
-                                    path = prop.text or ""
-                                    break
-                        package_key = self._get_package_key(name, path)
+                            path = self.path_classifier.find_path(
+                                (prop.attrib.get("name", ""), prop.text)
+                                for prop in properties.findall(schema + "property")
+                            )
+                        component_purl = component.find(schema + "purl")
+                        purl = None if component_purl is None else component_purl.text
+                        if self.package_filter is not None and not (
+                            self.package_filter.matches(
+                                name, path, purl, component.attrib["type"]
+                            )
+                        ):
+                            continue
+                        package_key = self._get_package_key(name, path, purl)
                         component_version = component.find(schema + "version")
                         if component_version is None:
                             version = "UNKNOWN"
                         else:
                             version = component_version.text
-                        license = "NOT FOUND"
-                        component_license = component.find(schema + "licenses")
+                        license = None
+                        component_license = None
+                        if self.licenses:
+                            license = "NOT FOUND"
+                            component_license = component.find(schema + "licenses")
                         if component_license is not None:
                             license_data = component_license.find(schema + "expression")
                             if license_data is not None:
                                 license = license_data.text
                         if version is not None:
-                            if package_key not in packages:
-                                packages[package_key] = [version, license]
+                            add_instance(packages, package_key, [version, license])
+                            add_instance(self.parents, package_key, parent)
             except KeyError:
                 pass
+        self._parse_dependencies_xml(root, schema)
 
         return packages
+
+    def _parse_dependencies_xml(self, root, schema):
+        # Dependencies refer to components using their bom-ref
+        names = {}
+        for component in root.iter(schema + "component"):
+            name = component.find(schema + "name")
+            if "bom-ref" in component.attrib and name is not None:
+                names[component.attrib["bom-ref"]] = name.text
+        for dependencies in root.findall(schema + "dependencies"):
+            for dependency in dependencies.findall(schema + "dependency"):
+                source = names.get(dependency.attrib.get("ref"))
+                if source is None:
+                    continue
+                for depends_on in dependency.findall(schema + "dependency"):
+                    target = names.get(depends_on.attrib.get("ref"))
+                    if target is not None:
+                        self.dependencies.append((source, target))
+
+
+def _json_children(component):
+    return component.get("components")
+
+
+def _json_reference(component):
+    return component.get("bom-ref", component.get("name"))
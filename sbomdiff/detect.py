@@ -0,0 +1,95 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Detection of the type and format of a SBOM from the start of its content.
+
+Only a prefix of the content is examined so detection never requires the
+SBOM to be parsed.
+"""
+
+import re
+
+PREFIX_SIZE = 8192
+
+_SPDX_TAG = re.compile(r"^SPDXVersion\s*:", re.MULTILINE)
+_SPDX_YAML = re.compile(r"^['\"]?spdxVersion['\"]?\s*:", re.MULTILINE)
+_SPDX_JSON = re.compile(r"\"spdxVersion\"\s*:")
+_CYCLONEDX_JSON = re.compile(r"\"bomFormat\"\s*:\s*\"CycloneDX\"")
+_SPDX3_JSONLD = re.compile(r"\"@context\"\s*:\s*\"https?://spdx\.org/rdf/3")
+
+
+def read_prefix(source, size=PREFIX_SIZE):
+    """Read the first bytes of a file or stream.
+
+    Args:
+        source: Filename, bytes or file object (text or binary)
+        size: Maximum number of bytes to read
+
+    Returns:
+        Prefix of the content as a string. If the stream is seekable, its
+        position is restored.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        prefix = bytes(source[:size])
+    elif hasattr(source, "read"):
+        position = source.tell() if source.seekable() else None
+        if hasattr(source, "peek") and position is None:
+            prefix = source.peek(size)[:size]
+        else:
+            prefix = source.read(size)
+        if position is not None:
+            source.seek(position)
+    else:
+        with open(source, "rb") as f:
+            prefix = f.read(size)
+    if isinstance(prefix, bytes):
+        prefix = prefix.decode("utf-8", errors="ignore")
+    return prefix.lstrip("\ufeff \t\r\n")
+
+
+def detect_prefix(prefix):
+    """Identify the type and format of a SBOM from the start of its content.
+
+    Args:
+        prefix: Start of the SBOM content
+
+    Returns:
+        Tuple of (sbom_type, format) where sbom_type is spdx or cyclonedx and
+        format is one of tag, json, jsonld, yaml, rdf or xml. Returns
+        (None, None) if the content is not recognised.
+    """
+    if prefix.startswith(("{", "[")):
+        if _CYCLONEDX_JSON.search(prefix):
+            return "cyclonedx", "json"
+        if _SPDX3_JSONLD.search(prefix) or '"@graph"' in prefix:
+            return "spdx", "jsonld"
+        if _SPDX_JSON.search(prefix):
+            return "spdx", "json"
+        # Identifying keys may not appear in the prefix
+        if "cyclonedx" in prefix.lower():
+            return "cyclonedx", "json"
+        if "spdx" in prefix.lower():
+            return "spdx", "json"
+        return None, None
+    if prefix.startswith("<"):
+        if "cyclonedx.org/schema/bom" in prefix or re.search(r"<bom[\s>]", prefix):
+            return "cyclonedx", "xml"
+        if "<rdf:RDF" in prefix or "spdx.org/rdf/terms" in prefix:
+            return "spdx", "rdf"
+        if "spdx" in prefix.lower():
+            return "spdx", "xml"
+        return None, None
+    if _SPDX_TAG.search(prefix):
+        return "spdx", "tag"
+    if _SPDX_YAML.search(prefix):
+        return "spdx", "yaml"
+    return None, None
+
+
+def detect_format(source, size=PREFIX_SIZE):
+    """Identify the type and format of a SBOM file, stream or buffer.
+
+    Only the first size bytes of the content are examined. See detect_prefix
+    for the values which are returned.
+    """
+    return detect_prefix(read_prefix(source, size))
@@ -0,0 +1,1008 @@
+# Copyright (C) 2023 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2024 Hewlett Packard Enterprise Development LP (comments for added material tagged HPE)
+
+import heapq
+import json
+
+from lib4sbom.data.package import SBOMPackage
+from lib4sbom.parser import SBOMParser
+from lib4sbom.sbom import ParserType
+
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.detect import detect_format
+from sbomdiff.fields import ALL_FIELDS, CHECKSUM, LICENSE
+from sbomdiff.graph import DependencyGraph, NodeIndex, diff_graphs
+from sbomdiff.license import licenses_equivalent
+from sbomdiff.multimap import (
+    Instances,
+    add_instance,
+    diff_instances,
+    get_instances,
+)
+from sbomdiff.properties import DEFAULT_CLASSIFIER
+from sbomdiff.purl import find_purl
+from sbomdiff.rename import SIMILARITY_THRESHOLD, match_renames
+from sbomdiff.source import is_filename, read_text, rereadable, resolve
+from sbomdiff.spdx_parser import SPDXParser
+from sbomdiff.table import PackageTable, match_keys
+from sbomdiff.version import VERSION
+from sbomdiff.versions import classify_version_change, purl_ecosystem
+
+# Order of package keys for each --sort option
+SORT_KEYS = {
+    "name": lambda package_key: package_key,
+    "path": lambda package_key: (package_key[1], package_key[0]),
+    "status": lambda package_key: package_key,
+}
+
+# Order of records when sorted by status
+STATUS_ORDER = ("add", "change", "remove")
+
+# Filename extensions which lib4sbom uses to select a parser
+SBOM_EXTENSIONS = (
+    ".json",
+    ".jsonld",
+    ".xml",
+    ".spdx",
+    ".spdx.yaml",
+    "spdx.yml",
+    ".spdx.rdf",
+)
+
+# lib4sbom parser used for each detected type and format of SBOM content
+PARSER_TYPES = {
+    ("cyclonedx", "json"): ParserType.CYCLONEDX_JSON,
+    ("cyclonedx", "xml"): ParserType.CYCLONEDX_XML,
+    ("spdx", "tag"): ParserType.SPDX_TAG,
+    ("spdx", "json"): ParserType.SPDX_JSON,
+    ("spdx", "jsonld"): ParserType.SPDX_JSONLD,
+    ("spdx", "yaml"): ParserType.SPDX_YML,
+    ("spdx", "rdf"): ParserType.SPDX_RDF,
+    ("spdx", "xml"): ParserType.SPDX_XML,
+}
+
+
+def merge_keys(packages1, packages2, sort_key):
+    """Merge the sorted keys of two package tables.
+
+    The keys of each table are sorted separately (which is linear if the
+    table is already in order) and then merged, so each key is generated
+    once in sorted order.
+
+    Returns:
+        Generator of (package_key, in_first, in_second) tuples
+    """
+    keys1 = ((sort_key(key), 0, key) for key in sorted(packages1, key=sort_key))
+    keys2 = ((sort_key(key), 1, key) for key in sorted(packages2, key=sort_key))
+    previous = None
+    for _, source, package_key in heapq.merge(keys1, keys2):
+        if source == 1 and previous == package_key:
+            # Key is in both tables and has already been generated
+            continue
+        previous = package_key
+        yield package_key, source == 0, source == 1 or package_key in packages2
+
+
+def format_package_display(package_key):
+    """Format package key for display.
+
+    Package keys are tuples of (name, path). When path is present,
+    show the binary name in parentheses for context.
+
+    Args:
+        package_key: Tuple of (name, path)
+
+    Returns:
+        Formatted string like "name" or "name (binary)"
+    """
+    name, path = package_key
+    if path:
+        # Extract filename from path
+        binary = path.rsplit("/", 1)[-1]
+        return f"{name} ({binary})"
+    return name
+
+
+def process_packages(
+    package_list,
+    purl_index=None,
+    string_pool=None,
+    path_classifier=None,
+    package_filter=None,
+    fields=ALL_FIELDS,
+    locations=None,
+):
+    if path_classifier is None:
+        path_classifier = DEFAULT_CLASSIFIER
+    # An empty PackageFilter selects every package
+    package_filter = package_filter or None
+    # Fields which are not projected are held as None
+    extract_license = LICENSE in fields
+    extract_checksum = CHECKSUM in fields
+    packages = {}
+    thepackage = SBOMPackage()
+    for package in package_list:
+        thepackage.initialise()
+        thepackage.copy_package(package)
+        name = thepackage.get_name()
+        version = thepackage.get_value("version")
+        if version is None:
+            continue
+        # Special handling for Syft SBOMs
+        path = ""
+        # lib4sbom holds properties as [name, value] pairs
+        properties = thepackage.get_value("property")
+        if properties is not None:
+            path = path_classifier.find_path(properties)
+        paths = [path]
+        if locations is not None:
+            # Components merged by lib4sbom are added at each location
+            paths = locations.get((name, version), paths)
+        purl = None
+        if purl_index is not None or package_filter is not None:
+            purl = find_purl(thepackage.get_value("externalreference"))
+        if package_filter is not None:
+            # Fields of packages which are not selected are not extracted
+            package_type = thepackage.get_value("type")
+            paths = [
+                path
+                for path in paths
+                if package_filter.matches(name, path, purl, package_type)
+            ]
+            if not paths:
+                continue
+        license = None
+        if extract_license:
+            license = thepackage.get_value("licenseconcluded")
+            if license is None:
+                license = "UNKNOWN"
+        checksums = None
+        if extract_checksum:
+            checksums = thepackage.get_value("checksum")
+        if string_pool is not None:
+            name = string_pool.intern(name)
+            version = string_pool.intern(version)
+            license = string_pool.intern(license)
+            checksums = string_pool.intern_checksums(checksums)
+        for path in paths:
+            if string_pool is not None:
+                path = string_pool.intern(path)
+            if purl_index is not None:
+                package_key = purl_index.get_key(name, path, purl)
+            else:
+                package_key = (name, path) if path else (name, "")
+            add_instance(packages, package_key, [version, license, checksums])
+    return packages
+
+
+def has_merged_components(sbom_parser):
+    """Check if lib4sbom may have merged components of a CycloneDX SBOM.
+
+    The lib4sbom CycloneDX parser numbers every component which it reads
+    (to generate missing bom-refs) and stores at most one package for each,
+    so fewer packages than components means that components with the same
+    name and version were merged. Only then do the locations have to be
+    found by parsing the SBOM again.
+    """
+    count = getattr(getattr(sbom_parser, "parser", None), "component_id", None)
+    if count is None:
+        # Number of components is not known
+        return True
+    return count > len(sbom_parser.get_packages())
+
+
+def find_locations(sbom_file, path_classifier=None):
+    """Return the locations of the components of a CycloneDX SBOM.
+
+    lib4sbom merges components with the same name and version (e.g. the Go
+    stdlib within several binaries), keeping the properties of the last,
+    so the locations are read using CycloneDXParser which keeps every
+    component.
+
+    Args:
+        sbom_file: Filename or content of the SBOM (see load_sbom)
+        path_classifier: PathPropertyClassifier to identify package locations
+
+    Returns:
+        Dictionary of lists of paths keyed by (name, version)
+    """
+    sbom_parser = CycloneDXParser(
+        path_classifier=path_classifier, fields=(), component_types=None
+    )
+    locations = {}
+    for (name, path), package in sbom_parser.parse(sbom_file).items():
+        for version, _ in get_instances(package):
+            locations.setdefault((name, version), []).append(path)
+    return locations
+
+
+class SPDX3Document:
+    """Relationships of a SPDX 3.0 JSON-LD SBOM parsed by SPDXParser.
+
+    lib4sbom does not find the packages of SPDX 3.0 documents, so these are
+    parsed by SPDXParser. Provides the SBOMParser methods which are used to
+    compare SBOMs.
+    """
+
+    def __init__(self, dependencies):
+        self.dependencies = dependencies
+
+    def get_type(self):
+        return "spdx"
+
+    def get_relationships(self):
+        # Dependencies are held in the direction of the dependency
+        return [
+            {"source": source, "target": target, "type": "DEPENDS_ON"}
+            for source, target in self.dependencies
+        ]
+
+
+def load_spdx_jsonld(
+    sbom_file,
+    purl_index=None,
+    string_pool=None,
+    package_filter=None,
+    fields=ALL_FIELDS,
+):
+    """Parse a SPDX 3.0 JSON-LD SBOM into a package table.
+
+    Returns:
+        Tuple of (document, packages) where document is the SPDX3Document
+        holding the relationships of the SBOM
+    """
+    spdx_parser = SPDXParser(purl_index, package_filter, fields)
+    packages = {}
+    for package_key, package in spdx_parser.parse_spdx_jsonld(sbom_file).items():
+        if string_pool is not None:
+            package_key = tuple(map(string_pool.intern, package_key))
+        for version, license in get_instances(package):
+            if string_pool is not None:
+                version = string_pool.intern(version)
+                license = string_pool.intern(license)
+            # Checksums are not extracted by SPDXParser
+            add_instance(packages, package_key, [version, license, None])
+    return SPDX3Document(spdx_parser.get_dependencies()), packages
+
+
+def load_sbom(sbom_file, sbom_type="auto"):
+    """Parse a SBOM.
+
+    Args:
+        sbom_file: Filename of the SBOM, "-" for the standard input, or the
+            content of the SBOM as a buffer (bytes, bytearray or memoryview)
+            or binary file object
+        sbom_type: Type of SBOM (auto, spdx or cyclonedx)
+
+    Returns:
+        SBOMParser containing the parsed SBOM
+    """
+    sbom_file = resolve(sbom_file)
+    # Identify type from content to avoid parsing the file more than once
+    detected = detect_format(sbom_file)
+    if sbom_type == "auto" and detected[0] is not None:
+        sbom_type = detected[0]
+    sbom_parser = SBOMParser(sbom_type=sbom_type)
+    if is_filename(sbom_file) and sbom_file.endswith(SBOM_EXTENSIONS):
+        sbom_parser.parse_file(sbom_file)
+        return sbom_parser
+    content = read_text(sbom_file)
+    parser_type = PARSER_TYPES.get(detected)
+    if parser_type is None:
+        # Format not recognised so parser identifies format from content
+        sbom_parser.parse_string(content)
+    else:
+        # parse_string only identifies JSON and XML content, so the parser
+        # for the detected format is selected as parse_file does. This is
+        # not public API, so lib4sbom is limited to the tested versions in
+        # requirements.txt.
+        sbom_parser._parse_sbom(content.strip(), parser_type)
+    return sbom_parser
+
+
+def parse_sbom(
+    sbom_file,
+    sbom_type="auto",
+    purl_index=None,
+    string_pool=None,
+    path_classifier=None,
+    package_filter=None,
+    fields=ALL_FIELDS,
+):
+    """Parse a SBOM file into a package table.
+
+    Args:
+        sbom_file: Filename or content of the SBOM (see load_sbom)
+        sbom_type: Type of SBOM (auto, spdx or cyclonedx)
+        purl_index: PurlIndex if packages are to be matched using purls
+        string_pool: StringPool shared with the other SBOMs being compared
+        path_classifier: PathPropertyClassifier to identify package locations
+        package_filter: PackageFilter selecting the packages to be compared
+        fields: Projection of the optional fields to extract (see fields.py)
+
+    Returns:
+        Tuple of (packages, type) where packages is the dictionary built
+        by process_packages and type is the detected type of SBOM
+    """
+    sbom_parser, packages = load_packages(
+        sbom_file,
+        sbom_type,
+        purl_index,
+        string_pool,
+        path_classifier,
+        package_filter,
+        fields,
+    )
+    return packages, sbom_parser.get_type()
+
+
+def load_packages(
+    sbom_file,
+    sbom_type="auto",
+    purl_index=None,
+    string_pool=None,
+    path_classifier=None,
+    package_filter=None,
+    fields=ALL_FIELDS,
+):
+    """Parse a SBOM into a package table.
+
+    Takes the same arguments as parse_sbom.
+
+    Returns:
+        Tuple of (sbom_parser, packages) where sbom_parser is the SBOMParser
+        containing the parsed SBOM, or a SPDX3Document for SPDX 3.0 JSON-LD
+    """
+    # A CycloneDX SBOM may be read again to find the locations of its components
+    sbom_file = rereadable(sbom_file)
+    detected = detect_format(sbom_file)
+    if sbom_type in ("auto", "spdx") and detected == ("spdx", "jsonld"):
+        return load_spdx_jsonld(
+            sbom_file, purl_index, string_pool, package_filter, fields
+        )
+    sbom_parser = load_sbom(sbom_file, sbom_type)
+    locations = None
+    if sbom_parser.get_type() == "cyclonedx" and has_merged_components(sbom_parser):
+        locations = find_locations(sbom_file, path_classifier)
+    packages = process_packages(
+        sbom_parser.get_packages(),
+        purl_index,
+        string_pool,
+        path_classifier,
+        package_filter,
+        fields,
+        locations,
+    )
+    return sbom_parser, packages
+
+
+def format_record(record):
+    """Format a difference record as lines of text output.
+
+    Args:
+        record: Difference record generated by SBOMDiff.compare
+
+    Returns:
+        List of text lines describing the difference
+    """
+    package_display = format_package_display(
+        (record["package"], record.get("path", ""))
+    )
+    if "purl" in record:
+        # Distinguish packages with the same name from different ecosystems
+        package_display = f"{package_display} [{record['purl']}]"
+    status = record["status"]
+    if status == "remove":
+        return [f"[REMOVED] {package_display}: (Version {record['version']['from']})"]
+    if status == "rename":
+        return [
+            f"[RENAMED] {package_display}: Renamed to {record['name']['to']} "
+            f"(Version {record['version']['from']} to {record['version']['to']}) "
+            f"(Similarity {record['name']['similarity']:.2f})"
+        ]
+    if status == "add":
+        if "license" not in record:
+            # Licenses are not compared
+            return [
+                f"[ADDED  ] {package_display}: (Version {record['version']['from']})"
+            ]
+        return [
+            f"[ADDED  ] {package_display}: (Version {record['version']['from']}) "
+            f"(License {record['license']['to']})"
+        ]  # HPE Added license to text output
+    lines = []
+    if "version" in record:
+        lines.append(
+            f"[VERSION] {package_display}: "
+            f"Version changed from {record['version']['from']} "
+            f"to {record['version']['to']} ({record['version']['direction']})"
+        )
+    if "license" in record:
+        lines.append(
+            f"[LICENSE] {package_display}: "
+            f"License changed from {record['license']['from']} "
+            f"to {record['license']['to']}"
+        )
+    if "checksum" in record:
+        lines.append(
+            f"[CHECKSUM] {package_display}: "
+            f"Checksum changed from {record['checksum']['from']} "
+            f"to {record['checksum']['to']}"
+        )
+    return lines
+
+
+def format_dependencies(dependency_diff):
+    """Format the differences in dependencies as lines of text output."""
+    lines = []
+    for source, target in dependency_diff["removed"]:
+        lines.append(f"[DEPENDENCY] {source} -> {target}: Dependency removed")
+    for source, target in dependency_diff["added"]:
+        lines.append(f"[DEPENDENCY] {source} -> {target}: Dependency added")
+    for package in dependency_diff["affected"]:
+        lines.append(f"[DEPENDENTS] {package}: Transitive dependents changed")
+    return lines
+
+
+class SBOMDiff:
+    """Compares two package tables and reports the differences.
+
+    Differences are generated as records which are the same dictionaries
+    reported in the 'differences' section of the JSON and YAML output.
+    A count of each type of difference is maintained as the records
+    are generated.
+
+    If version_filter is upgrade or downgrade, only packages whose version
+    has changed in that direction are reported.
+
+    If the package tables are keyed on purls, the PurlIndex used to create
+    the keys should be provided so the package name can be reported.
+    """
+
+    def __init__(
+        self, exclude_license=False, checksum="", version_filter=None, purl_index=None
+    ):
+        self.exclude_license = exclude_license
+        self.checksum = checksum
+        self.version_filter = version_filter
+        self.purl_index = purl_index
+        self.reset()
+
+    def reset(self):
+        self.version_changes = 0
+        self.new_packages = 0
+        self.removed_packages = 0
+        self.license_changes = 0
+        self.checksum_changes = 0
+        self.renamed_packages = None
+        self.dependency_diff = None
+
+    def _get_checksum(self, checksums):
+        for checksum in checksums:
+            if checksum[0] == self.checksum:
+                return checksum[1]
+        return None
+
+    def _get_ecosystem(self, package_key):
+        # Ecosystem is only known if the package is keyed on its purl
+        if self.purl_index is None:
+            return None
+        return purl_ecosystem(self.purl_index.get_purl(package_key[0]))
+
+    def _package_record(self, package_key):
+        package_info = dict()
+        package_name, package_path = package_key
+        purl = None
+        if self.purl_index is not None:
+            purl = self.purl_index.get_purl(package_name)
+            package_name = self.purl_index.get_name(package_name)
+        package_info["package"] = package_name
+        if package_path:
+            package_info["path"] = package_path
+        if purl is not None:
+            package_info["purl"] = purl
+        return package_info
+
+    def changed_record(self, package_key, package1, package2):
+        """Return the difference record for a common package or None."""
+        version1, license1, checksums1 = package1
+        version2, license2, checksums2 = package2
+        if version1 is version2 and license1 is license2 and checksums1 == checksums2:
+            # Strings from a StringPool are identical if they are equal
+            return None
+        package_info = self._package_record(package_key)
+        diff_record = False
+        # Only normalise the case of versions which differ
+        if version1 != version2 and version1.upper() != version2.upper():
+            direction = classify_version_change(
+                version1, version2, self._get_ecosystem(package_key)
+            )
+            version1 = version1.upper()
+            version2 = version2.upper()
+            if len(version1) == 0:
+                version1 = "UNKNOWN"
+            if len(version2) == 0:
+                version2 = "UNKNOWN"
+            package_info["status"] = "change"
+            version_info = dict()
+            version_info["from"] = version1
+            version_info["to"] = version2
+            version_info["direction"] = direction
+            package_info["version"] = version_info
+            diff_record = True
+        if not self.exclude_license and not licenses_equivalent(license1, license2):
+            package_info["status"] = "change"
+            license_info = dict()
+            license_info["from"] = license1
+            license_info["to"] = license2
+            package_info["license"] = license_info
+            diff_record = True
+        if self.checksum != "" and checksums1 is not None and checksums2 is not None:
+            # compare checksums
+            value1 = self._get_checksum(checksums1)
+            value2 = self._get_checksum(checksums2)
+            if value1 is not None and value2 is not None and value1 != value2:
+                package_info["status"] = "change"
+                checksum_info = dict()
+                checksum_info["from"] = value1
+                checksum_info["to"] = value2
+                package_info["checksum"] = checksum_info
+                diff_record = True
+        return package_info if diff_record else None
+
+    def removed_record(self, package_key, package1):
+        """Return the difference record for a package which has been removed."""
+        version1 = package1[0].upper()
+        if len(version1) == 0:
+            version1 = "UNKNOWN"
+        package_info = self._package_record(package_key)
+        package_info["status"] = "remove"
+        version_info = dict()
+        version_info["from"] = version1
+        package_info["version"] = version_info
+        return package_info
+
+    def added_record(self, package_key, package2):
+        """Return the difference record for a package which has been added."""
+        version2 = package2[0].upper()
+        license2 = package2[1]
+        if len(version2) == 0:
+            version2 = "UNKNOWN"
+        package_info = self._package_record(package_key)
+        package_info["status"] = "add"
+        version_info = dict()
+        version_info["from"] = version2
+        package_info["version"] = version_info
+        if not self.exclude_license:
+            license_info = dict()  # HPE - Adding license dictionary
+            license_info["to"] = license2  # HPE - Adding the new license
+            package_info["license"] = (
+                license_info  # HPE - Adding license_info to package_info
+            )
+        return package_info
+
+    def accept(self, record):
+        """Check if a record is selected by the version filter."""
+        if self.version_filter is None:
+            return True
+        return (
+            "version" in record
+            and record["version"].get("direction") == self.version_filter
+        )
+
+    def count(self, record):
+        """Update the count of differences with a record."""
+        status = record["status"]
+        if status == "remove":
+            self.removed_packages += 1
+        elif status == "rename":
+            self.renamed_packages += 1
+        elif status == "add":
+            self.new_packages += 1
+        else:
+            if "version" in record:
+                self.version_changes += 1
+            if "license" in record:
+                self.license_changes += 1
+            if "checksum" in record:
+                self.checksum_changes += 1
+
+    def instance_records(self, package_key, package1, package2):
+        """Generate the difference records for a key with several instances.
+
+        Instances present in both tables are ignored. Remaining instances
+        with the same version, or a single remaining instance in each table,
+        are reported as a change. Any other instances are reported as
+        removed or added.
+        """
+        removed, added = diff_instances(
+            get_instances(package1), get_instances(package2)
+        )
+        changed = []
+        versions = {}
+        for index, instance in enumerate(added):
+            versions.setdefault(instance[0], []).append(index)
+        unmatched = []
+        for instance in removed:
+            same_version = versions.get(instance[0])
+            if same_version:
+                changed.append((instance, added[same_version.pop(0)]))
+            else:
+                unmatched.append(instance)
+        paired = {id(instance2) for _, instance2 in changed}
+        added = [instance for instance in added if id(instance) not in paired]
+        removed = unmatched
+        if len(removed) == 1 and len(added) == 1:
+            changed.append((removed.pop(), added.pop()))
+        for instance1, instance2 in changed:
+            record = self.changed_record(package_key, instance1, instance2)
+            if record is not None:
+                yield record
+        for instance in removed:
+            yield self.removed_record(package_key, instance)
+        for instance in added:
+            yield self.added_record(package_key, instance)
+
+    def _records(self, package_key, package1, package2):
+        if package2 is None:
+            # Package must have been removed
+            for instance in get_instances(package1):
+                yield self.removed_record(package_key, instance)
+        elif isinstance(package1, Instances) or isinstance(package2, Instances):
+            yield from self.instance_records(package_key, package1, package2)
+        else:
+            # Compare values for common package
+            record = self.changed_record(package_key, package1, package2)
+            if record is not None:
+                yield record
+
+    def compare(self, packages1, packages2):
+        """Generate a difference record for each difference between two tables.
+
+        Records for packages in the first table are generated in the order
+        of the first table, followed by records for any new packages in
+        the order of the second table.
+        """
+        for _, record in self.compare_keyed(packages1, packages2):
+            yield record
+
+    def compare_keyed(self, packages1, packages2, sort=None):
+        """Generate (package_key, record) for each difference between two tables.
+
+        Records are generated in the order of compare if sort is None, or
+        otherwise in the order of compare_sorted.
+        """
+        if sort is not None:
+            yield from self._compare_sorted_keyed(packages1, packages2, sort)
+            return
+        if isinstance(packages1, PackageTable) and isinstance(packages2, PackageTable):
+            yield from self._compare_tables(packages1, packages2)
+            return
+        for package_key, package1 in packages1.items():
+            package2 = packages2.get(package_key)
+            for record in self._records(package_key, package1, package2):
+                if self.accept(record):
+                    self.count(record)
+                    yield package_key, record
+        # Check for any new packages
+        for package_key, package2 in packages2.items():
+            if package_key not in packages1:
+                for instance in get_instances(package2):
+                    record = self.added_record(package_key, instance)
+                    if self.accept(record):
+                        self.count(record)
+                        yield package_key, record
+
+    def _compare_tables(self, table1, table2):
+        # Keys are matched by a merge join and only the packages whose
+        # encodings differ are decoded
+        partners, matched = match_keys(table1, table2)
+        for number1, number2 in enumerate(partners):
+            if number2 >= 0 and table1.same_value(number1, table2, number2):
+                continue
+            package_key = table1.key(number1)
+            package2 = table2.value(number2) if number2 >= 0 else None
+            for record in self._records(package_key, table1.value(number1), package2):
+                if self.accept(record):
+                    self.count(record)
+                    yield package_key, record
+        # Check for any new packages
+        for number2, in_first in enumerate(matched):
+            if not in_first:
+                package_key = table2.key(number2)
+                for instance in get_instances(table2.value(number2)):
+                    record = self.added_record(package_key, instance)
+                    if self.accept(record):
+                        self.count(record)
+                        yield package_key, record
+
+    def count_differences(self, packages1, packages2):
+        """Count the differences between two tables without generating records.
+
+        The counts are the same as those maintained by compare, but no
+        difference records are built for packages with a single instance.
+        """
+        if isinstance(packages1, PackageTable) and isinstance(packages2, PackageTable):
+            # Only differences are decoded so few records are built
+            for _ in self._compare_tables(packages1, packages2):
+                pass
+            return
+        # Removed and added packages have no version direction
+        count_packages = self.version_filter is None
+        for package_key, package1 in packages1.items():
+            package2 = packages2.get(package_key)
+            if package2 is None:
+                if count_packages:
+                    self.removed_packages += len(get_instances(package1))
+            elif isinstance(package1, Instances) or isinstance(package2, Instances):
+                for record in self.instance_records(package_key, package1, package2):
+                    if self.accept(record):
+                        self.count(record)
+            else:
+                self._count_change(package_key, package1, package2)
+        if count_packages:
+            for package_key, package2 in packages2.items():
+                if package_key not in packages1:
+                    self.new_packages += len(get_instances(package2))
+
+    def _count_change(self, package_key, package1, package2):
+        # Counts the same differences as changed_record
+        version1, license1, checksums1 = package1
+        version2, license2, checksums2 = package2
+        if version1 is version2 and license1 is license2 and checksums1 == checksums2:
+            return
+        version_change = version1 != version2 and version1.upper() != version2.upper()
+        if self.version_filter is not None and not (
+            version_change
+            and classify_version_change(
+                version1, version2, self._get_ecosystem(package_key)
+            )
+            == self.version_filter
+        ):
+            return
+        license_change = not self.exclude_license and not licenses_equivalent(
+            license1, license2
+        )
+        checksum_change = False
+        if self.checksum != "" and checksums1 is not None and checksums2 is not None:
+            value1 = self._get_checksum(checksums1)
+            value2 = self._get_checksum(checksums2)
+            checksum_change = value1 is not None and value2 is not None and (
+                value1 != value2
+            )
+        self.version_changes += version_change
+        self.license_changes += license_change
+        self.checksum_changes += checksum_change
+
+    def first_difference(self, packages1, packages2):
+        """Find the first difference between a package table and a stream.
+
+        Each package generated by packages2 is matched against an unchanged
+        instance of the same key in packages1; the stream is only consumed
+        until a package without a match is found. Once the stream has ended,
+        only the number of unmatched instances in packages1 is checked.
+        The version filter is not applied and no differences are counted.
+
+        Args:
+            packages1: Package table of the first SBOM
+            packages2: Iterable of (package_key, instance) of the second SBOM
+
+        Returns:
+            Key of the first package found to be different, or None if
+            there are no differences
+        """
+        unmatched = sum(len(get_instances(package)) for package in packages1.values())
+        remaining = {}
+        for package_key, instance2 in packages2:
+            instances = remaining.get(package_key)
+            if instances is None:
+                package1 = packages1.get(package_key)
+                if package1 is None:
+                    # Package has been added
+                    return package_key
+                instances = remaining[package_key] = list(get_instances(package1))
+            for index, instance1 in enumerate(instances):
+                if self.changed_record(package_key, instance1, instance2) is None:
+                    del instances[index]
+                    break
+            else:
+                # Package has been changed or added
+                return package_key
+            unmatched -= 1
+        if unmatched == 0:
+            return None
+        # Package has been removed
+        for package_key in packages1:
+            if remaining.get(package_key, True):
+                return package_key
+
+    def compare_sorted(self, packages1, packages2, sort="name"):
+        """Generate the difference records of two tables in a deterministic order.
+
+        Records are ordered by package key (name then path), by path then
+        name, or by status (see STATUS_ORDER) then name. The order does
+        not depend on the order of packages in either table.
+        """
+        for _, record in self._compare_sorted_keyed(packages1, packages2, sort):
+            yield record
+
+    def _compare_sorted_keyed(self, packages1, packages2, sort):
+        # Records sorted by status are held by status until the tables have
+        # been merged
+        buckets = None
+        if sort == "status":
+            buckets = {status: [] for status in STATUS_ORDER}
+        for package_key, in_first, in_second in merge_keys(
+            packages1, packages2, SORT_KEYS[sort]
+        ):
+            package1 = packages1[package_key] if in_first else None
+            package2 = packages2[package_key] if in_second else None
+            if package1 is None:
+                records = (
+                    self.added_record(package_key, instance)
+                    for instance in get_instances(package2)
+                )
+            else:
+                records = self._records(package_key, package1, package2)
+            if isinstance(package1, Instances) or isinstance(package2, Instances):
+                # Order of instances within each SBOM is not significant
+                records = sorted(
+                    records, key=lambda record: json.dumps(record, sort_keys=True)
+                )
+            for record in records:
+                if self.accept(record):
+                    self.count(record)
+                    if buckets is None:
+                        yield package_key, record
+                    else:
+                        buckets[record["status"]].append((package_key, record))
+        if buckets is not None:
+            for status in STATUS_ORDER:
+                yield from buckets[status]
+
+    def detect_renames(self, records, threshold=SIMILARITY_THRESHOLD):
+        """Report removed and added packages with similar names as renamed.
+
+        Each matched pair of records is replaced by a single rename record
+        at the position of the removed package (see match_renames). The
+        records are returned in their original order otherwise.
+
+        Args:
+            records: Iterable of difference records
+            threshold: Minimum similarity of the names of a renamed package
+
+        Returns:
+            List of difference records
+        """
+        records = list(records)
+        removed = []
+        added = []
+        for position, record in enumerate(records):
+            if record["status"] == "remove":
+                removed.append(position)
+            elif record["status"] == "add":
+                added.append(position)
+        matches = match_renames(
+            [(records[i].get("path", ""), records[i]["package"]) for i in removed],
+            [(records[i].get("path", ""), records[i]["package"]) for i in added],
+            threshold,
+        )
+        self.renamed_packages = 0
+        renamed = set()
+        for removed_position, added_position, score in matches:
+            record1 = records[removed[removed_position]]
+            record2 = records[added[added_position]]
+            package_info = {
+                key: value
+                for key, value in record1.items()
+                if key in ("package", "path", "purl")
+            }
+            package_info["status"] = "rename"
+            package_info["name"] = {
+                "from": record1["package"],
+                "to": record2["package"],
+                "similarity": round(score, 2),
+            }
+            package_info["version"] = {
+                "from": record1["version"]["from"],
+                "to": record2["version"]["from"],
+            }
+            records[removed[removed_position]] = package_info
+            renamed.add(added[added_position])
+            self.removed_packages -= 1
+            self.new_packages -= 1
+            self.count(package_info)
+        return [record for i, record in enumerate(records) if i not in renamed]
+
+    def compare_dependencies(self, dependencies1, dependencies2):
+        """Compare the (source, target) dependencies of two SBOMs.
+
+        Returns:
+            Dictionary of added and removed dependencies and the packages
+            whose transitive dependents are affected (see diff_graphs)
+        """
+        nodes = NodeIndex()
+        graph1 = DependencyGraph(dependencies1, nodes)
+        graph2 = DependencyGraph(dependencies2, nodes)
+        self.dependency_diff = diff_graphs(graph1, graph2)
+        return self.dependency_diff
+
+    def has_differences(self):
+        dependency_changes = 0
+        if self.dependency_diff is not None:
+            dependency_changes = len(self.dependency_diff["added"]) + len(
+                self.dependency_diff["removed"]
+            )
+        return (
+            self.version_changes
+            or self.license_changes
+            or self.removed_packages
+            or self.new_packages
+            or self.checksum_changes
+            or self.renamed_packages
+            or dependency_changes
+        ) != 0
+
+    def get_summary(self):
+        summary = dict()
+        summary["version_changes"] = self.version_changes
+        summary["new_packages"] = self.new_packages
+        summary["removed_packages"] = self.removed_packages
+        if not self.exclude_license:
+            summary["license_changes"] = self.license_changes
+        if self.checksum != "":
+            summary["checksum_changes"] = self.checksum_changes
+        if self.renamed_packages is not None:
+            summary["renamed_packages"] = self.renamed_packages
+        if self.dependency_diff is not None:
+            summary["new_dependencies"] = len(self.dependency_diff["added"])
+            summary["removed_dependencies"] = len(self.dependency_diff["removed"])
+        return summary
+
+    def summary_lines(self):
+        lines = ["\nSummary\n-------", f"Version changes:  {self.version_changes}"]
+        if not self.exclude_license:
+            lines.append(f"License changes:  {self.license_changes}")
+        lines.append(f"Removed packages: {self.removed_packages}")
+        lines.append(f"New packages:     {self.new_packages}")
+        if self.checksum != "":
+            lines.append(f"Checksum changes: {self.checksum_changes}")
+        if self.renamed_packages is not None:
+            lines.append(f"Renamed packages: {self.renamed_packages}")
+        if self.dependency_diff is not None:
+            lines.append(f"New dependencies: {len(self.dependency_diff['added'])}")
+            lines.append(
+                f"Removed dependencies: {len(self.dependency_diff['removed'])}"
+            )
+        return lines
+
+    def generate_document(self, file1, file2, differences=None):
+        """Build the document reported in JSON and YAML output.
+
+        If differences is None, only the summary of the differences is
+        included.
+        """
+        json_doc = {}
+        tool = dict()
+        tool["name"] = "sbomdiff"
+        tool["version"] = VERSION
+        json_doc["tool"] = tool
+        json_doc["file_1"] = file1
+        json_doc["file_2"] = file2
+        if differences is not None:
+            json_doc["differences"] = differences
+        if differences is not None and self.dependency_diff is not None:
+            dependencies = dict()
+            dependencies["added"] = [
+                {"from": source, "to": target}
+                for source, target in self.dependency_diff["added"]
+            ]
+            dependencies["removed"] = [
+                {"from": source, "to": target}
+                for source, target in self.dependency_diff["removed"]
+            ]
+            dependencies["affected"] = self.dependency_diff["affected"]
+            json_doc["dependencies"] = dependencies
+        json_doc["summary"] = self.get_summary()
+        return json_doc
@@ -0,0 +1,33 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Projection of the package fields extracted from a SBOM.
+
+The version of a package is always extracted. The license and checksums
+of a package are only extracted if they are compared; a field which is
+not extracted is held as None so package records always have the same
+shape.
+"""
+
+LICENSE = "license"
+CHECKSUM = "checksum"
+
+ALL_FIELDS = frozenset((LICENSE, CHECKSUM))
+
+
+def required_fields(exclude_license=False, checksum=""):
+    """Return the fields required to compare SBOMs with the given options.
+
+    Args:
+        exclude_license: True if licenses are not compared
+        checksum: Checksum algorithm which is compared, or "" if none
+
+    Returns:
+        Frozenset of the optional fields (LICENSE, CHECKSUM) to extract
+    """
+    fields = set()
+    if not exclude_license:
+        fields.add(LICENSE)
+    if checksum != "":
+        fields.add(CHECKSUM)
+    return frozenset(fields)
@@ -0,0 +1,110 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Selection of the packages which are compared.
+
+A filter is specified as FIELD:PATTERN where FIELD is one of the FIELDS
+and PATTERN is a shell style wildcard pattern (e.g. "name:lib*",
+"purl:npm" or "path:/usr/bin/*"). A path pattern ending in "/" matches
+every path starting with the pattern. Purl types and component types are
+matched ignoring case.
+
+The patterns are compiled into a single regular expression for each
+field, so checking a package costs at most one match for each field.
+"""
+
+import fnmatch
+import re
+
+from sbomdiff.purl import purl_type
+
+FIELDS = ("name", "purl", "type", "path")
+
+# Fields which are matched ignoring case
+_CASELESS_FIELDS = ("purl", "type")
+
+
+def parse_filter(spec):
+    """Split a filter specification into (field, pattern).
+
+    Raises:
+        ValueError: if the field is not one of the FIELDS
+    """
+    field, separator, pattern = spec.partition(":")
+    field = field.strip().lower()
+    if not separator or field not in FIELDS or not pattern:
+        raise ValueError(
+            f"Invalid filter {spec!r}: expected FIELD:PATTERN where FIELD is "
+            f"one of {', '.join(FIELDS)}"
+        )
+    if field == "path" and pattern.endswith("/"):
+        pattern = pattern + "*"
+    if field in _CASELESS_FIELDS:
+        pattern = pattern.lower()
+    return field, pattern
+
+
+def _compile(specs):
+    # Single regular expression for the patterns of each field
+    patterns = {}
+    for spec in specs:
+        field, pattern = parse_filter(spec)
+        patterns.setdefault(field, []).append(fnmatch.translate(pattern))
+    return {
+        field: re.compile("|".join(field_patterns))
+        for field, field_patterns in patterns.items()
+    }
+
+
+class PackageFilter:
+    """Decides if a package is selected by include and exclude filters.
+
+    A package is selected if it matches any of the include filters (or
+    there are no include filters) and does not match any of the exclude
+    filters. A package without a value for a field (e.g. no purl) does not
+    match the filters for that field.
+
+    Args:
+        include: List of filter specifications of packages to include
+        exclude: List of filter specifications of packages to exclude
+
+    Raises:
+        ValueError: if a filter specification is not valid
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = _compile(include or ())
+        self.exclude = _compile(exclude or ())
+
+    def __bool__(self):
+        # An empty filter selects every package
+        return bool(self.include or self.exclude)
+
+    def _matches(self, patterns, values):
+        for field, pattern in patterns.items():
+            value = values[field]
+            if value is not None and pattern.match(value):
+                return True
+        return False
+
+    def matches(self, name, path="", purl=None, component_type=None):
+        """Check if a package is selected.
+
+        Args:
+            name: Package name
+            path: Location of the package
+            purl: Package URL of the package
+            component_type: Type of component (e.g. library or application)
+
+        Returns:
+            True if the package is selected
+        """
+        values = {
+            "name": name,
+            "path": path or None,
+            "purl": purl_type(purl) if purl else None,
+            "type": component_type.lower() if component_type else None,
+        }
+        if self.include and not self._matches(self.include, values):
+            return False
+        return not self._matches(self.exclude, values)
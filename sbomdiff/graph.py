@@ -0,0 +1,153 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Dependency graphs and the differences between them.
+
+Package names are mapped to integer node identifiers which are shared by
+the graphs being compared. Each edge is encoded as a single integer so the
+added and removed edges are found using set operations. The adjacency
+of each graph is held in a compressed sparse row index.
+"""
+
+from array import array
+
+# Relationship types which describe a dependency. The value indicates if
+# the direction of the relationship is the reverse of the dependency.
+# DESCRIBES is not a dependency; its source is the name of the document,
+# so renaming the document would change the edge to the root package.
+DEPENDENCY_TYPES = {"DEPENDS_ON": False, "DEPENDENCY_OF": True}
+
+_NODE_BITS = 32
+_NODE_MASK = (1 << _NODE_BITS) - 1
+
+
+def dependency_edges(relationships):
+    """Generate (source, target) dependencies from lib4sbom relationships."""
+    for relationship in relationships:
+        reverse = DEPENDENCY_TYPES.get(relationship.get("type"))
+        if reverse is None:
+            continue
+        source = relationship.get("source")
+        target = relationship.get("target")
+        if not source or not target:
+            continue
+        yield (target, source) if reverse else (source, target)
+
+
+class NodeIndex:
+    """Maps package names to node identifiers shared by several graphs."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def get_id(self, name):
+        node_id = self.ids.get(name)
+        if node_id is None:
+            node_id = len(self.names)
+            self.ids[name] = node_id
+            self.names.append(name)
+        return node_id
+
+    def get_name(self, node_id):
+        return self.names[node_id]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class DependencyGraph:
+    """Adjacency index of the dependencies of a SBOM.
+
+    Args:
+        edges: Iterable of (source, target) package names
+        nodes: NodeIndex shared with the graphs to be compared
+    """
+
+    def __init__(self, edges, nodes=None):
+        self.nodes = nodes if nodes is not None else NodeIndex()
+        get_id = self.nodes.get_id
+        self.edges = {
+            get_id(source) << _NODE_BITS | get_id(target) for source, target in edges
+        }
+        self._offsets = None
+        self._targets = None
+
+    def __len__(self):
+        return len(self.edges)
+
+    def _build_index(self):
+        # Compressed sparse row index of the successors of each node
+        node_count = len(self.nodes)
+        itemsize = array("L").itemsize
+        offsets = array("L", bytes(itemsize * (node_count + 1)))
+        for edge in self.edges:
+            offsets[(edge >> _NODE_BITS) + 1] += 1
+        for node_id in range(node_count):
+            offsets[node_id + 1] += offsets[node_id]
+        targets = array("L", bytes(itemsize * len(self.edges)))
+        positions = array("L", offsets)
+        for edge in self.edges:
+            source = edge >> _NODE_BITS
+            targets[positions[source]] = edge & _NODE_MASK
+            positions[source] += 1
+        self._offsets = offsets
+        self._targets = targets
+
+    def successors(self, node_id):
+        """Return the identifiers of the direct dependencies of a node."""
+        if self._offsets is None:
+            self._build_index()
+        if node_id + 1 >= len(self._offsets):
+            # Node added to the NodeIndex by another graph
+            return self._targets[0:0]
+        return self._targets[self._offsets[node_id] : self._offsets[node_id + 1]]
+
+    def reachable(self, start_ids):
+        """Return the nodes reachable from any of the start nodes.
+
+        The graph is traversed once for all of the start nodes so each node
+        and edge is visited at most once.
+        """
+        visited = set(start_ids)
+        stack = list(visited)
+        while stack:
+            for successor in self.successors(stack.pop()):
+                if successor not in visited:
+                    visited.add(successor)
+                    stack.append(successor)
+        return visited
+
+    def get_edges(self, encoded_edges=None):
+        """Return (source, target) names for encoded edges, sorted by name."""
+        get_name = self.nodes.get_name
+        if encoded_edges is None:
+            encoded_edges = self.edges
+        return sorted(
+            (get_name(edge >> _NODE_BITS), get_name(edge & _NODE_MASK))
+            for edge in encoded_edges
+        )
+
+
+def diff_graphs(graph1, graph2):
+    """Compare the dependencies of two graphs sharing a NodeIndex.
+
+    Returns:
+        Dictionary of added and removed (source, target) dependencies and
+        the packages affected by the changes. A package is affected if a
+        changed dependency may alter its set of transitive dependents, i.e.
+        it is the target of a changed dependency or is a transitive
+        dependency of such a target.
+    """
+    if graph1.nodes is not graph2.nodes:
+        raise ValueError("Graphs must share the same NodeIndex")
+    added = graph2.edges - graph1.edges
+    removed = graph1.edges - graph2.edges
+    affected = graph1.reachable({edge & _NODE_MASK for edge in removed})
+    affected |= graph2.reachable({edge & _NODE_MASK for edge in added})
+    get_name = graph1.nodes.get_name
+    return {
+        "added": graph2.get_edges(added),
+        "removed": graph1.get_edges(removed),
+        "affected": sorted(get_name(node_id) for node_id in affected),
+    }
@@ -0,0 +1,100 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Creation of SBOM index files.
+
+An index file holds the package table of a SBOM in the flat encoding of
+table.py. Index files can be compared in place of the SBOMs they were
+created from: they are memory mapped rather than parsed, and packages
+are matched by a merge join, so only the packages which differ are
+decoded.
+"""
+
+import argparse
+import pathlib
+import textwrap
+
+from sbomdiff.diff import parse_sbom
+from sbomdiff.properties import PathPropertyClassifier
+from sbomdiff.table import write_table
+
+INDEX_EXTENSION = ".sbomidx"
+
+
+def create_index(sbom_file, index_file, sbom_type="auto", path_classifier=None):
+    """Write the index of a SBOM file.
+
+    Every field of each package is held so the index can be compared
+    using any options.
+
+    Args:
+        sbom_file: Filename of the SBOM
+        index_file: Filename of the index
+        sbom_type: Type of SBOM (auto, spdx or cyclonedx)
+        path_classifier: PathPropertyClassifier to identify package locations
+
+    Returns:
+        Tuple of (packages, type) as parse_sbom
+    """
+    packages, parsed_type = parse_sbom(
+        sbom_file, sbom_type, path_classifier=path_classifier
+    )
+    write_table(packages, index_file)
+    return packages, parsed_type
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="sbomdiff index",
+        description=textwrap.dedent("""
+            Creates an index of a SBOM which can be compared in place of
+            the SBOM without parsing it again.
+            """),
+    )
+    parser.add_argument(
+        "--sbom",
+        action="store",
+        default="auto",
+        choices=["auto", "spdx", "cyclonedx"],
+        help="specify type of sbom to index (default: auto)",
+    )
+    parser.add_argument(
+        "--path-property",
+        action="append",
+        metavar="NAME",
+        help="name of a property which holds the location of a package, or "
+        "the name of a tool (syft, trivy, cdxgen) to use its properties; "
+        "may be repeated",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-file",
+        action="store",
+        default="",
+        help=f"index filename (default: SBOM filename with {INDEX_EXTENSION} added)",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_true",
+        default=False,
+        help="show debug information",
+    )
+    parser.add_argument("SBOM", help="SBOM file")
+    args = parser.parse_args(argv)
+
+    if not pathlib.Path(args.SBOM).exists():
+        print(f"{args.SBOM} does not exist")
+        return -1
+    index_file = args.output_file or args.SBOM + INDEX_EXTENSION
+    path_classifier = PathPropertyClassifier(args.path_property or ())
+    packages, sbom_type = create_index(
+        args.SBOM, index_file, args.sbom, path_classifier
+    )
+    if args.debug:
+        print("SBOM File", args.SBOM)
+        print("SBOM File - type", sbom_type)
+        print("SBOM File - packages", len(packages))
+        print("Index file", index_file)
+        print("Index file - bytes", pathlib.Path(index_file).stat().st_size)
+    return 0
@@ -0,0 +1,131 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Streaming of the elements of a JSON array within a document.
+
+SPDX 3.0 documents hold every element (packages, licenses, relationships,
+...) in a flat @graph array; CycloneDX and SPDX 2 JSON documents hold
+their packages in a components or packages array. Rather than loading
+the whole document, the
+file is read in chunks and each element of the array is decoded as it is
+reached using json.JSONDecoder.raw_decode, so only a single element (and
+the unread part of the current chunk) is held as text.
+"""
+
+import json
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkReader:
+    # Buffer of the unread text of a stream which is extended on demand
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _read(self, size=None):
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Discard the text which has already been decoded
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def next_char(self):
+        """Skip whitespace and return the next character, or '' at the end."""
+        while True:
+            while self.position < len(self.buffer):
+                if self.buffer[self.position] not in _WHITESPACE:
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self._read():
+                return ""
+
+    def expect(self, characters):
+        char = self.next_char()
+        if char == "" or char not in characters:
+            raise ValueError(f"Expected one of {characters!r}, found {char!r}")
+        self.position += 1
+        return char
+
+    def decode(self, decoder):
+        """Decode the next JSON value.
+
+        raw_decode starts again from the beginning of the value after each
+        read, so the size of each read is doubled while the value is
+        incomplete; decoding a value is then linear in its size.
+        """
+        self.next_char()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # Value may continue in the next chunk
+                if not self._read(size):
+                    raise
+                size *= 2
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # A number may continue in the next chunk
+                if self._read(size):
+                    size *= 2
+                    continue
+            self.position = end
+            return value
+
+
+def iter_array(stream, key, chunk_size=CHUNK_SIZE):
+    """Generate the elements of an array member of a top level JSON object.
+
+    Members of the object before the array are decoded and discarded;
+    members after the array are not read.
+
+    Args:
+        stream: Text file object of the document
+        key: Name of the member holding the array (e.g. @graph)
+        chunk_size: Number of characters read at a time
+
+    Returns:
+        Generator of each element of the array
+    """
+    decoder = json.JSONDecoder()
+    reader = _ChunkReader(stream, chunk_size)
+    reader.expect("{")
+    if reader.next_char() == "}":
+        return
+    while True:
+        member = reader.decode(decoder)
+        reader.expect(":")
+        if member == key:
+            break
+        reader.decode(decoder)
+        if reader.expect(",}") == "}":
+            # Document does not contain the array
+            return
+    if reader.next_char() != "[":
+        # Member is not an array
+        return
+    reader.expect("[")
+    if reader.next_char() == "]":
+        return
+    while True:
+        yield reader.decode(decoder)
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_graph(stream, chunk_size=CHUNK_SIZE):
+    """Generate the elements of the @graph array of a JSON-LD document.
+
+    See iter_array.
+    """
+    return iter_array(stream, "@graph", chunk_size)
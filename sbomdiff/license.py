@@ -0,0 +1,166 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Canonical form of SPDX license expressions.
+
+Equivalent expressions such as 'MIT OR Apache-2.0' and 'Apache-2.0 OR MIT',
+or a license URI and the corresponding SPDX identifier, have the same
+canonical form. The canonical form is only used for comparison; the
+original expressions are reported.
+"""
+
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 4096
+
+_TOKENS = re.compile(r"\s*(\(|\)|[^\s()]+)")
+_OPERATORS = {"AND", "OR", "WITH"}
+_LICENSE_URI = re.compile(r"^https?://spdx\.org/licenses/([^/]+?)(?:\.html)?$")
+_TERMS_URI = re.compile(r"^https?://spdx\.org/rdf/terms#(\w+)$")
+
+
+class LicenseExpressionError(ValueError):
+    pass
+
+
+def normalise_license_id(license_id):
+    """Return the canonical form of a single license identifier.
+
+    License URIs are reduced to the license identifier and, as SPDX license
+    identifiers are case insensitive, the identifier is returned in upper case.
+    """
+    license_id = license_id.strip("\"'")
+    match = _LICENSE_URI.match(license_id)
+    if match is not None:
+        license_id = match.group(1)
+    else:
+        match = _TERMS_URI.match(license_id)
+        if match is not None:
+            license_id = match.group(1)
+    return license_id.upper()
+
+
+class _ExpressionParser:
+    """Recursive descent parser for SPDX license expressions.
+
+    Precedence is WITH, then AND, then OR. Each node is returned as a tuple
+    of its canonical text and its operator (None for a single license).
+    """
+
+    def __init__(self, expression):
+        self.tokens = _TOKENS.findall(expression)
+        self.position = 0
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise LicenseExpressionError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def parse(self):
+        text, _ = self._compound("OR")
+        if self._peek() is not None:
+            raise LicenseExpressionError(f"Unexpected token {self._peek()}")
+        return text
+
+    def _compound(self, operator):
+        operand = self._and_expression if operator == "OR" else self._simple
+        operands = [operand()]
+        while self._peek() is not None and self._peek().upper() == operator:
+            self._next()
+            operands.append(operand())
+        if len(operands) == 1:
+            return operands[0]
+        # Operands are unique and sorted so that order is not significant
+        parts = {}
+        for text, operand_operator in operands:
+            if operand_operator == operator:
+                # Flatten nested expressions using the same operator
+                for part in self._split(text, operator):
+                    parts[part] = (part, None)
+            elif operand_operator in ("AND", "OR"):
+                parts[f"({text})"] = (text, operand_operator)
+            else:
+                parts[text] = (text, operand_operator)
+        if len(parts) == 1:
+            return next(iter(parts.values()))
+        return (f" {operator} ".join(sorted(parts)), operator)
+
+    def _and_expression(self):
+        return self._compound("AND")
+
+    def _split(self, text, operator):
+        # Split canonical text at top level occurrences of the operator
+        parts = []
+        depth = 0
+        start = 0
+        separator = f" {operator} "
+        index = 0
+        while index < len(text):
+            if text[index] == "(":
+                depth += 1
+            elif text[index] == ")":
+                depth -= 1
+            elif depth == 0 and text.startswith(separator, index):
+                parts.append(text[start:index])
+                index += len(separator)
+                start = index
+                continue
+            index += 1
+        parts.append(text[start:])
+        return parts
+
+    def _simple(self):
+        token = self._next()
+        if token == "(":
+            result = self._compound("OR")
+            if self._next() != ")":
+                raise LicenseExpressionError("Missing closing parenthesis")
+            return result
+        if token == ")" or token.upper() in _OPERATORS:
+            raise LicenseExpressionError(f"Unexpected token {token}")
+        license_id = normalise_license_id(token)
+        if self._peek() is not None and self._peek().upper() == "WITH":
+            self._next()
+            exception = self._next()
+            if exception in ("(", ")") or exception.upper() in _OPERATORS:
+                raise LicenseExpressionError(f"Unexpected token {exception}")
+            return (f"{license_id} WITH {normalise_license_id(exception)}", "WITH")
+        return (license_id, None)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalise_license(expression):
+    """Return the canonical form of a license expression.
+
+    Operands of AND and OR are sorted and duplicates removed, redundant
+    parentheses are removed and license URIs are reduced to identifiers.
+    Text which is not a valid expression (e.g. a license name) is returned
+    in upper case with whitespace normalised.
+
+    Args:
+        expression: License expression
+
+    Returns:
+        Canonical form of the expression
+    """
+    try:
+        return _ExpressionParser(expression).parse()
+    except LicenseExpressionError:
+        return " ".join(expression.split()).upper()
+
+
+def licenses_equivalent(license1, license2):
+    """Check if two license expressions have the same canonical form."""
+    if license1 == license2:
+        return True
+    if not isinstance(license1, str) or not isinstance(license2, str):
+        return False
+    return canonicalise_license(license1) == canonicalise_license(license2)
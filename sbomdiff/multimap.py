@@ -0,0 +1,80 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Package tables which keep every instance of a package key.
+
+A package table maps each package key to the [version, license, ...]
+list of the package. Most keys only have a single instance, which is
+stored directly so the table is no larger than one without duplicates.
+A key with more than one instance (e.g. different versions of a package
+within the same image) holds an Instances list of every instance.
+"""
+
+
+_MISSING = object()
+
+
+class Instances(list):
+    """All of the instances of a package key which occurs more than once."""
+
+    __slots__ = ()
+
+
+def add_instance(packages, package_key, instance):
+    """Add an instance of a package to a package table.
+
+    An instance may be None (e.g. a package without a parent component).
+    """
+    existing = packages.get(package_key, _MISSING)
+    if existing is _MISSING:
+        packages[package_key] = instance
+    elif isinstance(existing, Instances):
+        existing.append(instance)
+    else:
+        packages[package_key] = Instances([existing, instance])
+
+
+def get_instances(package_value):
+    """Return the list of instances for a value in a package table."""
+    if isinstance(package_value, Instances):
+        return package_value
+    return [package_value]
+
+
+def _instance_id(instance):
+    # Hashable identity of an instance; checksums are held as lists
+    return tuple(
+        tuple(map(tuple, item)) if isinstance(item, list) else item
+        for item in instance
+    )
+
+
+def diff_instances(instances1, instances2):
+    """Multiset difference of the instances of a package key.
+
+    Instances which are present (the same number of times) in both lists
+    are ignored.
+
+    Returns:
+        Tuple of (removed, added) lists of instances, each in the order
+        of the original lists
+    """
+    counts = {}
+    for instance in instances2:
+        instance_id = _instance_id(instance)
+        counts[instance_id] = counts.get(instance_id, 0) + 1
+    removed = []
+    for instance in instances1:
+        instance_id = _instance_id(instance)
+        if counts.get(instance_id, 0) > 0:
+            counts[instance_id] -= 1
+        else:
+            removed.append(instance)
+    added = []
+    for instance in reversed(instances2):
+        instance_id = _instance_id(instance)
+        if counts.get(instance_id, 0) > 0:
+            counts[instance_id] -= 1
+            added.append(instance)
+    added.reverse()
+    return removed, added
@@ -0,0 +1,228 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Comparison of package tables using several worker processes.
+
+The keys are partitioned into shards: each shard holds a contiguous range
+of the keys of the first table, together with a contiguous range of the
+keys of the second table which are not in the first table. A key is
+therefore compared within exactly one shard, and the package with the
+same key in the other table is found by a lookup in that table. Each shard
+is compared by a worker process and the records of the shards are merged
+in the order in which a single process would generate them; the counts of
+differences of each shard are added to the SBOMDiff.
+
+Where the fork start method is available, the tables are inherited by the
+worker processes rather than pickled and each shard is a view of the
+tables, so neither the parent nor the workers copy the tables; the
+inherited objects are frozen so they are not scanned by the garbage
+collector. Otherwise the tables are encoded once into shared memory (see
+table.py) which each worker attaches to without copying or unpickling.
+Only the results are returned.
+"""
+
+import gc
+import heapq
+import multiprocessing
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from operator import itemgetter
+
+from sbomdiff.diff import SORT_KEYS, STATUS_ORDER
+from sbomdiff.table import PackageTable, SharedPackageTable
+
+# Counts of differences maintained by SBOMDiff
+COUNTERS = (
+    "version_changes",
+    "new_packages",
+    "removed_packages",
+    "license_changes",
+    "checksum_changes",
+)
+
+# Package tables inherited by forked worker processes
+_tables = None
+
+
+def shard_range(count, index, shards):
+    """Return the (start, stop) range of the items of a table in a shard."""
+    return count * index // shards, count * (index + 1) // shards
+
+
+def _items_range(packages, start, stop):
+    if isinstance(packages, PackageTable):
+        # Only the items in the range are decoded
+        return packages.items_range(start, stop)
+    return islice(packages.items(), start, stop)
+
+
+def _keys_range(packages, start, stop):
+    if isinstance(packages, PackageTable):
+        return packages.keys_range(start, stop)
+    return islice(packages, start, stop)
+
+
+class ShardTable(Mapping):
+    """View of a package table within a shard.
+
+    Iteration is restricted to a range of the keys of the table, excluding
+    any keys in another table; lookups see the whole table.
+    """
+
+    def __init__(self, packages, start, stop, exclude=None):
+        self.packages = packages
+        self.start = start
+        self.stop = stop
+        self.exclude = exclude
+
+    def __getitem__(self, package_key):
+        return self.packages[package_key]
+
+    def __contains__(self, package_key):
+        return package_key in self.packages
+
+    def get(self, package_key, default=None):
+        return self.packages.get(package_key, default)
+
+    def __iter__(self):
+        for package_key, _ in self.items():
+            yield package_key
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
+
+    def items(self):
+        items = _items_range(self.packages, self.start, self.stop)
+        if self.exclude is None:
+            return items
+        return (item for item in items if item[0] not in self.exclude)
+
+
+def shard_tables(packages1, packages2, index, shards):
+    """Return views of two package tables for a shard.
+
+    Returns:
+        Tuple of (packages1, packages2, order) where packages1 and packages2
+        are ShardTables and order generates (position, package_key) for
+        each key of the shard in the order of compare (keys of the first
+        table, then new keys of the second table)
+    """
+    start1, stop1 = shard_range(len(packages1), index, shards)
+    start2, stop2 = shard_range(len(packages2), index, shards)
+    order = chain(
+        enumerate(_keys_range(packages1, start1, stop1), start1),
+        enumerate(_keys_range(packages2, start2, stop2), len(packages1) + start2),
+    )
+    return (
+        ShardTable(packages1, start1, stop1),
+        ShardTable(packages2, start2, stop2, packages1),
+        order,
+    )
+
+
+def _order(package_key, record, position, sort):
+    # Order of a record within the merged records
+    if sort is None:
+        return position
+    if sort == "status":
+        return STATUS_ORDER.index(record["status"]), SORT_KEYS[sort](package_key)
+    return SORT_KEYS[sort](package_key)
+
+
+def _diff_shard(sbom_diff, mode, sort, index, shards, names=None):
+    # Compares a shard in a worker process
+    if names is None:
+        # Inherited objects are never garbage
+        gc.freeze()
+        return _diff_tables(sbom_diff, mode, sort, index, shards, _tables)
+    shared = [SharedPackageTable.attach(name) for name in names]
+    try:
+        tables = [shared_table.table for shared_table in shared]
+        return _diff_tables(sbom_diff, mode, sort, index, shards, tables)
+    finally:
+        for shared_table in shared:
+            shared_table.close()
+
+
+def _diff_tables(sbom_diff, mode, sort, index, shards, tables):
+    packages1, packages2, order = shard_tables(*tables, index, shards)
+    sbom_diff.reset()
+    records = []
+    if mode == "count":
+        sbom_diff.count_differences(packages1, packages2)
+    else:
+        # Records are generated in the order of the keys of the shard
+        order = iter(order)
+        position, key = None, None
+        for package_key, record in sbom_diff.compare_keyed(
+            packages1, packages2, sort
+        ):
+            if sort is None:
+                while key != package_key:
+                    position, key = next(order)
+            records.append((_order(package_key, record, position, sort), record))
+    return records, [getattr(sbom_diff, counter) for counter in COUNTERS]
+
+
+def _run_shards(sbom_diff, packages1, packages2, jobs, mode, sort=None):
+    # Returns the results of each shard in shard order
+    global _tables
+    gc_enabled = gc.isenabled()
+    shared = []
+    names = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _tables = (packages1, packages2)
+    else:
+        context = None
+        shared.append(SharedPackageTable.create(packages1))
+        shared.append(SharedPackageTable.create(packages2))
+        names = [shared_table.name for shared_table in shared]
+    try:
+        with ProcessPoolExecutor(jobs, mp_context=context) as executor:
+            futures = [
+                executor.submit(_diff_shard, sbom_diff, mode, sort, index, jobs, names)
+                for index in range(jobs)
+            ]
+            # Unpickled records are not garbage so need not be collected
+            gc.disable()
+            results = [future.result() for future in futures]
+    finally:
+        _tables = None
+        for shared_table in shared:
+            shared_table.close()
+        if gc_enabled:
+            gc.enable()
+    for _, counts in results:
+        for counter, count in zip(COUNTERS, counts):
+            setattr(sbom_diff, counter, getattr(sbom_diff, counter) + count)
+    return [records for records, _ in results]
+
+
+def parallel_compare(sbom_diff, packages1, packages2, jobs, sort=None):
+    """Generate the difference records of two tables using worker processes.
+
+    Args:
+        sbom_diff: SBOMDiff whose options are used and whose counts are updated
+        packages1: Package table of the first SBOM
+        packages2: Package table of the second SBOM
+        jobs: Number of worker processes (and shards)
+        sort: Order of the records (see compare_sorted) or None for the
+            order of compare
+
+    Returns:
+        Generator of the same records, in the same order, as compare (or
+        compare_sorted if sort is specified)
+    """
+    shard_records = _run_shards(sbom_diff, packages1, packages2, jobs, "compare", sort)
+    for _, record in heapq.merge(*shard_records, key=itemgetter(0)):
+        yield record
+
+
+def parallel_count(sbom_diff, packages1, packages2, jobs):
+    """Count the differences between two tables using worker processes.
+
+    The counts are the same as those of SBOMDiff.count_differences.
+    """
+    _run_shards(sbom_diff, packages1, packages2, jobs, "count")
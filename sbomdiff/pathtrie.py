@@ -0,0 +1,180 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Aggregation of differences by the location of packages.
+
+Packages found within a binary (e.g. the Go modules of a binary reported
+by Syft) have the path of the binary as their location. Difference
+records are added to a trie of the components of their paths, and each
+node holds the counts of the differences at and below its path, so the
+counts for any binary or directory (e.g. /usr/bin) are available without
+scanning the records again.
+"""
+
+from collections import Counter
+
+from sbomdiff.versions import DOWNGRADE, UPGRADE
+
+# Categories of difference, in the order they are reported
+CATEGORIES = ("upgraded", "downgraded", "changed", "added", "removed", "renamed")
+
+# Name reported for packages without a location
+NO_PATH = "(no path)"
+
+
+def classify(record):
+    """Return the category of a difference record."""
+    status = record["status"]
+    if status == "add":
+        return "added"
+    if status == "remove":
+        return "removed"
+    if status == "rename":
+        return "renamed"
+    direction = record.get("version", {}).get("direction")
+    if direction == UPGRADE:
+        return "upgraded"
+    if direction == DOWNGRADE:
+        return "downgraded"
+    # License, checksum and other version changes
+    return "changed"
+
+
+def split_path(path):
+    """Split a path into the components used as the keys of a PathTrie.
+
+    The first component of an absolute path keeps its leading "/", so
+    joining the components with "/" gives the path again.
+    """
+    components = [component for component in path.split("/") if component]
+    if path.startswith("/") and components:
+        components[0] = "/" + components[0]
+    return components
+
+
+def format_counts(counts):
+    """Format counts of differences, e.g. "3 upgraded, 1 removed"."""
+    return ", ".join(
+        f"{counts[category]} {category}"
+        for category in CATEGORIES
+        if counts.get(category)
+    )
+
+
+class PathNode:
+    """Node of a PathTrie for one path prefix.
+
+    Attributes:
+        path: Path of the node
+        children: Dictionary of child nodes keyed by path component
+        counts: Counter of the differences located at the path
+        total: Counter of the differences located at or below the path
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.children = {}
+        self.counts = Counter()
+        self.total = Counter()
+
+
+class PathTrie:
+    """Counts of differences for every prefix of the package paths.
+
+    Adding a record updates the totals of each prefix of its path, so
+    adding is proportional to the depth of the path and the totals of
+    any prefix are read without visiting the nodes below it.
+    """
+
+    def __init__(self):
+        self.root = PathNode("")
+
+    def add(self, path, category, count=1):
+        """Add count differences of a category located at a path."""
+        node = self.root
+        node.total[category] += count
+        for component in split_path(path):
+            child = node.children.get(component)
+            if child is None:
+                child_path = f"{node.path}/{component}" if node.path else component
+                child = PathNode(child_path)
+                node.children[component] = child
+            node = child
+            node.total[category] += count
+        node.counts[category] += count
+
+    def add_record(self, record):
+        """Add a difference record generated by SBOMDiff."""
+        self.add(record.get("path", ""), classify(record))
+
+    def add_records(self, records):
+        """Add each record of an iterable."""
+        for record in records:
+            self.add_record(record)
+
+    def collect(self, records):
+        """Add each record of an iterable as it is generated.
+
+        Returns:
+            Generator of the records
+        """
+        for record in records:
+            self.add_record(record)
+            yield record
+
+    def find(self, path):
+        """Return the node for a path prefix, or None."""
+        node = self.root
+        for component in split_path(path):
+            node = node.children.get(component)
+            if node is None:
+                return None
+        return node
+
+    def get_counts(self, path=""):
+        """Return a Counter of the differences at or below a path prefix."""
+        node = self.find(path)
+        return Counter() if node is None else Counter(node.total)
+
+    def groups(self, depth=None):
+        """Generate the counts of differences for each group of paths.
+
+        Paths are generated in sorted order.
+
+        Args:
+            depth: Number of path components of each group. If None, each
+                location of a package (e.g. each binary) is a group.
+
+        Returns:
+            Generator of (path, counts); the path of packages without a
+            location is ""
+        """
+        stack = [(self.root, 0)]
+        while stack:
+            node, level = stack.pop()
+            if depth is not None and level == depth:
+                # Totals include every location below the path
+                yield node.path, node.total
+                continue
+            if node.counts:
+                yield node.path, node.counts
+            for component in sorted(node.children, reverse=True):
+                stack.append((node.children[component], level + 1))
+
+    def summary_lines(self, depth=None):
+        """Return lines of text output with the differences for each group."""
+        lines = ["\nPaths\n-----"]
+        for path, counts in self.groups(depth):
+            lines.append(f"{path or NO_PATH}: {format_counts(counts)}")
+        return lines
+
+    def generate_document(self, depth=None):
+        """Return the counts for each group as reported in JSON and YAML output."""
+        document = {}
+        for path, counts in self.groups(depth):
+            document[path or NO_PATH] = {
+                category: counts[category]
+                for category in CATEGORIES
+                if counts.get(category)
+            }
+        return document
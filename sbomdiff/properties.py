@@ -0,0 +1,63 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Identification of the properties which hold the location of a package.
+
+SBOM generators record the file containing a package using properties,
+e.g. syft:location:0:path. A property is treated as a location if its
+name contains both 'location' and 'path', ends with ':path' or is one
+of the tool specific names which the classifier has been configured
+with. The verdict for each property name is cached, so each distinct
+name is only examined once.
+"""
+
+# Tool specific names of properties which hold the location of a package
+TOOL_PATH_PROPERTIES = {
+    "syft": ("syft:location:0:path",),
+    "trivy": ("aquasecurity:trivy:FilePath",),
+    "cdxgen": ("SrcFile",),
+}
+
+CACHE_SIZE = 4096
+
+
+class PathPropertyClassifier:
+    """Classifies property names as location properties.
+
+    Args:
+        property_names: Additional property names, or tool names from
+            TOOL_PATH_PROPERTIES, which hold the location of a package
+    """
+
+    def __init__(self, property_names=()):
+        self.property_names = set()
+        for name in property_names:
+            for property_name in TOOL_PATH_PROPERTIES.get(name.lower(), (name,)):
+                self.property_names.add(property_name.lower())
+        self._verdicts = {}
+
+    def is_path(self, property_name):
+        """Check if a property holds the location of a package."""
+        verdict = self._verdicts.get(property_name)
+        if verdict is None:
+            name = property_name.lower()
+            verdict = (
+                name in self.property_names
+                or ("location" in name and "path" in name)
+                or name.endswith(":path")
+            )
+            if len(self._verdicts) >= CACHE_SIZE:
+                self._verdicts.clear()
+            self._verdicts[property_name] = verdict
+        return verdict
+
+    def find_path(self, properties):
+        """Return the value of the first location in (name, value) pairs."""
+        for property_name, value in properties:
+            if self.is_path(property_name):
+                return value or ""
+        return ""
+
+
+# Classifier used when a parser is not given a classifier
+DEFAULT_CLASSIFIER = PathPropertyClassifier()
@@ -0,0 +1,139 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Matching of packages using package URLs (purls).
+
+The canonical form of a purl contains the type, namespace, name and
+qualifiers of the package but not the version or subpath, so the same
+package in two SBOMs has the same canonical purl even if its version has
+changed. Canonical purls are interned so each distinct purl is only held
+once, however many packages and SBOMs refer to it.
+"""
+
+import sys
+from functools import lru_cache
+from urllib.parse import unquote
+
+CACHE_SIZE = 65536
+
+# Package types whose namespace and name are case insensitive
+_LOWERCASE_TYPES = {
+    "alpm",
+    "apk",
+    "bitbucket",
+    "composer",
+    "deb",
+    "github",
+    "hex",
+    "npm",
+    "pypi",
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_purl(purl):
+    """Return the canonical form of a package URL.
+
+    Args:
+        purl: Package URL, e.g. pkg:npm/%40angular/core@16.0.0?arch=x64
+
+    Returns:
+        Interned canonical purl without the version, e.g.
+        pkg:npm/@angular/core?arch=x64, or None if purl is not a valid
+        package URL
+    """
+    if not isinstance(purl, str) or purl[:4].lower() != "pkg:":
+        return None
+    remainder = purl[4:].strip().lstrip("/")
+    remainder = remainder.split("#", 1)[0]
+    remainder, _, qualifiers = remainder.partition("?")
+    # The version follows the last @ in the name
+    separator = remainder.rfind("@")
+    if separator > remainder.rfind("/"):
+        remainder = remainder[:separator]
+    segments = [unquote(segment) for segment in remainder.split("/") if segment]
+    if len(segments) < 2:
+        return None
+    package_type = segments[0].lower()
+    path = "/".join(segments[1:])
+    if package_type in _LOWERCASE_TYPES:
+        path = path.lower()
+    if package_type == "pypi":
+        path = path.replace("_", "-")
+    canonical = f"pkg:{package_type}/{path}"
+    if qualifiers:
+        pairs = []
+        for qualifier in qualifiers.split("&"):
+            key, _, value = qualifier.partition("=")
+            if value:
+                pairs.append(f"{key.lower()}={unquote(value)}")
+        if pairs:
+            canonical = f"{canonical}?{'&'.join(sorted(pairs))}"
+    return sys.intern(canonical)
+
+
+def purl_type(purl):
+    """Return the lower case type of a package URL (e.g. npm) or None."""
+    if not isinstance(purl, str) or purl[:4].lower() != "pkg:":
+        return None
+    package_type = purl[4:].lstrip("/").split("/", 1)[0]
+    return package_type.lower() or None
+
+
+class PurlIndex:
+    """Creates package keys based on the canonical purl of a package.
+
+    Packages with a purl are keyed on (canonical purl, path) so packages
+    with the same name from different ecosystems are distinct. Packages
+    without a purl fall back to (name, path). The same index should be
+    used for both SBOMs so the name of each package can be reported.
+    """
+
+    def __init__(self):
+        self.names = {}
+
+    def get_key(self, name, path, purl):
+        """Return the key for a package.
+
+        Args:
+            name: Package name
+            path: File path where package is located
+            purl: Package URL or None
+
+        Returns:
+            Tuple of (canonical purl, path) or (name, path)
+        """
+        canonical = canonical_purl(purl) if purl else None
+        if canonical is None:
+            return (name, path)
+        if canonical not in self.names:
+            self.names[canonical] = name
+        return (canonical, path)
+
+    def get_name(self, key_name):
+        """Return the package name for the first element of a key."""
+        return self.names.get(key_name, key_name)
+
+    def get_purl(self, key_name):
+        """Return the canonical purl for the first element of a key or None."""
+        return key_name if key_name in self.names else None
+
+    def retain(self, key_names):
+        """Remove the purls which are no longer used from the index.
+
+        Args:
+            key_names: Iterable of the first element of each key still used
+        """
+        self.names = {
+            key_name: self.names[key_name]
+            for key_name in key_names
+            if key_name in self.names
+        }
+
+
+def find_purl(external_references):
+    """Return the purl from a list of lib4sbom external references or None."""
+    for reference in external_references or []:
+        if len(reference) > 2 and reference[1] == "purl":
+            return reference[2]
+    return None
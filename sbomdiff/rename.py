@@ -0,0 +1,132 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Detection of packages which have been renamed.
+
+A renamed package is reported as a removed package and an added package.
+Removed packages are matched against added packages at the same location
+by comparing normalised names, which ignore case, separators and any
+scope or namespace (e.g. "@types/Node_Fetch" and "node-fetch" are the
+same). Names which are not the same are compared using the trigrams of
+the normalised names.
+
+Added packages are indexed by normalised name and by trigram so each
+removed package is only compared with the added packages which share a
+trigram with it, rather than with every added package.
+"""
+
+import re
+
+SIMILARITY_THRESHOLD = 0.7
+
+# Trigrams shared by more added packages than this are not used to find
+# candidates, so common trigrams do not lead to comparing every package
+MAX_POSTINGS = 256
+
+_SEPARATORS = re.compile(r"[-_.\s]+")
+_NAMESPACE = re.compile(r".*[/:]")
+
+
+def normalise_name(name):
+    """Return a package name without case, separator or namespace differences."""
+    name = _NAMESPACE.sub("", name.lower())
+    return _SEPARATORS.sub("-", name).strip("-")
+
+
+def trigrams(name):
+    """Return the set of trigrams of a normalised name."""
+    padded = f"  {name} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def similarity(trigrams1, trigrams2):
+    """Return the Dice coefficient of two sets of trigrams."""
+    if not trigrams1 or not trigrams2:
+        return 0.0
+    return 2 * len(trigrams1 & trigrams2) / (len(trigrams1) + len(trigrams2))
+
+
+class RenameIndex:
+    """Index of added packages used to find the package a name became.
+
+    Args:
+        threshold: Minimum similarity of a renamed package
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.names = {}
+        self.postings = {}
+        self.trigrams = []
+
+    def add(self, path, name):
+        """Add the name of an added package at a location.
+
+        Returns:
+            Position of the package within the index
+        """
+        position = len(self.trigrams)
+        normalised = normalise_name(name)
+        name_trigrams = trigrams(normalised)
+        self.trigrams.append(name_trigrams)
+        self.names.setdefault((path, normalised), []).append(position)
+        for trigram in name_trigrams:
+            self.postings.setdefault((path, trigram), []).append(position)
+        return position
+
+    def candidates(self, path, name):
+        """Return (similarity, position) of added packages similar to a name."""
+        normalised = normalise_name(name)
+        same_name = self.names.get((path, normalised))
+        if same_name:
+            return [(1.0, position) for position in same_name]
+        name_trigrams = trigrams(normalised)
+        shared = {}
+        for trigram in name_trigrams:
+            positions = self.postings.get((path, trigram), ())
+            if len(positions) > MAX_POSTINGS:
+                continue
+            for position in positions:
+                shared[position] = shared.get(position, 0) + 1
+        candidates = []
+        for position, count in shared.items():
+            # Dice coefficient from the number of shared trigrams
+            score = 2 * count / (len(name_trigrams) + len(self.trigrams[position]))
+            if score >= self.threshold:
+                candidates.append((score, position))
+        return candidates
+
+
+def match_renames(removed, added, threshold=SIMILARITY_THRESHOLD):
+    """Match removed packages with the added packages they were renamed to.
+
+    Each package is matched at most once; the most similar pairs are
+    matched first.
+
+    Args:
+        removed: List of (path, name) of removed packages
+        added: List of (path, name) of added packages
+        threshold: Minimum similarity of a renamed package
+
+    Returns:
+        List of (removed position, added position, similarity)
+    """
+    index = RenameIndex(threshold)
+    for path, name in added:
+        index.add(path, name)
+    pairs = []
+    for removed_position, (path, name) in enumerate(removed):
+        for score, added_position in index.candidates(path, name):
+            if added[added_position][1] != name:
+                pairs.append((-score, removed_position, added_position))
+    pairs.sort()
+    matched_removed = set()
+    matched_added = set()
+    matches = []
+    for score, removed_position, added_position in pairs:
+        if removed_position in matched_removed or added_position in matched_added:
+            continue
+        matched_removed.add(removed_position)
+        matched_added.add(added_position)
+        matches.append((removed_position, added_position, -score))
+    return matches
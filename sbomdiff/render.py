@@ -0,0 +1,87 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Buffered rendering of differences as text.
+
+Lines are collected and written in large chunks rather than making a
+separate write for every line. The output is identical to that produced
+by writing each line using lib4sbom SBOMOutput.
+"""
+
+import sys
+
+from sbomdiff.diff import format_dependencies, format_record
+
+BUFFER_SIZE = 64 * 1024
+
+
+class TextRenderer:
+    """Writes lines of text output to a file or the console.
+
+    Args:
+        filename: Name of output file; output is written to the console if
+            no filename is given or the file cannot be created
+        buffer_size: Number of characters collected before they are written
+    """
+
+    def __init__(self, filename="", buffer_size=BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.lines = []
+        self.size = 0
+        self.file_handle = None
+        if filename != "":
+            try:
+                self.file_handle = open(filename, "w", encoding="utf-8")
+            except FileNotFoundError:
+                # Unable to create file, so send output to console
+                self.file_handle = None
+        self.stream = self.file_handle if self.file_handle is not None else sys.stdout
+
+    def write_line(self, line):
+        self.lines.append(line)
+        self.size += len(line) + 1
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def write_lines(self, lines):
+        for line in lines:
+            self.write_line(line)
+
+    def flush(self):
+        """Write any buffered lines."""
+        if self.lines:
+            self.lines.append("")
+            self.stream.write("\n".join(self.lines))
+            self.lines = []
+            self.size = 0
+
+    def close(self):
+        """Write any buffered lines and close the output file."""
+        self.flush()
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
+        else:
+            self.stream.flush()
+
+    def render(self, sbom_diff, records, path_trie=None, path_depth=None):
+        """Write the difference records and summary of a comparison.
+
+        Args:
+            sbom_diff: SBOMDiff which generated the records
+            records: Iterable of difference records
+            path_trie: PathTrie of the records whose groups are reported
+            path_depth: Number of path components of each group
+        """
+        for record in records:
+            self.write_lines(format_record(record))
+        if sbom_diff.dependency_diff is not None:
+            self.write_lines(format_dependencies(sbom_diff.dependency_diff))
+        self.render_summary(sbom_diff, path_trie, path_depth)
+
+    def render_summary(self, sbom_diff, path_trie=None, path_depth=None):
+        """Write only the summary of a comparison."""
+        if path_trie is not None:
+            self.write_lines(path_trie.summary_lines(path_depth))
+        self.write_lines(sbom_diff.summary_lines())
+        self.close()
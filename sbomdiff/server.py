@@ -0,0 +1,287 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Long running diff service.
+
+Keeps recently parsed package tables in memory so that repeated
+comparisons avoid the start-up and parsing costs of the command line tool.
+"""
+
+import argparse
+import hashlib
+import ipaddress
+import json
+import os
+import socketserver
+import sys
+import textwrap
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.multimap import Instances, get_instances
+
+
+def estimate_size(packages):
+    """Estimate the memory used by a package table in bytes."""
+    size = sys.getsizeof(packages)
+    for package_key, package_value in packages.items():
+        size += sys.getsizeof(package_key)
+        size += sum(sys.getsizeof(item) for item in package_key)
+        if isinstance(package_value, Instances):
+            size += sys.getsizeof(package_value)
+        for instance in get_instances(package_value):
+            size += sys.getsizeof(instance)
+            for item in instance:
+                size += sys.getsizeof(item)
+                if isinstance(item, list):
+                    size += sum(sys.getsizeof(element) for element in item)
+    return size
+
+
+class PackageCache:
+    """Memory bounded LRU cache of parsed package tables.
+
+    Entries are keyed by the SHA256 digest of the SBOM content so that
+    the same SBOM is only parsed once regardless of its filename.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Never cache an entry which would evict everything else
+                return
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "max_size": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class DiffService:
+    """Processes diff requests using a shared cache of package tables.
+
+    A request is a dictionary which identifies each SBOM either by filename
+    (file1, file2) or by its content (content1, content2). When content is
+    supplied, name1 and name2 may be used to provide the name which is
+    reported for the SBOM; the format is identified from the content, which
+    is parsed in memory. The options sbom,
+    exclude_license and checksum have the same meaning as the command line
+    options.
+    """
+
+    def __init__(self, cache_size=256 * 1024 * 1024):
+        self.cache = PackageCache(cache_size)
+
+    def load(self, request, index):
+        """Return the package table and name of one of the requested SBOMs."""
+        sbom_type = request.get("sbom", "auto")
+        filename = request.get(f"file{index}")
+        if filename is not None:
+            with open(filename, "rb") as f:
+                content = f.read()
+            name = filename
+        elif f"content{index}" in request:
+            content = request[f"content{index}"].encode("utf-8")
+            name = request.get(f"name{index}", f"sbom{index}.json")
+        else:
+            raise ValueError(f"Must specify file{index} or content{index}")
+        key = (hashlib.sha256(content).hexdigest(), sbom_type)
+        packages = self.cache.get(key)
+        if packages is None:
+            # Files are parsed from the content which has already been read
+            packages, _ = parse_sbom(content, sbom_type)
+            self.cache.put(key, packages, estimate_size(packages))
+        return packages, name
+
+    def diff(self, request):
+        """Return the document which is reported by --format json."""
+        packages1, name1 = self.load(request, 1)
+        packages2, name2 = self.load(request, 2)
+        sbom_diff = SBOMDiff(
+            exclude_license=request.get("exclude_license", False),
+            checksum=request.get("checksum", ""),
+        )
+        differences = list(sbom_diff.compare(packages1, packages2))
+        return sbom_diff.generate_document(name1, name2, differences)
+
+
+class DiffRequestHandler(BaseHTTPRequestHandler):
+    """HTTP interface to the diff service.
+
+    POST /diff with a JSON request returns the JSON difference document.
+    GET /stats returns the cache statistics.
+    """
+
+    def _send_json(self, status, data):
+        body = (json.dumps(data, indent=2) + "\n").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.service.cache.get_stats())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/diff":
+            self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"Invalid Content-Length {length}")
+            request = json.loads(self.rfile.read(length))
+            document = self.server.service.diff(request)
+        except (ValueError, OSError) as error:
+            self._send_json(400, {"error": str(error)})
+            return
+        except Exception as error:
+            self._send_json(500, {"error": str(error)})
+            return
+        self._send_json(200, document)
+
+    def address_string(self):
+        # Unix domain sockets do not have a client address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
+
+    def log_message(self, format, *args):
+        if self.server.debug:
+            super().log_message(format, *args)
+
+
+class DiffHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, debug=False):
+        self.service = service
+        self.debug = debug
+        super().__init__(address, DiffRequestHandler)
+
+
+class DiffUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, debug=False):
+        self.service = service
+        self.debug = debug
+        super().__init__(address, DiffRequestHandler)
+
+
+def is_loopback(host):
+    """Check if a host name or address only accepts local connections."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def create_server(service, host="127.0.0.1", port=8080, socket_path=None, debug=False):
+    """Create a server listening on a Unix socket or a localhost port."""
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return DiffUnixServer(socket_path, service, debug)
+    return DiffHTTPServer((host, port), service, debug)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="sbomdiff serve",
+        description=textwrap.dedent("""
+            Runs SBOMDiff as a service which accepts diff requests over HTTP
+            and keeps recently parsed SBOMs in memory.
+            """),
+    )
+    parser.add_argument(
+        "--host",
+        action="store",
+        default="127.0.0.1",
+        help="loopback address to listen on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        action="store",
+        type=int,
+        default=8080,
+        help="port to listen on (default: 8080)",
+    )
+    parser.add_argument(
+        "--socket",
+        action="store",
+        default=None,
+        help="listen on Unix socket instead of a TCP port",
+    )
+    parser.add_argument(
+        "--cache-size",
+        action="store",
+        type=int,
+        default=256,
+        help="maximum size of the cache of parsed SBOMs in MB (default: 256)",
+    )
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_true",
+        default=False,
+        help="show debug information",
+    )
+    args = parser.parse_args(argv)
+
+    if args.socket is None and not is_loopback(args.host):
+        # Requests may read any file which the service can access
+        print(f"Host {args.host} is not a loopback address")
+        return -1
+
+    service = DiffService(args.cache_size * 1024 * 1024)
+    server = create_server(service, args.host, args.port, args.socket, args.debug)
+    if args.debug:
+        print("Listening on", args.socket or f"{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket is not None and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
@@ -0,0 +1,102 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Sources of SBOM content.
+
+A SBOM may be provided as a filename, as "-" for the standard input, as a
+buffer (bytes, bytearray or memoryview) or as a file object. Buffers and
+streams are parsed in place, so a SBOM which is received over a network
+never has to be written to a temporary file.
+"""
+
+import contextlib
+import io
+import sys
+
+STDIN = "-"
+
+ENCODING = "utf-8-sig"
+
+
+def is_filename(source):
+    """Return True if the source is the name of a file."""
+    return isinstance(source, str) and source != STDIN
+
+
+def resolve(source):
+    """Return the filename, buffer or file object which holds the content."""
+    if source == STDIN:
+        return sys.stdin.buffer
+    return source
+
+
+def source_name(source):
+    """Return the name used to report a source."""
+    if isinstance(source, str):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return "<bytes>"
+    return str(getattr(source, "name", "<stream>"))
+
+
+@contextlib.contextmanager
+def open_binary(source):
+    """Open the content of a source as a binary stream.
+
+    A file object which is provided is not closed.
+    """
+    source = resolve(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    elif hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "rb") as f:
+            yield f
+
+
+@contextlib.contextmanager
+def open_text(source):
+    """Open the content of a source as a text stream.
+
+    A file object which is provided is not closed.
+    """
+    source = resolve(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.TextIOWrapper(io.BytesIO(source), encoding=ENCODING)
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    elif hasattr(source, "read"):
+        stream = io.TextIOWrapper(source, encoding=ENCODING)
+        try:
+            yield stream
+        finally:
+            # Closing the wrapper would close the binary stream
+            stream.detach()
+    else:
+        with open(source, encoding=ENCODING) as f:
+            yield f
+
+
+def read_text(source):
+    """Return the content of a source as a string."""
+    source = resolve(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return str(source, ENCODING)
+    with open_text(source) as f:
+        return f.read()
+
+
+def rereadable(source):
+    """Return a source whose content can be read more than once.
+
+    The content of a file object (e.g. the standard input) is read into a
+    buffer; filenames and buffers are returned unchanged.
+    """
+    source = resolve(source)
+    if is_filename(source) or isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    content = source.read()
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return content
@@ -7,71 +7,192 @@ import re
 import defusedxml.ElementTree as ET
 import yaml
 
+from sbomdiff.detect import detect_format
+from sbomdiff.fields import ALL_FIELDS, LICENSE
+from sbomdiff.graph import DEPENDENCY_TYPES
+from sbomdiff.jsonld import iter_graph
+from sbomdiff.multimap import add_instance
+from sbomdiff.source import open_binary, open_text, resolve
+
+# SPDX 3.0 element types
+SPDX3_PACKAGE_TYPES = ("software_Package", "Package")
+# Member holding the license of each type of license element. Listed
+# licenses are not included as their name (e.g. "Apache License 2.0") is
+# not the license identifier; the identifier is taken from their URL.
+SPDX3_LICENSE_TYPES = {
+    "simplelicensing_LicenseExpression": "simplelicensing_licenseExpression",
+    "expandedlicensing_CustomLicense": "name",
+}
+SPDX3_LICENSE_RELATIONSHIPS = ("hasConcludedLicense", "hasDeclaredLicense")
+SPDX3_INDIVIDUAL_LICENSES = {
+    "NoAssertionLicense": "NOASSERTION",
+    "NoneLicense": "NONE",
+}
+
 
 class SPDXParser:
-    def __init__(self):
-        pass
-
-    def parse(self, sbom_file):
-        """parses SPDX BOM file extracting package name, version and license"""
-        if sbom_file.endswith(".spdx"):
-            return self.parse_spdx_tag(sbom_file)
-        elif sbom_file.endswith((".spdx.json", ".json")):
-            return self.parse_spdx_json(sbom_file)
-        elif sbom_file.endswith(".spdx.rdf"):
-            return self.parse_spdx_rdf(sbom_file)
-        elif sbom_file.endswith(".spdx.xml"):
-            return self.parse_spdx_xml(sbom_file)
-        elif sbom_file.endswith((".spdx.yaml", "spdx.yml")):
-            return self.parse_spdx_yaml(sbom_file)
-        else:
+    def __init__(self, purl_index=None, package_filter=None, fields=ALL_FIELDS):
+        # If a PurlIndex is provided, packages are matched using purls
+        self.purl_index = purl_index
+        # If a PackageFilter is provided, only selected packages are stored
+        self.package_filter = package_filter or None
+        # Licenses are only extracted if they are in the projected fields
+        self.licenses = LICENSE in fields
+        self.dependencies = []
+
+    def get_dependencies(self):
+        """Return (source, target) package names of the last SBOM parsed."""
+        return self.dependencies
+
+    def _add_dependency(self, names, source_id, relationship_type, target_id):
+        reverse = DEPENDENCY_TYPES.get(relationship_type)
+        source = names.get(source_id)
+        target = names.get(target_id)
+        if reverse is None or source is None or target is None:
+            return
+        self.dependencies.append((target, source) if reverse else (source, target))
+
+    def _parse_relationships(self, data):
+        # Relationships refer to packages using their SPDXID
+        names = {d["SPDXID"]: d.get("name") for d in data["packages"] if "SPDXID" in d}
+        for relationship in data.get("relationships", []):
+            self._add_dependency(
+                names,
+                relationship.get("spdxElementId"),
+                relationship.get("relationshipType"),
+                relationship.get("relatedSpdxElement"),
+            )
+
+    def parse(self, sbom_file, sbom_format=None):
+        """parses SPDX BOM file extracting package name, version and license
+
+        Args:
+            sbom_file: Filename of the SBOM, "-" for the standard input, or
+                the content of the SBOM as a buffer or binary file object
+            sbom_format: Format of the SBOM (tag, json, jsonld, rdf, xml or
+                yaml); identified from the filename or the content if not
+                specified
+        """
+        if sbom_format is None:
+            sbom_format = self._get_format(sbom_file)
+        parse_format = {
+            "tag": self.parse_spdx_tag,
+            "json": self.parse_spdx_json,
+            "jsonld": self.parse_spdx_jsonld,
+            "rdf": self.parse_spdx_rdf,
+            "xml": self.parse_spdx_xml,
+            "yaml": self.parse_spdx_yaml,
+        }
+        if sbom_format not in parse_format:
             return {}
+        return parse_format[sbom_format](sbom_file)
 
-    def _get_package_key(self, name):
+    def _get_format(self, sbom_file):
+        # Format is identified from the filename extension or else the content
+        if isinstance(sbom_file, str):
+            if sbom_file.endswith(".spdx"):
+                return "tag"
+            elif sbom_file.endswith(".jsonld"):
+                return "jsonld"
+            elif sbom_file.endswith((".spdx.json", ".json")):
+                if detect_format(sbom_file)[1] == "jsonld":
+                    return "jsonld"
+                return "json"
+            elif sbom_file.endswith(".spdx.rdf"):
+                return "rdf"
+            elif sbom_file.endswith(".spdx.xml"):
+                return "xml"
+            elif sbom_file.endswith((".spdx.yaml", "spdx.yml")):
+                return "yaml"
+        sbom_type, sbom_format = detect_format(resolve(sbom_file))
+        if sbom_type != "spdx":
+            return None
+        return sbom_format
+
+    def _get_package_key(self, name, purl=None):
         """Create a unique key for a package.
 
         SPDX format doesn't typically include file path info, so we use
-        (name, "") for consistency with CycloneDX parser format.
+        (name, "") for consistency with CycloneDX parser format. When
+        matching using purls, the canonical purl is used instead of the name.
 
         Args:
             name: Package name
+            purl: Package URL of the package
 
         Returns:
             Tuple of (name, "") for use as dictionary key
         """
+        if self.purl_index is not None:
+            return self.purl_index.get_key(name, "", purl)
         return (name, "")
 
+    def _accept(self, name, purl=None, component_type=None):
+        # SPDX packages have no path
+        if self.package_filter is None:
+            return True
+        return self.package_filter.matches(name, "", purl, component_type)
+
+    def _get_purl(self, package):
+        # Package URL is held as an external reference
+        for reference in package.get("externalRefs", []):
+            if reference.get("referenceType") == "purl":
+                return reference.get("referenceLocator")
+        return None
+
     def parse_spdx_tag(self, sbom_file):
         """parses SPDX tag value file extracting package name, version and license
 
         Returns a dictionary where keys are (name, path) tuples and values are
         [version, license] lists. SPDX doesn't have path info, so path is empty.
         """
-        with open(sbom_file) as f:
-            lines = f.readlines()
         packages = {}
+        self.dependencies = []
+        names = {}
+        relationships = []
+        with open_text(sbom_file) as f:
+            for package_key, record in self._iter_spdx_tag(f, names, relationships):
+                add_instance(packages, package_key, record)
+        for relationship in relationships:
+            if len(relationship) == 3:
+                self._add_dependency(names, *relationship)
+
+        return packages
+
+    def _iter_spdx_tag(self, lines, names, relationships):
+        # Generate (package key, [version, license]) as each package is read,
+        # recording package identifiers and relationships
         package = ""
+        package_id = False
+        stored = False
         version = None
         license = None
         for line in lines:
             line_elements = line.split(":")
             if line_elements[0] == "PackageName":
                 package = line_elements[1].strip().rstrip("\n")
+                package_id = True
+                stored = False
                 version = None
                 license = None
+            if line_elements[0] == "SPDXID" and package_id:
+                # Identifier of the package
+                names[line_elements[1].strip()] = package
+                package_id = False
+            if line_elements[0] == "Relationship":
+                relationships.append(line[13:].split())
             if line_elements[0] == "PackageVersion":
                 version = line[16:].strip().rstrip("\n")
             if line_elements[0] == "PackageLicenseConcluded":
-                license = line_elements[1].strip().rstrip("\n")
-            package_key = self._get_package_key(package)
-            if (
-                package_key not in packages
-                and version is not None
-                and license is not None
-            ):
-                packages[package_key] = [version, license]
-
-        return packages
+                # License which is not extracted is only recorded as seen
+                license = line_elements[1].strip().rstrip("\n") if self.licenses else ""
+            if not stored and version is not None and license is not None:
+                if self._accept(package):
+                    yield self._get_package_key(package), [
+                        version,
+                        license if self.licenses else None,
+                    ]
+                stored = True
 
     def parse_spdx_json(self, sbom_file):
         """parses SPDX JSON BOM file extracting package name, version and license
@@ -79,21 +200,114 @@ class SPDXParser:
         Returns a dictionary where keys are (name, path) tuples and values are
         [version, license] lists. SPDX doesn't have path info, so path is empty.
         """
-        with open(sbom_file) as f:
+        with open_text(sbom_file) as f:
             data = json.load(f)
         packages = {}
+        self.dependencies = []
         # Check that valid SPDX JSON file is being processed
         if "packages" in data:
             for d in data["packages"]:
-                package = d["name"]
-                package_key = self._get_package_key(package)
-                try:
-                    version = d.get("versionInfo", "UNKNOWN")
-                    license = d.get("licenseConcluded", "NOT FOUND")
-                    if package_key not in packages:
-                        packages[package_key] = [version, license]
-                except KeyError:
-                    pass
+                package = self._get_package_json(d)
+                if package is not None:
+                    add_instance(packages, *package)
+            self._parse_relationships(data)
+
+        return packages
+
+    def _get_package_json(self, d):
+        # Returns (package key, [version, license]) or None if not selected
+        package = d["name"]
+        purl = self._get_purl(d)
+        if not self._accept(package, purl, d.get("primaryPackagePurpose")):
+            return None
+        version = d.get("versionInfo", "UNKNOWN")
+        license = None
+        if self.licenses:
+            license = d.get("licenseConcluded", "NOT FOUND")
+        return self._get_package_key(package, purl), [version, license]
+
+    def parse_spdx_jsonld(self, sbom_file):
+        """parses SPDX 3.0 JSON-LD file extracting package name, version and license
+
+        The elements of the @graph are read one at a time. Packages, license
+        elements and relationships are indexed by their identifier as they
+        are read and the licenses of each package are resolved once the
+        graph has been read.
+
+        Returns a dictionary where keys are (name, path) tuples and values are
+        [version, license] lists. SPDX doesn't have path info, so path is empty.
+        """
+        package_elements = []
+        names = {}
+        licenses = {}
+        concluded = {}
+        declared = {}
+        relationships = []
+        with open_text(sbom_file) as f:
+            for element in iter_graph(f):
+                if not isinstance(element, dict):
+                    continue
+                element_type = element.get("type", element.get("@type"))
+                element_id = element.get("spdxId", element.get("@id"))
+                if element_type in SPDX3_PACKAGE_TYPES:
+                    if "name" not in element:
+                        continue
+                    names[element_id] = element["name"]
+                    purl = element.get("software_packageUrl")
+                    if not self._accept(
+                        element["name"], purl, element.get("software_primaryPurpose")
+                    ):
+                        continue
+                    package_elements.append(
+                        (
+                            element_id,
+                            element["name"],
+                            element.get("software_packageVersion", "UNKNOWN"),
+                            purl,
+                        )
+                    )
+                elif element_type in SPDX3_LICENSE_TYPES and self.licenses:
+                    licenses[element_id] = element.get(
+                        SPDX3_LICENSE_TYPES[element_type]
+                    )
+                elif element_type == "Relationship":
+                    relationship_type = element.get("relationshipType")
+                    targets = element.get("to", [])
+                    if relationship_type in SPDX3_LICENSE_RELATIONSHIPS:
+                        if self.licenses and targets:
+                            license_relationships = (
+                                concluded
+                                if relationship_type == "hasConcludedLicense"
+                                else declared
+                            )
+                            license_relationships[element.get("from")] = targets[0]
+                    else:
+                        relationships.append(
+                            (element.get("from"), relationship_type, targets)
+                        )
+        packages = {}
+        self.dependencies = []
+        for element_id, name, version, purl in package_elements:
+            license_id = concluded.get(element_id, declared.get(element_id))
+            license = licenses.get(license_id)
+            if not self.licenses:
+                license = None
+            elif license_id is None:
+                license = "NOT FOUND"
+            elif license is None:
+                # Listed licenses may be referenced without a license element
+                # using their URL (e.g. https://spdx.org/licenses/MIT)
+                license = license_id.rsplit("/", 1)[-1]
+                license = SPDX3_INDIVIDUAL_LICENSES.get(license, license)
+            package_key = self._get_package_key(name, purl)
+            add_instance(packages, package_key, [version, license])
+        for source_id, relationship_type, targets in relationships:
+            # Relationship types are camel case (e.g. dependsOn)
+            relationship_type = re.sub(
+                r"([a-z])([A-Z])", r"\1_\2", relationship_type or ""
+            ).upper()
+            for target_id in targets:
+                self._add_dependency(names, source_id, relationship_type, target_id)
 
         return packages
 
@@ -103,10 +317,11 @@ class SPDXParser:
         Returns a dictionary where keys are (name, path) tuples and values are
         [version, license] lists. SPDX doesn't have path info, so path is empty.
         """
-        with open(sbom_file) as f:
+        with open_text(sbom_file) as f:
             lines = f.readlines()
         packages = {}
         package = ""
+        stored = False
         version = None
         license = None
         for line in lines:
@@ -119,6 +334,7 @@ class SPDXParser:
                     if not package_match:
                         raise KeyError(f"Could not find package in {stripped_line}")
                     package = package_match.group(1)
+                    stored = False
                     version = "UNKNOWN"
                 elif line.strip().startswith("<spdx:versionInfo>"):
                     stripped_line = line.strip().rstrip("\n")
@@ -129,62 +345,77 @@ class SPDXParser:
                         raise KeyError(f"Could not find version in {stripped_line}")
                     version = version_match.group(1)
                     # To handle case where license appears before version
-                    package_key = self._get_package_key(package)
-                    if package_key not in packages and license is not None:
-                        packages[package_key] = [version, license]
+                    if not stored and license is not None:
+                        if self._accept(package):
+                            package_key = self._get_package_key(package)
+                            add_instance(
+                                packages,
+                                package_key,
+                                [version, license if self.licenses else None],
+                            )
+                        stored = True
                         version = "UNKNOWN"
                 elif line.strip().startswith("<spdx:licenseConcluded"):
-                    stripped_line = line.strip().rstrip("\n")
-                    # Assume license tag is on a single line
-                    license_match = re.search(
-                        "<spdx:licenseConcluded rdf:resource=(.+?)/>", stripped_line
-                    )
-                    if license_match is None:
-                        license = "NOT FOUND"
+                    if self.licenses:
+                        license = self._get_license_rdf(line)
                     else:
-                        license = license_match.group(1)
-                        if license.startswith('"http://spdx.org/licenses/'):
-                            # SPDX license identifier. Extract last part of url
-                            license = license.split("/")[-1]
-                            license = license[:-1]  # Remove trialing "
-                        if "#" in license:
-                            # Extract last part of url after #
-                            # e.g. http://spdx.org/rdf/terms#noassertion
-                            license = license.split("#")[-1]
-                            # Remove trialing " and capitalise
-                            license = license[:-1].upper()
+                        # License has been seen but is not extracted
+                        license = ""
                     # To handle case where license appears before version
-                    package_key = self._get_package_key(package)
-                    if package_key not in packages and version is not None:
-                        packages[package_key] = [version, license]
+                    if not stored and version is not None:
+                        if self._accept(package):
+                            package_key = self._get_package_key(package)
+                            add_instance(
+                                packages,
+                                package_key,
+                                [version, license if self.licenses else None],
+                            )
+                        stored = True
                         license = None
             except KeyError:
                 pass
 
         return packages
 
+    def _get_license_rdf(self, line):
+        stripped_line = line.strip().rstrip("\n")
+        # Assume license tag is on a single line
+        license_match = re.search(
+            "<spdx:licenseConcluded rdf:resource=(.+?)/>", stripped_line
+        )
+        if license_match is None:
+            return "NOT FOUND"
+        license = license_match.group(1)
+        if license.startswith('"http://spdx.org/licenses/'):
+            # SPDX license identifier. Extract last part of url
+            license = license.split("/")[-1]
+            license = license[:-1]  # Remove trialing "
+        if "#" in license:
+            # Extract last part of url after #
+            # e.g. http://spdx.org/rdf/terms#noassertion
+            license = license.split("#")[-1]
+            # Remove trialing " and capitalise
+            license = license[:-1].upper()
+        return license
+
     def parse_spdx_yaml(self, sbom_file):
         """parses SPDX YAML BOM file extracting package name, version and license
 
         Returns a dictionary where keys are (name, path) tuples and values are
         [version, license] lists. SPDX doesn't have path info, so path is empty.
         """
-        with open(sbom_file) as f:
+        with open_text(sbom_file) as f:
             data = yaml.safe_load(f)
 
         packages = {}
+        self.dependencies = []
         # Check that valid SPDX YAML file is being processed
         if "packages" in data:
             for d in data["packages"]:
-                package = d["name"]
-                package_key = self._get_package_key(package)
-                try:
-                    version = d.get("versionInfo", "UNKNOWN")
-                    license = d.get("licenseConcluded", "NOT FOUND")
-                    if package_key not in packages:
-                        packages[package_key] = [version, license]
-                except KeyError:
-                    pass
+                package = self._get_package_json(d)
+                if package is not None:
+                    add_instance(packages, *package)
+            self._parse_relationships(data)
 
         return packages
 
@@ -196,7 +427,8 @@ class SPDXParser:
         """
         # XML is experimental in SPDX 2.3
         packages = {}
-        tree = ET.parse(sbom_file)
+        with open_binary(sbom_file) as f:
+            tree = ET.parse(f)
         # Find root element
         root = tree.getroot()
         # Extract schema
@@ -210,6 +442,8 @@ class SPDXParser:
                 package = package_match.text
                 if package is None:
                     raise KeyError(f"Could not find package in {component}")
+                if not self._accept(package):
+                    continue
                 package_key = self._get_package_key(package)
                 version_match = component.find(schema + "versionInfo")
                 if version_match is None:
@@ -218,15 +452,16 @@ class SPDXParser:
                     version = version_match.text
                     if version is None:
                         version = "UNKNOWN"
-                component_license = component.find(schema + "licenseConcluded")
-                if component_license is None:
-                    license = "NOT FOUND"
-                else:
-                    license = component_license.text
+                license = None
+                if self.licenses:
+                    component_license = component.find(schema + "licenseConcluded")
+                    if component_license is None:
+                        license = "NOT FOUND"
+                    else:
+                        license = component_license.text
 
                 if version is not None:
-                    if package_key not in packages:
-                        packages[package_key] = [version, license]
+                    add_instance(packages, package_key, [version, license])
 
             except KeyError:
                 pass
@@ -0,0 +1,74 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of strings shared by the package tables of several SBOMs.
+
+Package names, versions, licenses and paths are repeated many times
+within a SBOM and between the SBOMs being compared. Replacing each string
+with the instance held in the pool means equal strings are the same
+object, so only one copy is kept and comparisons of equal values are
+resolved by identity.
+"""
+
+import sys
+
+from sbomdiff.multimap import get_instances
+
+
+class StringPool:
+    """Maps each distinct string to a single shared instance."""
+
+    def __init__(self):
+        self.strings = {}
+        self.saved = 0
+
+    def __len__(self):
+        return len(self.strings)
+
+    def intern(self, value):
+        """Return the pooled instance of a string.
+
+        Values which are not strings are returned unchanged.
+        """
+        if type(value) is not str:
+            return value
+        pooled = self.strings.setdefault(value, value)
+        if pooled is not value:
+            # Duplicate copy can be released
+            self.saved += sys.getsizeof(value)
+        return pooled
+
+    def retain(self, values):
+        """Remove the strings which are no longer used from the pool.
+
+        Args:
+            values: Iterable of the strings which are still used
+        """
+        strings = {}
+        for value in values:
+            pooled = self.strings.get(value)
+            if pooled is not None:
+                strings[pooled] = pooled
+        self.strings = strings
+
+    def intern_checksums(self, checksums):
+        """Return a list of [algorithm, value] checksums using pooled strings."""
+        if checksums is None:
+            return None
+        return [[self.intern(item) for item in checksum] for checksum in checksums]
+
+
+def table_strings(packages):
+    """Generate the strings held in the keys and instances of a package table."""
+    for package_key, package in packages.items():
+        yield from package_key
+        for instance in get_instances(package):
+            if instance is None:
+                continue
+            for item in instance:
+                if isinstance(item, list):
+                    # Checksums are held as [algorithm, value] lists
+                    for checksum in item:
+                        yield from checksum
+                else:
+                    yield item
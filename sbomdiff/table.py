@@ -0,0 +1,435 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Flat encoding of a package table which is read without decoding it.
+
+A package table (see multimap.py) is encoded into a single buffer of
+fixed width arrays and a heap of UTF-8 strings, so it can be placed in
+shared memory or a file (a .sbomidx index) and read by another process
+without copying or unpickling it. Only the packages which are accessed
+are decoded.
+
+Layout (native byte order, all offsets in bytes from the start):
+
+    header     magic, byte order mark, number of keys, number of
+               instances and size of the string heap
+    hashes     uint64 hash of each key, sorted
+    order      uint32 number of the key with each sorted hash
+    keys       uint32 (offset, length, first instance, instance count)
+               of each key in the order of the table
+    instances  uint32 (offset, length) of the version, license and
+               checksums of each instance
+    heap       UTF-8 strings, each distinct string held once
+
+A key is held as the string "name\\0path". Checksums are held as a single
+string of "algorithm\\x1fvalue" pairs separated by "\\x1e". A value of None
+has the length NONE. Keys are found by a binary search of the sorted
+hashes, which needs no decoding. As the hash does not depend on the
+table, the keys of two tables are matched by a merge join of their hashes.
+"""
+
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+from sbomdiff.multimap import Instances, get_instances
+from sbomdiff.source import is_filename
+
+MAGIC = b"SBOMTBL1"
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct("=8sIIII")
+HEADER_SIZE = 32
+
+# Length of a value which is None
+NONE = 0xFFFFFFFF
+
+KEY_FIELDS = 4
+INSTANCE_FIELDS = 6
+
+_KEY_SEPARATOR = "\0"
+_CHECKSUM_SEPARATOR = "\x1e"
+_ALGORITHM_SEPARATOR = "\x1f"
+
+
+def _encode(value):
+    return value.encode("utf-8", "surrogatepass")
+
+
+def key_hash(key_bytes):
+    """Return the 64 bit hash of an encoded key.
+
+    The hash is the same in every process, unlike hash().
+    """
+    return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little")
+
+
+def _key_bytes(package_key):
+    name, path = package_key
+    return _encode(f"{name}{_KEY_SEPARATOR}{path}")
+
+
+def _encode_checksums(checksums):
+    if checksums is None:
+        return None
+    return _CHECKSUM_SEPARATOR.join(
+        f"{algorithm}{_ALGORITHM_SEPARATOR}{value}" for algorithm, value in checksums
+    )
+
+
+def _decode_checksums(value):
+    if value is None:
+        return None
+    if value == "":
+        return []
+    return [
+        checksum.split(_ALGORITHM_SEPARATOR)
+        for checksum in value.split(_CHECKSUM_SEPARATOR)
+    ]
+
+
+def _section_offsets(key_count, instance_count):
+    # Offsets of the hashes, order, keys, instances and heap sections
+    hashes = HEADER_SIZE
+    order = hashes + 8 * key_count
+    keys = order + 4 * key_count
+    instances = keys + 4 * KEY_FIELDS * key_count
+    heap = instances + 4 * INSTANCE_FIELDS * instance_count
+    return hashes, order, keys, instances, heap
+
+
+def encode_table(packages):
+    """Encode a package table.
+
+    Args:
+        packages: Package table mapping (name, path) keys to [version,
+            license, checksums] instances (or Instances of them)
+
+    Returns:
+        bytearray holding the encoded table
+    """
+    heap = bytearray()
+    # Offset and length of each distinct string in the heap
+    offsets = {}
+    lengths = {}
+    keys = array("I")
+    instances = array("I")
+    # Hash and number of each key, ordered by hash then number
+    hashes = []
+    for number, (package_key, package) in enumerate(packages.items()):
+        key_bytes = _key_bytes(package_key)
+        hashes.append(key_hash(key_bytes) << 32 | number)
+        package_instances = get_instances(package)
+        keys.extend(
+            (
+                len(heap),
+                len(key_bytes),
+                len(instances) // INSTANCE_FIELDS,
+                len(package_instances),
+            )
+        )
+        heap += key_bytes
+        for version, license, checksums in package_instances:
+            for value in (version, license, _encode_checksums(checksums)):
+                if value is None:
+                    instances.extend((0, NONE))
+                    continue
+                offset = offsets.get(value)
+                if offset is None:
+                    encoded = _encode(value)
+                    offset = offsets[value] = len(heap)
+                    lengths[value] = len(encoded)
+                    heap += encoded
+                instances.extend((offset, lengths[value]))
+    hashes.sort()
+    key_count = len(keys) // KEY_FIELDS
+    instance_count = len(instances) // INSTANCE_FIELDS
+    header = HEADER.pack(MAGIC, BYTE_ORDER_MARK, key_count, instance_count, len(heap))
+    buffer = bytearray(header.ljust(HEADER_SIZE, b"\0"))
+    buffer += array("Q", (value >> 32 for value in hashes)).tobytes()
+    buffer += array("I", (value & 0xFFFFFFFF for value in hashes)).tobytes()
+    buffer += keys.tobytes()
+    buffer += instances.tobytes()
+    buffer += heap
+    return buffer
+
+
+class PackageTable(Mapping):
+    """Read only package table over an encoded buffer.
+
+    Keys are generated in the order of the encoded table. Values are
+    decoded when they are accessed, in the same form as the encoded table.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer).cast("B")
+        magic, mark, key_count, instance_count, heap_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not an encoded package table")
+        if mark != BYTE_ORDER_MARK:
+            raise ValueError("Encoded package table has a different byte order")
+        self.key_count = key_count
+        hashes, order, keys, instances, heap = _section_offsets(
+            key_count, instance_count
+        )
+        self.view = view
+        self.hashes = view[hashes:order].cast("Q")
+        self.order = view[order:keys].cast("I")
+        self.key_entries = view[keys:instances].cast("I")
+        self.instance_entries = view[instances:heap].cast("I")
+        self.heap = view[heap : heap + heap_size]
+
+    def release(self):
+        """Release the views of the buffer so it can be closed."""
+        for view in (
+            self.hashes,
+            self.order,
+            self.key_entries,
+            self.instance_entries,
+            self.heap,
+            self.view,
+        ):
+            view.release()
+
+    def _string(self, offset, length):
+        if length == NONE:
+            return None
+        return str(self.heap[offset : offset + length], "utf-8", "surrogatepass")
+
+    def key(self, number):
+        """Return the key with a number (position in the table)."""
+        index = number * KEY_FIELDS
+        entries = self.key_entries
+        key = self._string(entries[index], entries[index + 1])
+        name, path = key.split(_KEY_SEPARATOR, 1)
+        return name, path
+
+    def value(self, number):
+        """Return the package value of the key with a number."""
+        index = number * KEY_FIELDS
+        first, count = self.key_entries[index + 2], self.key_entries[index + 3]
+        instances = []
+        fields = self.instance_entries
+        start = first * INSTANCE_FIELDS
+        stop = start + count * INSTANCE_FIELDS
+        for field in range(start, stop, INSTANCE_FIELDS):
+            instances.append(
+                [
+                    self._string(fields[field], fields[field + 1]),
+                    self._string(fields[field + 2], fields[field + 3]),
+                    _decode_checksums(
+                        self._string(fields[field + 4], fields[field + 5])
+                    ),
+                ]
+            )
+        if count == 1:
+            return instances[0]
+        return Instances(instances)
+
+    def key_bytes(self, number):
+        """Return a view of the encoded key with a number."""
+        index = number * KEY_FIELDS
+        offset = self.key_entries[index]
+        return self.heap[offset : offset + self.key_entries[index + 1]]
+
+    def same_value(self, number, other, other_number):
+        """Check if the values of keys in two tables are encoded identically.
+
+        Only the encoded strings are compared, so nothing is decoded.
+        """
+        index = number * KEY_FIELDS
+        other_index = other_number * KEY_FIELDS
+        count = self.key_entries[index + 3]
+        if count != other.key_entries[other_index + 3]:
+            return False
+        fields = self.instance_entries
+        other_fields = other.instance_entries
+        field = self.key_entries[index + 2] * INSTANCE_FIELDS
+        other_field = other.key_entries[other_index + 2] * INSTANCE_FIELDS
+        heap = self.heap
+        other_heap = other.heap
+        for _ in range(count * INSTANCE_FIELDS // 2):
+            offset, length = fields[field], fields[field + 1]
+            other_offset = other_fields[other_field]
+            if length != other_fields[other_field + 1]:
+                return False
+            if length != NONE and (
+                heap[offset : offset + length]
+                != other_heap[other_offset : other_offset + length]
+            ):
+                return False
+            field += 2
+            other_field += 2
+        return True
+
+    def find(self, package_key):
+        """Return the number of a key, or -1 if it is not in the table."""
+        key_bytes = _key_bytes(package_key)
+        value = key_hash(key_bytes)
+        position = bisect_left(self.hashes, value)
+        while position < self.key_count and self.hashes[position] == value:
+            number = self.order[position]
+            index = number * KEY_FIELDS
+            offset, length = self.key_entries[index], self.key_entries[index + 1]
+            if self.heap[offset : offset + length] == key_bytes:
+                return number
+            position += 1
+        return -1
+
+    def __len__(self):
+        return self.key_count
+
+    def __iter__(self):
+        return self.keys_range(0, self.key_count)
+
+    def __contains__(self, package_key):
+        return self.find(package_key) >= 0
+
+    def __getitem__(self, package_key):
+        number = self.find(package_key)
+        if number < 0:
+            raise KeyError(package_key)
+        return self.value(number)
+
+    def get(self, package_key, default=None):
+        number = self.find(package_key)
+        if number < 0:
+            return default
+        return self.value(number)
+
+    def items(self):
+        return self.items_range(0, self.key_count)
+
+    def keys_range(self, start, stop):
+        """Generate the keys with numbers in the range [start, stop)."""
+        for number in range(start, min(stop, self.key_count)):
+            yield self.key(number)
+
+    def items_range(self, start, stop):
+        """Generate (key, value) for the keys with numbers in [start, stop)."""
+        for number in range(start, min(stop, self.key_count)):
+            yield self.key(number), self.value(number)
+
+
+def match_keys(table1, table2):
+    """Match the keys of two tables by a merge join of their sorted hashes.
+
+    Returns:
+        Tuple of (partners, matched) where partners is an array of the
+        number of the same key in table2 (or -1) for each key of table1, and
+        matched is a bytearray which is 1 for each key of table2 which is
+        also in table1
+    """
+    partners = array("i", [-1]) * len(table1)
+    matched = bytearray(len(table2))
+    hashes1, hashes2 = table1.hashes, table2.hashes
+    order1, order2 = table1.order, table2.order
+    count1, count2 = len(table1), len(table2)
+    position1 = position2 = 0
+    while position1 < count1 and position2 < count2:
+        hash1 = hashes1[position1]
+        hash2 = hashes2[position2]
+        if hash1 < hash2:
+            position1 += 1
+        elif hash1 > hash2:
+            position2 += 1
+        else:
+            # Keys with the same hash are compared (the hash may collide)
+            end1 = position1 + 1
+            while end1 < count1 and hashes1[end1] == hash1:
+                end1 += 1
+            end2 = position2 + 1
+            while end2 < count2 and hashes2[end2] == hash1:
+                end2 += 1
+            for number1 in order1[position1:end1]:
+                key_bytes = table1.key_bytes(number1)
+                for number2 in order2[position2:end2]:
+                    if not matched[number2] and table2.key_bytes(number2) == key_bytes:
+                        partners[number1] = number2
+                        matched[number2] = 1
+                        break
+            position1, position2 = end1, end2
+    return partners, matched
+
+
+def write_table(packages, filename):
+    """Write the encoding of a package table to a file."""
+    with open(filename, "wb") as f:
+        f.write(encode_table(packages))
+
+
+def is_table_file(filename):
+    """Check if a file holds an encoded package table.
+
+    Tables are memory mapped, so the standard input is never a table.
+    """
+    if not is_filename(filename):
+        return False
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def open_table(filename):
+    """Return the PackageTable encoded in a file.
+
+    The file is memory mapped, so only the pages which are accessed are
+    read.
+    """
+    with open(filename, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return PackageTable(mapped)
+
+
+class SharedPackageTable:
+    """Package table encoded in a block of shared memory.
+
+    The process which creates the table owns the block and unlinks it
+    when the table is closed. Other processes attach to the block by name
+    and read the table without copying it.
+    """
+
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+        self.table = PackageTable(memory.buf)
+
+    @classmethod
+    def create(cls, packages):
+        """Encode a package table into a new block of shared memory."""
+        encoded = encode_table(packages)
+        memory = shared_memory.SharedMemory(create=True, size=len(encoded))
+        memory.buf[: len(encoded)] = encoded
+        return cls(memory, True)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to the table in the block of shared memory with a name."""
+        if sys.version_info >= (3, 13):
+            # Only the owner is responsible for unlinking the block
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Processes started by multiprocessing share the resource
+            # tracker of the owner, which already tracks the block
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory, False)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def close(self):
+        """Detach from the block, unlinking it if this process owns it."""
+        self.table.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,335 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Ordering of package versions.
+
+Each ecosystem has a parser which converts a version string into a key
+which can be compared using the normal tuple ordering. Parsed keys are
+memoised in a bounded cache as the same versions occur many times within
+a large comparison.
+"""
+
+import re
+from functools import lru_cache
+
+from sbomdiff.purl import purl_type
+
+UPGRADE = "upgrade"
+DOWNGRADE = "downgrade"
+EQUIVALENT = "equivalent"
+INCOMPARABLE = "incomparable"
+
+CACHE_SIZE = 65536
+
+_SEMVER = re.compile(
+    r"^v?(\d+)\.(\d+)\.(\d+)"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$"
+)
+_GO_TOOLCHAIN = re.compile(r"^go(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:(beta|rc)(\d+))?$")
+_PEP440 = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+_DEBIAN = re.compile(r"^(?:(\d+):)?([0-9][A-Za-z0-9.+~:-]*?)(?:-([A-Za-z0-9.+~]+))?$")
+_RPM = re.compile(r"^(?:(\d+):)?([^-]+)(?:-([^-]+))?$")
+_APK = re.compile(
+    r"^(\d+(?:\.\d+)*)([a-z])?((?:_[a-z]+\d*)*)(?:~[0-9a-f]+)?(?:-r(\d+))?$"
+)
+_APK_SUFFIX = re.compile(r"_([a-z]+)(\d*)")
+_DIGITS = re.compile(r"(\d+)")
+_RPM_SEGMENTS = re.compile(r"~|\^|[0-9]+|[A-Za-z]+")
+_RPM_HINT = re.compile(r"\.(el|fc|amzn|mga|sles|suse)\d|\.module[+_]")
+_DEBIAN_HINT = re.compile(r"ubuntu|debian|deb\d|dfsg|\+b\d|^\d+:")
+_APK_HINT = re.compile(r"-r\d+$")
+
+_PEP440_PRE = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2}
+_PEP440_PRE.update({"pre": 2, "preview": 2})
+
+# Order of apk suffixes; suffixes before None are pre-releases
+_APK_SUFFIXES = ("alpha", "beta", "pre", "rc", None, "cvs", "svn", "git", "hg", "p")
+_APK_RELEASE = _APK_SUFFIXES.index(None)
+
+# Map of package URL types to ecosystems
+PURL_ECOSYSTEMS = {
+    "pypi": "pep440",
+    "deb": "debian",
+    "rpm": "rpm",
+    "apk": "apk",
+    "golang": "golang",
+    "npm": "semver",
+    "cargo": "semver",
+}
+
+
+def _semver_key(version):
+    match = _SEMVER.match(version)
+    if match is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    if prerelease is None:
+        # A release has higher precedence than any pre-release
+        pre_key = (1,)
+    else:
+        pre_key = (0,) + tuple(
+            (0, int(identifier), "") if identifier.isdigit() else (1, 0, identifier)
+            for identifier in prerelease.split(".")
+        )
+    return (int(major), int(minor), int(patch), pre_key)
+
+
+def _golang_key(version):
+    match = _GO_TOOLCHAIN.match(version.lower())
+    if match is not None:
+        # Go toolchain version e.g. go1.21rc2 or go1.25.6
+        major, minor, patch, pre_type, pre_number = match.groups()
+        if pre_type is None:
+            pre_key = (1,)
+        else:
+            pre_key = (0, 0 if pre_type == "beta" else 1, int(pre_number))
+        return (int(major), int(minor or 0), int(patch or 0), pre_key)
+    # Module versions (including pseudo-versions) follow semantic versioning
+    # and pseudo-version timestamps order correctly as pre-release identifiers
+    return _semver_key(version.replace("+incompatible", ""))
+
+
+def _pep440_key(version):
+    match = _PEP440.match(version)
+    if match is None:
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    # Trailing zeros are not significant (1.0 == 1.0.0)
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    pre_l = match.group("pre_l")
+    post = match.group("post")
+    dev = match.group("dev")
+    if pre_l is not None:
+        pre_key = (_PEP440_PRE[pre_l.lower()], int(match.group("pre_n") or 0))
+    elif post is None and dev is not None:
+        # Development releases sort before pre-releases
+        pre_key = (-1, 0)
+    else:
+        pre_key = (3, 0)
+    if post is None:
+        post_key = -1
+    else:
+        post_key = int(match.group("post_n1") or match.group("post_n2") or 0)
+    dev_key = float("inf") if dev is None else int(match.group("dev_n") or 0)
+    local = match.group("local")
+    if local is None:
+        local_key = ()
+    else:
+        local_key = tuple(
+            (1, int(part), "") if part.isdigit() else (0, 0, part.lower())
+            for part in re.split(r"[-_.]", local)
+        )
+    return (
+        int(match.group("epoch") or 0),
+        tuple(release),
+        pre_key,
+        post_key,
+        dev_key,
+        local_key,
+    )
+
+
+def _dpkg_part_key(part):
+    """Convert a version part using the ordering of dpkg.
+
+    Non-digit runs are compared character by character where ~ sorts before
+    the end of the run, which sorts before letters, which sort before other
+    characters. Digit runs are compared numerically.
+    """
+    runs = _DIGITS.split(part)
+    # Split alternates non-digit and digit runs, starting and ending with a
+    # (possibly empty) non-digit run
+    runs.append("0")
+    pairs = []
+    for index in range(0, len(runs), 2):
+        characters = []
+        for character in runs[index]:
+            if character == "~":
+                characters.append(-1)
+            elif character.isalpha():
+                characters.append(ord(character))
+            else:
+                characters.append(ord(character) + 256)
+        characters.append(0)
+        pairs.append((tuple(characters), int(runs[index + 1])))
+    # Empty trailing runs are not significant (1. == 1.0)
+    while len(pairs) > 1 and pairs[-1] == ((0,), 0):
+        pairs.pop()
+    # Terminator compares as the end of the part
+    return tuple(pairs) + (((0,), 0),)
+
+
+def _debian_key(version):
+    match = _DEBIAN.match(version)
+    if match is None:
+        return None
+    epoch, upstream, revision = match.groups()
+    return (
+        int(epoch or 0),
+        _dpkg_part_key(upstream),
+        _dpkg_part_key(revision or ""),
+    )
+
+
+def _rpm_part_key(part):
+    """Convert a version part using the ordering of rpmvercmp.
+
+    Separators are ignored. Numeric segments are newer than alphabetic
+    segments, ~ sorts before the end of the version and ^ sorts after the
+    end of the version but before any other segment.
+    """
+    key = []
+    for segment in _RPM_SEGMENTS.findall(part):
+        if segment == "~":
+            key.append((-1, 0, ""))
+        elif segment == "^":
+            key.append((0.5, 0, ""))
+        elif segment.isdigit():
+            key.append((2, int(segment), ""))
+        else:
+            key.append((1, 0, segment))
+    key.append((0, 0, ""))
+    return tuple(key)
+
+
+def _rpm_key(version):
+    match = _RPM.match(version)
+    if match is None:
+        return None
+    epoch, upstream, release = match.groups()
+    return (int(epoch or 0), _rpm_part_key(upstream), _rpm_part_key(release or ""))
+
+
+def _apk_key(version):
+    # Alpine versions e.g. 1.36.1-r15 where -rN is the package revision
+    match = _APK.match(version)
+    if match is None:
+        return None
+    numbers, letter, suffixes, revision = match.groups()
+    suffix_key = []
+    for name, number in _APK_SUFFIX.findall(suffixes):
+        if name not in _APK_SUFFIXES:
+            return None
+        suffix_key.append((_APK_SUFFIXES.index(name), int(number or 0)))
+    # Terminator compares as the release without a suffix
+    suffix_key.append((_APK_RELEASE, 0))
+    return (
+        tuple(int(number) for number in numbers.split(".")),
+        letter or "",
+        tuple(suffix_key),
+        int(revision or 0),
+    )
+
+
+PARSERS = {
+    "semver": _semver_key,
+    "golang": _golang_key,
+    "pep440": _pep440_key,
+    "debian": _debian_key,
+    "rpm": _rpm_key,
+    "apk": _apk_key,
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_version(version, ecosystem):
+    """Return a comparable key for a version or None if it cannot be parsed.
+
+    Args:
+        version: Version string
+        ecosystem: One of semver, golang, pep440, debian, rpm or apk
+
+    Returns:
+        Key which orders versions of the ecosystem using tuple comparison
+    """
+    return PARSERS[ecosystem](version)
+
+
+_GO = 1
+_RPM_SYNTAX = 2
+_DEBIAN_SYNTAX = 4
+_SEMVER_SYNTAX = 8
+_PEP440_SYNTAX = 16
+_APK_SYNTAX = 32
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _version_syntax(version):
+    syntax = 0
+    if version.lower().startswith("go"):
+        syntax |= _GO
+    if _RPM_HINT.search(version):
+        syntax |= _RPM_SYNTAX
+    if _DEBIAN_HINT.search(version):
+        syntax |= _DEBIAN_SYNTAX
+    if _APK_HINT.search(version):
+        syntax |= _APK_SYNTAX
+    if _SEMVER.match(version):
+        syntax |= _SEMVER_SYNTAX
+    if _PEP440.match(version):
+        syntax |= _PEP440_SYNTAX
+    return syntax
+
+
+def guess_ecosystem(version1, version2):
+    """Identify the ecosystem of a pair of versions from their syntax."""
+    syntax1 = _version_syntax(version1)
+    syntax2 = _version_syntax(version2)
+    if syntax1 & syntax2 & _GO:
+        return "golang"
+    if (syntax1 | syntax2) & _RPM_SYNTAX:
+        return "rpm"
+    if (syntax1 | syntax2) & _DEBIAN_SYNTAX:
+        return "debian"
+    if (syntax1 | syntax2) & _APK_SYNTAX:
+        return "apk"
+    if syntax1 & syntax2 & _SEMVER_SYNTAX:
+        return "semver"
+    if syntax1 & syntax2 & _PEP440_SYNTAX:
+        return "pep440"
+    # dpkg ordering is a reasonable default for other numeric versions
+    return "debian"
+
+
+def purl_ecosystem(purl):
+    """Return the ecosystem of the versions of a package URL or None."""
+    return PURL_ECOSYSTEMS.get(purl_type(purl))
+
+
+def classify_version_change(version1, version2, ecosystem=None):
+    """Classify the change from version1 to version2.
+
+    Args:
+        version1: Original version
+        version2: New version
+        ecosystem: Ecosystem of the package. If not specified, the ecosystem
+            is identified from the syntax of the versions
+
+    Returns:
+        One of upgrade, downgrade, equivalent or incomparable
+    """
+    if version1 == version2:
+        return EQUIVALENT
+    if ecosystem is None:
+        ecosystem = guess_ecosystem(version1, version2)
+    key1 = parse_version(version1, ecosystem)
+    key2 = parse_version(version2, ecosystem)
+    if key1 is None or key2 is None:
+        return INCOMPARABLE
+    if key1 < key2:
+        return UPGRADE
+    if key1 > key2:
+        return DOWNGRADE
+    return EQUIVALENT
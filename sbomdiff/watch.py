@@ -0,0 +1,117 @@
+# Copyright (C) 2024 Anthony Harrison
+# SPDX-License-Identifier: Apache-2.0
+
+"""Polling of SBOM files so that differences are reported when they change.
+
+Each poll only reads the status (modification time and size) of each
+file. The content of a file is only hashed if its status has changed,
+and the file is only parsed again if its content has changed, so the
+parsed packages of an unchanged file are reused. A file which cannot be
+parsed (e.g. it is still being written) keeps its previous packages.
+"""
+
+import hashlib
+import os
+import time
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(filename):
+    """Return the SHA256 digest of the content of a file."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WatchedFile:
+    """A file and the result of loading its content.
+
+    Args:
+        filename: Name of the file
+        load: Function called with the filename to load the file
+        on_error: Function called with the WatchedFile and the exception if
+            a changed file cannot be loaded
+    """
+
+    def __init__(self, filename, load, on_error=None):
+        self.filename = filename
+        self.load = load
+        self.on_error = on_error
+        self.status = None
+        self.digest = None
+        self.data = None
+
+    def _get_status(self):
+        try:
+            status = os.stat(self.filename)
+        except FileNotFoundError:
+            # File may be in the process of being replaced
+            return None
+        return (status.st_mtime_ns, status.st_size)
+
+    def refresh(self):
+        """Load the file again if its content has changed.
+
+        If the changed file cannot be loaded, the previous data is kept and
+        the file is loaded again when it next changes. Errors in the first
+        load of the file are raised.
+
+        Returns:
+            True if the file has been loaded
+        """
+        status = self._get_status()
+        if status is None or status == self.status:
+            return False
+        try:
+            digest = file_digest(self.filename)
+        except FileNotFoundError:
+            return False
+        if digest == self.digest:
+            self.status = status
+            return False
+        try:
+            data = self.load(self.filename)
+        except Exception as error:
+            if self.digest is None:
+                raise
+            # Content is only loaded again once the file has changed
+            self.status = status
+            if self.on_error is not None:
+                self.on_error(self, error)
+            return False
+        self.status = status
+        self.digest = digest
+        self.data = data
+        return True
+
+
+def watch(files, on_change, interval=1.0, max_changes=None, sleep=None):
+    """Poll files until interrupted, calling on_change when any file changes.
+
+    Args:
+        files: List of WatchedFile
+        on_change: Function called with the list of changed files
+        interval: Number of seconds between each poll
+        max_changes: Number of changes after which polling stops (default: no limit)
+        sleep: Function used to wait between each poll (default: time.sleep)
+
+    Returns:
+        Value returned by the last call of on_change, or None
+    """
+    if sleep is None:
+        sleep = time.sleep
+    result = None
+    changes = 0
+    try:
+        while max_changes is None or changes < max_changes:
+            sleep(interval)
+            changed = [watched for watched in files if watched.refresh()]
+            if changed:
+                result = on_change(changed)
+                changes += 1
+    except KeyboardInterrupt:
+        pass
+    return result
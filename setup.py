@@ -28,14 +28,12 @@ setup_kwargs = dict(
         'License :: OSI Approved :: Apache Software License',
         "Natural Language :: English",
         "Operating System :: OS Independent",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: Implementation :: CPython",
         "Programming Language :: Python :: Implementation :: PyPy",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.9",
     packages=find_packages(),
     entry_points={
         "console_scripts": [
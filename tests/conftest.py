@@ -20,6 +20,51 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+def _cyclonedx_component(component):
+    """Return the CycloneDX JSON of a component given to write_cyclonedx."""
+    if isinstance(component, tuple):
+        name, version = component
+        component = {"name": name, "version": version}
+    component = {"type": "library", **component}
+    path = component.pop("path", None)
+    if path is not None:
+        component["properties"] = [{"name": "syft:location:0:path", "value": path}]
+    license = component.pop("license", None)
+    if license is not None:
+        component["licenses"] = [{"license": {"id": license}}]
+    if "components" in component:
+        component["components"] = [
+            _cyclonedx_component(child) for child in component["components"]
+        ]
+    return component
+
+
+@pytest.fixture
+def write_cyclonedx(temp_dir):
+    """Function which writes a CycloneDX JSON SBOM to the temporary directory.
+
+    The function takes the filename and the components, with any other
+    members of the SBOM (e.g. dependencies) as keyword arguments, and
+    returns the path of the SBOM. Each component is a (name, version) tuple or a
+    dictionary of its members; the type is library unless specified, a
+    path is written as a Syft location property and a license as a
+    license identifier. Nested components are written in the same way.
+    """
+
+    def write(name, components, **members):
+        sbom = {
+            "bomFormat": "CycloneDX",
+            "specVersion": "1.4",
+            "components": [_cyclonedx_component(component) for component in components],
+            **members,
+        }
+        filepath = temp_dir / name
+        filepath.write_text(json.dumps(sbom))
+        return str(filepath)
+
+    return write
+
+
 @pytest.fixture
 def cyclonedx_single_package(temp_dir):
     """CycloneDX SBOM with a single package (no path info)."""
@@ -296,6 +341,71 @@ def cyclonedx_xml_without_path(temp_dir):
     return str(filepath)
 
 
+@pytest.fixture
+def cyclonedx_nested(temp_dir):
+    """CycloneDX SBOM with components bundled within other components."""
+    sbom = {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "components": [
+            {
+                "type": "application",
+                "name": "app",
+                "version": "1.0.0",
+                "bom-ref": "pkg:maven/com.example/app@1.0.0",
+                "components": [
+                    {
+                        "type": "library",
+                        "name": "shaded-lib",
+                        "version": "2.0.0",
+                        "components": [
+                            {"type": "library", "name": "inner-lib", "version": "3.0"}
+                        ],
+                    }
+                ],
+            },
+            {"type": "library", "name": "top-lib", "version": "4.0"},
+        ],
+    }
+    filepath = temp_dir / "nested.json"
+    filepath.write_text(json.dumps(sbom, indent=2))
+    return str(filepath)
+
+
+@pytest.fixture
+def cyclonedx_xml_nested(temp_dir):
+    """CycloneDX SBOM in XML format with nested components."""
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<bom xmlns="http://cyclonedx.org/schema/bom/1.4" version="1">
+  <components>
+    <component type="application" bom-ref="app-ref">
+      <name>app</name>
+      <version>1.0.0</version>
+      <components>
+        <component type="library">
+          <name>shaded-lib</name>
+          <version>2.0.0</version>
+          <components>
+            <component type="library">
+              <name>inner-lib</name>
+              <version>3.0</version>
+            </component>
+          </components>
+        </component>
+      </components>
+    </component>
+    <component type="library">
+      <name>top-lib</name>
+      <version>4.0</version>
+    </component>
+  </components>
+</bom>
+"""
+    filepath = temp_dir / "nested.xml"
+    filepath.write_text(xml_content)
+    return str(filepath)
+
+
 @pytest.fixture
 def spdx_tag_file(temp_dir):
     """SPDX SBOM in TagValue format."""
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the asyncio interface."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from sbomdiff.aio import AsyncSBOMDiff, diff_sboms
+from sbomdiff.cli import main
+
+
+class TestAsyncSBOMDiff:
+    """Test asynchronous parsing and comparison."""
+
+    def test_parse_returns_packages(self, cyclonedx_single_package):
+        """Should parse a SBOM file in an executor."""
+
+        async def parse():
+            return await AsyncSBOMDiff().parse(cyclonedx_single_package)
+
+        packages, sbom_type = asyncio.run(parse())
+        assert ("example-lib", "") in packages
+        assert sbom_type == "cyclonedx"
+
+    def test_diff_generates_records(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        """Should generate a record for each difference."""
+
+        async def diff():
+            sbom_diff = AsyncSBOMDiff()
+            records = [
+                record
+                async for record in sbom_diff.diff(
+                    cyclonedx_version_change_old, cyclonedx_version_change_new
+                )
+            ]
+            return records, sbom_diff.get_summary()
+
+        records, summary = asyncio.run(diff())
+        assert len(records) == 2
+        assert all(record["status"] == "change" for record in records)
+        assert summary["version_changes"] == 2
+
+    def test_repeated_diffs_counted_separately(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        """Counts of differences should not carry over between comparisons."""
+
+        async def diff_twice():
+            sbom_diff = AsyncSBOMDiff()
+            summaries = []
+            for _ in range(2):
+                async for _ in sbom_diff.diff(
+                    cyclonedx_version_change_old, cyclonedx_version_change_new
+                ):
+                    pass
+                summaries.append(sbom_diff.get_summary())
+            return summaries
+
+        first, second = asyncio.run(diff_twice())
+        assert first == second
+        assert second["version_changes"] == 2
+
+    def test_small_batches_generate_all_records(self):
+        """Should generate every record when split across many batches."""
+        packages1 = {(f"pkg{i}", ""): ["1.0", "MIT", None] for i in range(10)}
+        packages2 = {(f"pkg{i}", ""): ["2.0", "MIT", None] for i in range(10)}
+
+        async def compare():
+            sbom_diff = AsyncSBOMDiff(batch_size=3)
+            return [
+                record async for record in sbom_diff.compare(packages1, packages2)
+            ]
+
+        assert len(asyncio.run(compare())) == 10
+
+    def test_concurrent_diffs_with_executor(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, temp_dir
+    ):
+        """Concurrent diffs should each match the JSON output of the CLI."""
+        output_file = str(temp_dir / "output.json")
+        main(
+            [
+                "sbomdiff",
+                "-f",
+                "json",
+                "-o",
+                output_file,
+                cyclonedx_version_change_old,
+                cyclonedx_version_change_new,
+            ]
+        )
+        with open(output_file) as f:
+            expected = json.load(f)
+
+        async def run_diffs():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                return await asyncio.gather(
+                    *[
+                        diff_sboms(
+                            cyclonedx_version_change_old,
+                            cyclonedx_version_change_new,
+                            executor=executor,
+                        )
+                        for _ in range(4)
+                    ]
+                )
+
+        for document in asyncio.run(run_diffs()):
+            assert document == expected
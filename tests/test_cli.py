@@ -227,3 +227,54 @@ class TestCLIWithDuplicatePackages:
         assert "Version changes:  2" in captured.out
         assert "(gcs)" in captured.out
         assert "(s3)" in captured.out
+
+
+class TestCLISPDX3:
+    """Tests for comparing SPDX 3.0 JSON-LD SBOMs."""
+
+    @pytest.fixture
+    def write_spdx3(self, temp_dir):
+        """Write a SPDX 3.0 JSON-LD SBOM of (name, version) packages."""
+
+        def write(name, packages):
+            graph = []
+            for index, (package, version) in enumerate(packages):
+                graph.append(
+                    {
+                        "type": "software_Package",
+                        "spdxId": f"urn:pkg-{index}",
+                        "name": package,
+                        "software_packageVersion": version,
+                    }
+                )
+                # Listed licenses are referenced by their URL
+                graph.append(
+                    {
+                        "type": "Relationship",
+                        "spdxId": f"urn:rel-{index}",
+                        "relationshipType": "hasConcludedLicense",
+                        "from": f"urn:pkg-{index}",
+                        "to": ["https://spdx.org/licenses/Apache-2.0"],
+                    }
+                )
+            sbom = {
+                "@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",
+                "@graph": graph,
+            }
+            filepath = temp_dir / name
+            filepath.write_text(json.dumps(sbom))
+            return str(filepath)
+
+        return write
+
+    def test_cli_detects_version_change(self, write_spdx3, capsys):
+        """CLI should report a version change between JSON-LD SBOMs."""
+        old = write_spdx3("old.spdx3.json", [("openssl", "3.0.1"), ("zlib", "1.3")])
+        new = write_spdx3("new.spdx3.json", [("openssl", "3.0.2"), ("zlib", "1.3")])
+
+        result = main(["sbomdiff", old, new])
+
+        captured = capsys.readouterr()
+        assert "[VERSION] openssl: Version changed from 3.0.1 to 3.0.2" in captured.out
+        assert "Version changes:  1" in captured.out
+        assert result == 1
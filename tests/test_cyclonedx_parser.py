@@ -2,7 +2,9 @@
 
 """Tests for CycloneDX parser with path-aware matching."""
 
-from sbomdiff.cyclonedx_parser import CycloneDXParser
+import sys
+
+from sbomdiff.cyclonedx_parser import CycloneDXParser, walk_components
 
 
 class TestCycloneDXParserPackageKey:
@@ -170,3 +172,84 @@ class TestCycloneDXParserXML:
         _, license = packages[("example-lib", "")]
         assert license == "MIT"
 
+
+class TestCycloneDXParserNested:
+    """Test parsing of components nested within other components."""
+
+    def test_walk_order(self):
+        components = [
+            {"name": "a", "components": [{"name": "b", "components": [{"name": "c"}]}]},
+            {"name": "d"},
+        ]
+        walked = [
+            (component["name"], parent)
+            for component, parent in walk_components(
+                components,
+                lambda component: component.get("components"),
+                lambda component: component["name"],
+            )
+        ]
+        assert walked == [("a", None), ("b", "a"), ("c", "b"), ("d", None)]
+
+    def test_deep_nesting(self):
+        """Nesting should not be limited by the recursion limit."""
+        depth = sys.getrecursionlimit() * 2
+        components = [{"name": "0"}]
+        innermost = components[0]
+        for level in range(1, depth):
+            innermost["components"] = [{"name": str(level)}]
+            innermost = innermost["components"][0]
+        walked = list(
+            walk_components(
+                components,
+                lambda component: component.get("components"),
+                lambda component: component["name"],
+            )
+        )
+        assert len(walked) == depth
+        assert walked[-1][1] == str(depth - 2)
+
+    def test_parse_nested_json(self, cyclonedx_nested):
+        parser = CycloneDXParser()
+        packages = parser.parse(cyclonedx_nested)
+
+        assert list(packages) == [
+            ("app", ""),
+            ("shaded-lib", ""),
+            ("inner-lib", ""),
+            ("top-lib", ""),
+        ]
+        assert parser.get_parents() == {
+            ("app", ""): None,
+            ("shaded-lib", ""): "pkg:maven/com.example/app@1.0.0",
+            ("inner-lib", ""): "shaded-lib",
+            ("top-lib", ""): None,
+        }
+
+    def test_parents_of_duplicate_keys(self, write_cyclonedx):
+        """Top level instances of a duplicate key should keep a None parent."""
+        sbom_file = write_cyclonedx(
+            "duplicates.json",
+            [
+                ("x", "1.0"),
+                ("x", "2.0"),
+                {"name": "shade", "version": "1.0", "components": [("x", "3.0")]},
+            ],
+        )
+        parser = CycloneDXParser()
+        packages = parser.parse(sbom_file)
+
+        assert [version for version, _ in packages[("x", "")]] == ["1.0", "2.0", "3.0"]
+        assert parser.get_parents()[("x", "")] == [None, None, "shade"]
+
+    def test_parse_nested_xml(self, cyclonedx_xml_nested):
+        parser = CycloneDXParser()
+        packages = parser.parse(cyclonedx_xml_nested)
+
+        assert packages[("inner-lib", "")] == ["3.0", "NOT FOUND"]
+        assert parser.get_parents() == {
+            ("app", ""): None,
+            ("shaded-lib", ""): "app-ref",
+            ("inner-lib", ""): "shaded-lib",
+            ("top-lib", ""): None,
+        }
@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for content based SBOM format detection."""
+
+import io
+import json
+import shutil
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.detect import detect_format, detect_prefix
+from sbomdiff.spdx_parser import SPDXParser
+
+
+class TestDetectFormat:
+    """Test identification of each supported format."""
+
+    def test_cyclonedx_json(self, cyclonedx_single_package):
+        assert detect_format(cyclonedx_single_package) == ("cyclonedx", "json")
+
+    def test_cyclonedx_xml(self, cyclonedx_xml_with_path):
+        assert detect_format(cyclonedx_xml_with_path) == ("cyclonedx", "xml")
+
+    def test_spdx_tag(self, spdx_tag_file):
+        assert detect_format(spdx_tag_file) == ("spdx", "tag")
+
+    def test_spdx_rdf(self, spdx_rdf_file):
+        assert detect_format(spdx_rdf_file) == ("spdx", "rdf")
+
+    def test_spdx_xml(self, spdx_xml_file):
+        assert detect_format(spdx_xml_file) == ("spdx", "xml")
+
+    def test_spdx_json_and_yaml(self):
+        assert detect_prefix('{\n  "spdxVersion": "SPDX-2.3",') == ("spdx", "json")
+        assert detect_prefix("spdxVersion: SPDX-2.3\nname: x") == ("spdx", "yaml")
+
+    def test_spdx3_jsonld(self):
+        prefix = '{"@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",'
+        assert detect_prefix(prefix) == ("spdx", "jsonld")
+
+    def test_unknown_content(self):
+        assert detect_prefix("hello world") == (None, None)
+        assert detect_prefix('{"name": "not an sbom"}') == (None, None)
+
+
+class TestDetectPrefixOnly:
+    """Detection should only examine the start of the content."""
+
+    def test_reads_only_prefix_of_stream(self):
+        """Content beyond the prefix should never be read."""
+        content = b'{"bomFormat": "CycloneDX", "components": [' + b" " * 100000
+        stream = io.BytesIO(content)
+        assert detect_format(stream, size=64) == ("cyclonedx", "json")
+        # Stream position is restored
+        assert stream.tell() == 0
+
+    def test_bytes_buffer(self):
+        assert detect_format(b"SPDXVersion: SPDX-2.3\n") == ("spdx", "tag")
+
+    def test_text_stream(self):
+        stream = io.StringIO('\ufeff<?xml version="1.0"?>\n<bom xmlns="x">')
+        assert detect_format(stream) == ("cyclonedx", "xml")
+
+
+class TestParsersWithoutExtension:
+    """Parsers should identify files without a meaningful extension."""
+
+    def test_cyclonedx_parser(self, cyclonedx_with_path, temp_dir):
+        sbom_file = str(temp_dir / "sbom")
+        shutil.copy(cyclonedx_with_path, sbom_file)
+        packages = CycloneDXParser().parse(sbom_file)
+        assert ("stdlib", "/usr/bin/service-a") in packages
+
+    def test_spdx_parser(self, spdx_tag_file, temp_dir):
+        sbom_file = str(temp_dir / "sbom.txt")
+        shutil.copy(spdx_tag_file, sbom_file)
+        packages = SPDXParser().parse(sbom_file)
+        assert packages[("example-lib", "")] == ["1.0.0", "MIT"]
+
+    def test_parser_ignores_other_type(self, spdx_tag_file, temp_dir):
+        sbom_file = str(temp_dir / "sbom")
+        shutil.copy(spdx_tag_file, sbom_file)
+        assert CycloneDXParser().parse(sbom_file) == {}
+
+    def test_cli_without_extension(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, temp_dir
+    ):
+        """CLI should compare SBOM files without an extension."""
+        file1 = str(temp_dir / "old")
+        file2 = str(temp_dir / "new")
+        shutil.copy(cyclonedx_version_change_old, file1)
+        shutil.copy(cyclonedx_version_change_new, file2)
+        output_file = str(temp_dir / "output.json")
+        main(["sbomdiff", "-f", "json", "-o", output_file, file1, file2])
+        with open(output_file) as f:
+            output = json.load(f)
+        assert output["summary"]["version_changes"] == 2
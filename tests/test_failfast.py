@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for stopping at the first difference."""
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.multimap import Instances
+
+PACKAGES1 = {
+    ("zlib", ""): ["1.2.11", "Zlib", None],
+    ("bash", ""): ["5.2", "GPL-3.0-or-later", None],
+    ("stdlib", ""): Instances([["go1.24.1", "BSD", None], ["go1.25.1", "BSD", None]]),
+}
+
+
+class TestFirstDifference:
+    """Test finding the first difference between a table and a stream."""
+
+    def test_no_differences(self):
+        stream = [
+            (("stdlib", ""), ["go1.25.1", "BSD", None]),
+            (("bash", ""), ["5.2", "GPL-3.0-or-later", None]),
+            (("zlib", ""), ["1.2.11", "Zlib", None]),
+            (("stdlib", ""), ["go1.24.1", "BSD", None]),
+        ]
+        assert SBOMDiff().first_difference(PACKAGES1, stream) is None
+
+    def test_added(self):
+        stream = [(("wget", ""), ["1.21", "GPL-3.0-or-later", None])]
+        assert SBOMDiff().first_difference(PACKAGES1, stream) == ("wget", "")
+
+    def test_changed(self):
+        stream = [(("zlib", ""), ["1.2.13", "Zlib", None])]
+        assert SBOMDiff().first_difference(PACKAGES1, stream) == ("zlib", "")
+
+    def test_license_excluded(self):
+        stream = [(("bash", ""), ["5.2", "GPL-3.0-only", None])]
+        assert SBOMDiff().first_difference(PACKAGES1, stream) == ("bash", "")
+        sbom_diff = SBOMDiff(exclude_license=True)
+        # Remaining packages have been removed
+        assert sbom_diff.first_difference(PACKAGES1, stream) == ("zlib", "")
+
+    def test_extra_instance(self):
+        stream = [(("stdlib", ""), ["go1.25.1", "BSD", None])] * 2
+        assert SBOMDiff().first_difference(PACKAGES1, stream) == ("stdlib", "")
+
+    def test_removed(self):
+        stream = [
+            (("zlib", ""), ["1.2.11", "Zlib", None]),
+            (("bash", ""), ["5.2", "GPL-3.0-or-later", None]),
+            (("stdlib", ""), ["go1.24.1", "BSD", None]),
+        ]
+        assert SBOMDiff().first_difference(PACKAGES1, stream) == ("stdlib", "")
+
+    def test_stops_at_first_difference(self):
+        consumed = []
+
+        def stream():
+            for index in range(1000):
+                consumed.append(index)
+                yield (f"pkg{index}", ""), ["1.0", "MIT", None]
+
+        assert SBOMDiff().first_difference({}, stream()) == ("pkg0", "")
+        assert consumed == [0]
+
+
+class TestFailFastOption:
+    """Test the --quiet and --fail-fast options."""
+
+    @pytest.fixture
+    def sboms(self, write_cyclonedx):
+        components = [(f"pkg{index}", "1.0") for index in range(100)]
+        return [
+            write_cyclonedx(name, [("zlib", first_version)] + components)
+            for name, first_version in (("old.json", "1.0"), ("new.json", "2.0"))
+        ]
+
+    def test_difference(self, sboms, capsys):
+        assert main(["sbomdiff", "--quiet", "--fail-fast", *sboms]) == 1
+        assert capsys.readouterr().out == ""
+
+    def test_no_difference(self, sboms, capsys):
+        args = ["sbomdiff", "--quiet", "--fail-fast", sboms[0], sboms[0] + ".copy"]
+        with open(sboms[0]) as f:
+            content = f.read()
+        with open(args[-1], "w") as f:
+            f.write(content)
+        assert main(args) == 0
+        assert capsys.readouterr().out == ""
+
+    def test_stops_at_first_difference(self, sboms, monkeypatch):
+        def count_differences(*args):
+            raise AssertionError("Every difference counted")
+
+        monkeypatch.setattr(SBOMDiff, "count_differences", count_differences)
+        assert main(["sbomdiff", "--quiet", "--fail-fast", *sboms]) == 1
+
+    def test_requires_quiet(self, sboms, capsys):
+        assert main(["sbomdiff", "--fail-fast", *sboms]) == -1
+        assert "--quiet" in capsys.readouterr().out
+
+    def test_quiet(self, sboms, capsys):
+        assert main(["sbomdiff", "--quiet", *sboms]) == 1
+        assert capsys.readouterr().out == ""
+
+    def test_checksum_uses_whole_sbom(self, sboms, capsys):
+        args = ["sbomdiff", "--quiet", "--fail-fast", "--checksum", "SHA256", *sboms]
+        assert main(args) == 1
+        assert capsys.readouterr().out == ""
+
+
+SPDX_TAG = """SPDXVersion: SPDX-2.3
+DataLicense: CC0-1.0
+SPDXID: SPDXRef-DOCUMENT
+DocumentName: test-sbom
+
+PackageName: example-lib
+SPDXID: SPDXRef-Package-example-lib
+PackageVersion: {version}
+"""
+
+
+class TestFailFastParity:
+    """--fail-fast should return the same value as the full comparison."""
+
+    def assert_parity(self, old, new, expected):
+        assert main(["sbomdiff", "--quiet", old, new]) == expected
+        assert main(["sbomdiff", "--quiet", "--fail-fast", old, new]) == expected
+
+    def test_framework_component(self, write_cyclonedx):
+        old, new = (
+            write_cyclonedx(
+                name, [{"type": "framework", "name": "spring", "version": version}]
+            )
+            for name, version in (("old.json", "5.3.0"), ("new.json", "6.0.0"))
+        )
+        self.assert_parity(old, new, 1)
+
+    def test_spdx_tag_without_license(self, temp_dir):
+        old = temp_dir / "old.spdx"
+        old.write_text(SPDX_TAG.format(version="1.0.0"))
+        new = temp_dir / "new.spdx"
+        new.write_text(SPDX_TAG.format(version="1.1.0"))
+        self.assert_parity(str(old), str(new), 1)
+
+    def test_merged_components(self, write_cyclonedx):
+        # Components with the same name and version at different locations
+        components = [
+            {"name": "stdlib", "version": "go1.25.6", "path": path}
+            for path in ("/bin/a", "/bin/b")
+        ]
+        old = write_cyclonedx("old.json", components)
+        new = write_cyclonedx("new.json", components[::-1])
+        self.assert_parity(old, new, 0)
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for extracting only the package fields which are compared."""
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.diff import SBOMDiff, format_record, process_packages
+from sbomdiff.fields import ALL_FIELDS, CHECKSUM, LICENSE, required_fields
+from sbomdiff.spdx_parser import SPDXParser
+
+VERSION_ONLY = required_fields(exclude_license=True)
+
+
+class TestRequiredFields:
+    """Test the projection of fields for the comparison options."""
+
+    def test_default(self):
+        assert required_fields() == {LICENSE}
+
+    def test_version_only(self):
+        assert VERSION_ONLY == frozenset()
+
+    def test_all_fields(self):
+        assert required_fields(checksum="SHA256") == ALL_FIELDS == {LICENSE, CHECKSUM}
+
+
+class TestProjectedParsers:
+    """Fields which are not projected should not be extracted."""
+
+    def test_process_packages(self):
+        package_list = [
+            {
+                "name": "zlib",
+                "version": "1.0",
+                "licenseconcluded": "Zlib",
+                "checksum": [["SHA256", "abc"]],
+            }
+        ]
+        assert process_packages(package_list) == {
+            ("zlib", ""): ["1.0", "Zlib", [["SHA256", "abc"]]]
+        }
+        assert process_packages(package_list, fields=VERSION_ONLY) == {
+            ("zlib", ""): ["1.0", None, None]
+        }
+
+    def test_cyclonedx_json(self, cyclonedx_single_package):
+        parser = CycloneDXParser(fields=VERSION_ONLY)
+        packages = parser.parse(cyclonedx_single_package)
+        assert packages == {("example-lib", ""): ["1.0.0", None]}
+
+    def test_cyclonedx_xml(self, cyclonedx_xml_with_path):
+        parser = CycloneDXParser(fields=VERSION_ONLY)
+        packages = parser.parse(cyclonedx_xml_with_path)
+        assert packages[("stdlib", "/usr/bin/service-a")] == ["go1.25.6", None]
+
+    def test_spdx_tag(self, spdx_tag_file):
+        packages = SPDXParser().parse(spdx_tag_file)
+        projected = SPDXParser(fields=VERSION_ONLY).parse(spdx_tag_file)
+        assert list(projected) == list(packages)
+        assert all(license is None for _, license in projected.values())
+        assert [version for version, _ in projected.values()] == [
+            version for version, _ in packages.values()
+        ]
+
+    def test_spdx_rdf(self, spdx_rdf_file):
+        packages = SPDXParser().parse(spdx_rdf_file)
+        projected = SPDXParser(fields=VERSION_ONLY).parse(spdx_rdf_file)
+        assert {key: value[0] for key, value in projected.items()} == {
+            key: value[0] for key, value in packages.items()
+        }
+        assert all(license is None for _, license in projected.values())
+
+    def test_spdx_xml(self, spdx_xml_file):
+        projected = SPDXParser(fields=VERSION_ONLY).parse(spdx_xml_file)
+        assert projected[("example-lib", "")] == ["1.0.0", None]
+
+
+class TestExcludeLicense:
+    """Added packages are reported without a license if licenses are excluded."""
+
+    def test_added_record(self):
+        sbom_diff = SBOMDiff(exclude_license=True)
+        record = sbom_diff.added_record(("zlib", ""), ["1.0", None, None])
+        assert "license" not in record
+        assert format_record(record) == ["[ADDED  ] zlib: (Version 1.0)"]
+
+    def test_cli(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", [("bash", "5.1")])
+        new = write_cyclonedx("new.json", [("bash", "5.1"), ("zlib", "1.0")])
+        main(["sbomdiff", "--exclude-license", old, new])
+        captured = capsys.readouterr()
+        assert "[ADDED  ] zlib: (Version 1.0)\n" in captured.out
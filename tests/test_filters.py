@@ -0,0 +1,156 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for selecting the packages which are compared."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.diff import process_packages
+from sbomdiff.filters import PackageFilter, parse_filter
+from sbomdiff.spdx_parser import SPDXParser
+from sbomdiff.stringpool import StringPool
+
+OLD = [
+    {"name": "PyYAML", "version": "6.0", "purl": "pkg:pypi/pyyaml@6.0"},
+    {"name": "left-pad", "version": "1.0", "purl": "pkg:npm/left-pad@1.0"},
+    {"name": "stdlib", "version": "go1.24.1", "path": "/usr/bin/app"},
+    {"name": "stdlib", "version": "go1.23.1", "path": "/opt/tool"},
+]
+
+NEW = [
+    {"name": "PyYAML", "version": "6.0.1", "purl": "pkg:pypi/pyyaml@6.0.1"},
+    {"name": "left-pad", "version": "1.1", "purl": "pkg:npm/left-pad@1.1"},
+    {"name": "stdlib", "version": "go1.24.2", "path": "/usr/bin/app"},
+    {"name": "stdlib", "version": "go1.23.2", "path": "/opt/tool"},
+]
+
+
+class TestParseFilter:
+    """Test parsing of filter specifications."""
+
+    def test_fields(self):
+        assert parse_filter("name:lib*") == ("name", "lib*")
+        assert parse_filter("PURL:NPM") == ("purl", "npm")
+        assert parse_filter("type:Library") == ("type", "library")
+
+    def test_path_prefix(self):
+        assert parse_filter("path:/usr/bin/") == ("path", "/usr/bin/*")
+
+    def test_name_with_separator(self):
+        assert parse_filter("name:org.example:*") == ("name", "org.example:*")
+
+    @pytest.mark.parametrize("spec", ["lib*", "version:1.0", "name:"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_filter(spec)
+
+
+class TestPackageFilter:
+    """Test selection of packages."""
+
+    def test_empty_filter(self):
+        package_filter = PackageFilter()
+        assert not package_filter
+        assert package_filter.matches("anything")
+
+    def test_include(self):
+        package_filter = PackageFilter(include=["purl:pypi", "name:zlib"])
+        assert package_filter.matches("requests", purl="pkg:pypi/requests@2.0")
+        assert package_filter.matches("zlib")
+        assert not package_filter.matches("left-pad", purl="pkg:npm/left-pad@1.0")
+        assert not package_filter.matches("openssl")
+
+    def test_exclude(self):
+        package_filter = PackageFilter(exclude=["type:file", "path:/usr/share/"])
+        assert package_filter.matches("zlib", component_type="LIBRARY")
+        assert not package_filter.matches("readme", component_type="file")
+        assert not package_filter.matches("doc", path="/usr/share/doc")
+
+    def test_exclude_overrides_include(self):
+        package_filter = PackageFilter(include=["name:lib*"], exclude=["name:libtest"])
+        assert package_filter.matches("libfoo")
+        assert not package_filter.matches("libtest")
+
+
+class TestFilterPushdown:
+    """Filtered packages should not be stored by the parsers."""
+
+    def test_cyclonedx_parser(self, write_cyclonedx):
+        sbom = write_cyclonedx("old.json", OLD)
+        parser = CycloneDXParser(package_filter=PackageFilter(["path:/usr/bin/"]))
+        assert list(parser.parse(sbom)) == [("stdlib", "/usr/bin/app")]
+
+    def test_spdx_parser(self, temp_dir):
+        sbom = {
+            "spdxVersion": "SPDX-2.3",
+            "packages": [
+                {"name": "zlib", "primaryPackagePurpose": "LIBRARY"},
+                {"name": "app", "primaryPackagePurpose": "APPLICATION"},
+            ],
+        }
+        filepath = temp_dir / "test.spdx.json"
+        filepath.write_text(json.dumps(sbom))
+        parser = SPDXParser(package_filter=PackageFilter(exclude=["type:application"]))
+        assert list(parser.parse(str(filepath))) == [("zlib", "")]
+
+    def test_process_packages(self):
+        package_list = [
+            {
+                "name": "pyyaml",
+                "version": "6.0",
+                "externalreference": [
+                    ["PACKAGE_MANAGER", "purl", "pkg:pypi/pyyaml@6.0"]
+                ],
+            },
+            {"name": "zlib", "version": "1.0"},
+        ]
+        packages = process_packages(
+            package_list, package_filter=PackageFilter(["purl:pypi"])
+        )
+        assert list(packages) == [("pyyaml", "")]
+
+    def test_excluded_packages_not_interned(self):
+        package_list = [
+            {"name": "pyyaml", "version": "6.0", "licenseconcluded": "MIT"},
+            {"name": "zlib", "version": "1.3", "licenseconcluded": "Zlib"},
+        ]
+        pool = StringPool()
+        process_packages(
+            package_list,
+            string_pool=pool,
+            package_filter=PackageFilter(exclude=["name:zlib"]),
+        )
+        assert sorted(pool.strings) == ["", "6.0", "MIT", "pyyaml"]
+
+
+class TestFilterOptions:
+    """Test the --include and --exclude options."""
+
+    def test_include(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", OLD)
+        new = write_cyclonedx("new.json", NEW)
+        main(["sbomdiff", "--include", "purl:npm", old, new])
+        captured = capsys.readouterr()
+        assert "[VERSION] left-pad" in captured.out
+        assert "PyYAML" not in captured.out
+        assert "stdlib" not in captured.out
+
+    def test_exclude(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", OLD)
+        new = write_cyclonedx("new.json", NEW)
+        main(
+            ["sbomdiff", "--exclude", "path:/usr/bin/", "--exclude", "purl:*", old, new]
+        )
+        captured = capsys.readouterr()
+        assert "[VERSION] stdlib (tool)" in captured.out
+        assert "[VERSION] stdlib (app)" not in captured.out
+        assert "left-pad" not in captured.out
+
+    def test_invalid_filter(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", OLD)
+        new = write_cyclonedx("new.json", NEW)
+        assert main(["sbomdiff", "--include", "version:1.0", old, new]) == -1
+        assert "Invalid filter" in capsys.readouterr().out
@@ -0,0 +1,198 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for dependency graphs and the differences between them."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.graph import DependencyGraph, NodeIndex, dependency_edges, diff_graphs
+from sbomdiff.spdx_parser import SPDXParser
+
+
+@pytest.fixture
+def write_dependencies(write_cyclonedx):
+    """Function which writes a CycloneDX SBOM of app and libraries a, b and c."""
+
+    def write(name, dependencies):
+        return write_cyclonedx(
+            name,
+            [
+                {"bom-ref": ref, "name": f"lib{ref}", "version": "1.0"}
+                for ref in ("a", "b", "c")
+            ],
+            metadata={
+                "component": {"type": "application", "bom-ref": "app", "name": "app"}
+            },
+            dependencies=[
+                {"ref": ref, "dependsOn": depends_on}
+                for ref, depends_on in dependencies.items()
+            ],
+        )
+
+    return write
+
+
+class TestDependencyGraph:
+    """Test the adjacency index and graph comparison."""
+
+    def test_successors(self):
+        graph = DependencyGraph([("a", "b"), ("a", "c"), ("b", "c")])
+        get_id = graph.nodes.get_id
+        assert sorted(graph.successors(get_id("a"))) == [get_id("b"), get_id("c")]
+        assert list(graph.successors(get_id("b"))) == [get_id("c")]
+        assert list(graph.successors(get_id("c"))) == []
+
+    def test_duplicate_edges_ignored(self):
+        graph = DependencyGraph([("a", "b"), ("a", "b")])
+        assert len(graph) == 1
+
+    def test_reachable(self):
+        graph = DependencyGraph([("a", "b"), ("b", "c"), ("c", "a"), ("d", "e")])
+        get_id = graph.nodes.get_id
+        reachable = graph.reachable({get_id("b")})
+        assert sorted(graph.nodes.get_name(n) for n in reachable) == ["a", "b", "c"]
+
+    def test_diff_graphs(self):
+        nodes = NodeIndex()
+        graph1 = DependencyGraph([("app", "a"), ("a", "b"), ("b", "d")], nodes)
+        graph2 = DependencyGraph([("app", "a"), ("a", "c"), ("c", "d")], nodes)
+        result = diff_graphs(graph1, graph2)
+        assert result["added"] == [("a", "c"), ("c", "d")]
+        assert result["removed"] == [("a", "b"), ("b", "d")]
+        assert result["affected"] == ["b", "c", "d"]
+
+    def test_diff_graphs_unchanged(self):
+        nodes = NodeIndex()
+        graph1 = DependencyGraph([("a", "b")], nodes)
+        graph2 = DependencyGraph([("a", "b")], nodes)
+        assert diff_graphs(graph1, graph2) == {
+            "added": [],
+            "removed": [],
+            "affected": [],
+        }
+
+    def test_diff_graphs_requires_shared_nodes(self):
+        with pytest.raises(ValueError):
+            diff_graphs(DependencyGraph([]), DependencyGraph([]))
+
+    def test_dependency_edges(self):
+        relationships = [
+            {"source": "app", "type": "DEPENDS_ON", "target": "a"},
+            {"source": "b", "type": "DEPENDENCY_OF", "target": "a"},
+            {"source": "a", "type": "CONTAINS", "target": "c"},
+            {"source": "sbom-v1", "type": "DESCRIBES", "target": "app"},
+        ]
+        assert list(dependency_edges(relationships)) == [("app", "a"), ("a", "b")]
+
+
+class TestParserDependencies:
+    """Test extraction of dependencies by the parsers."""
+
+    def test_cyclonedx_json(self, write_dependencies):
+        sbom_file = write_dependencies("deps.json", {"app": ["a"], "a": ["b", "c"]})
+        parser = CycloneDXParser()
+        parser.parse(sbom_file)
+        assert sorted(parser.get_dependencies()) == [
+            ("app", "liba"),
+            ("liba", "libb"),
+            ("liba", "libc"),
+        ]
+
+    def test_cyclonedx_xml(self, temp_dir):
+        sbom = """<?xml version="1.0" encoding="UTF-8"?>
+<bom xmlns="http://cyclonedx.org/schema/bom/1.4" version="1">
+  <components>
+    <component type="library" bom-ref="a">
+      <name>liba</name>
+      <version>1.0</version>
+    </component>
+    <component type="library" bom-ref="b">
+      <name>libb</name>
+      <version>1.0</version>
+    </component>
+  </components>
+  <dependencies>
+    <dependency ref="a">
+      <dependency ref="b"/>
+    </dependency>
+  </dependencies>
+</bom>
+"""
+        filepath = temp_dir / "deps.xml"
+        filepath.write_text(sbom)
+        parser = CycloneDXParser()
+        parser.parse(str(filepath))
+        assert parser.get_dependencies() == [("liba", "libb")]
+
+    def test_spdx_json(self, temp_dir):
+        sbom = {
+            "spdxVersion": "SPDX-2.3",
+            "packages": [
+                {"SPDXID": "SPDXRef-a", "name": "liba", "versionInfo": "1.0"},
+                {"SPDXID": "SPDXRef-b", "name": "libb", "versionInfo": "1.0"},
+            ],
+            "relationships": [
+                {
+                    "spdxElementId": "SPDXRef-b",
+                    "relationshipType": "DEPENDENCY_OF",
+                    "relatedSpdxElement": "SPDXRef-a",
+                }
+            ],
+        }
+        filepath = temp_dir / "deps.spdx.json"
+        filepath.write_text(json.dumps(sbom))
+        parser = SPDXParser()
+        parser.parse(str(filepath))
+        assert parser.get_dependencies() == [("liba", "libb")]
+
+    def test_spdx_tag(self, temp_dir):
+        sbom = """SPDXVersion: SPDX-2.3
+PackageName: liba
+SPDXID: SPDXRef-a
+PackageVersion: 1.0
+PackageName: libb
+SPDXID: SPDXRef-b
+PackageVersion: 1.0
+Relationship: SPDXRef-a DEPENDS_ON SPDXRef-b
+"""
+        filepath = temp_dir / "deps.spdx"
+        filepath.write_text(sbom)
+        parser = SPDXParser()
+        parser.parse(str(filepath))
+        assert parser.get_dependencies() == [("liba", "libb")]
+
+
+class TestDependenciesOption:
+    """Test the --dependencies option."""
+
+    def test_dependency_changes_reported(self, write_dependencies, capsys):
+        old = write_dependencies("old.json", {"app": ["a"], "a": ["b"]})
+        new = write_dependencies("new.json", {"app": ["a"], "a": ["c"]})
+        result = main(["sbomdiff", "--dependencies", old, new])
+        captured = capsys.readouterr()
+        assert "[DEPENDENCY] liba -> libb: Dependency removed" in captured.out
+        assert "[DEPENDENCY] liba -> libc: Dependency added" in captured.out
+        assert "[DEPENDENTS] libc: Transitive dependents changed" in captured.out
+        assert result == 1
+
+    def test_dependency_changes_json(self, write_dependencies, capsys):
+        old = write_dependencies("old.json", {"app": ["a"], "a": ["b"]})
+        new = write_dependencies("new.json", {"app": ["a"], "a": ["c"]})
+        main(["sbomdiff", "--dependencies", "-f", "json", old, new])
+        document = json.loads(capsys.readouterr().out)
+        assert document["dependencies"]["added"] == [{"from": "liba", "to": "libc"}]
+        assert document["dependencies"]["removed"] == [
+            {"from": "liba", "to": "libb"}
+        ]
+        assert document["summary"]["new_dependencies"] == 1
+
+    def test_dependencies_not_reported_by_default(self, write_dependencies, capsys):
+        old = write_dependencies("old.json", {"a": ["b"]})
+        new = write_dependencies("new.json", {"a": ["c"]})
+        result = main(["sbomdiff", old, new])
+        captured = capsys.readouterr()
+        assert "[DEPENDENCY]" not in captured.out
+        assert result == 0
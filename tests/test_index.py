@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for SBOM index files."""
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.multimap import Instances
+from sbomdiff.table import PackageTable, encode_table, open_table
+from sbomdiff.versions import UPGRADE
+
+PACKAGES1 = {
+    ("zlib", ""): ["1.2.11", "Zlib", None],
+    ("openssl", "/usr/lib"): ["3.0.2", "Apache-2.0", None],
+    ("bash", ""): ["5.2", "GPL-3.0-or-later", None],
+    ("curl", ""): ["8.0.1", "curl", None],
+    ("stdlib", ""): Instances([["go1.24.1", "BSD", None], ["go1.25.1", "BSD", None]]),
+}
+
+PACKAGES2 = {
+    ("wget", ""): ["1.21", "GPL-3.0-or-later", None],
+    ("zlib", ""): ["1.2.13", "Zlib", None],
+    ("openssl", "/usr/lib"): ["3.0.1", "OpenSSL", None],
+    ("bash", ""): ["5.2", "GPL-3.0-or-later", None],
+    ("stdlib", ""): Instances([["go1.24.2", "BSD", None], ["go1.25.1", "BSD", None]]),
+}
+
+
+@pytest.fixture
+def sboms(write_cyclonedx):
+    common = [{"name": "bash", "version": "5.2", "license": "GPL-3.0-only"}]
+    old = write_cyclonedx(
+        "old.json",
+        [
+            {"name": "zlib", "version": "1.2.11", "license": "Zlib"},
+            *common,
+            {"name": "curl", "version": "8.0.1", "license": "curl"},
+        ],
+    )
+    new = write_cyclonedx(
+        "new.json",
+        [
+            {"name": "zlib", "version": "1.2.13", "license": "Zlib"},
+            *common,
+            {"name": "wget", "version": "1.21", "license": "GPL-3.0-only"},
+        ],
+    )
+    return old, new
+
+
+@pytest.fixture
+def indexes(sboms, temp_dir):
+    filenames = []
+    for sbom, name in zip(sboms, ("old.sbomidx", "new.sbomidx")):
+        filename = str(temp_dir / name)
+        assert main(["sbomdiff", "index", sbom, "-o", filename]) == 0
+        filenames.append(filename)
+    return filenames
+
+
+class TestCompareTables:
+    """Comparing encoded tables should be the same as comparing dictionaries."""
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"exclude_license": True}, {"version_filter": UPGRADE}]
+    )
+    def test_same_records(self, options):
+        sbom_diff = SBOMDiff(**options)
+        expected = list(sbom_diff.compare(PACKAGES1, PACKAGES2))
+        table1 = PackageTable(encode_table(PACKAGES1))
+        table2 = PackageTable(encode_table(PACKAGES2))
+        table_diff = SBOMDiff(**options)
+        assert list(table_diff.compare(table1, table2)) == expected
+        assert table_diff.get_summary() == sbom_diff.get_summary()
+
+    def test_same_counts(self):
+        sbom_diff = SBOMDiff()
+        sbom_diff.count_differences(PACKAGES1, PACKAGES2)
+        table_diff = SBOMDiff()
+        table_diff.count_differences(
+            PackageTable(encode_table(PACKAGES1)), PackageTable(encode_table(PACKAGES2))
+        )
+        assert table_diff.get_summary() == sbom_diff.get_summary()
+
+
+class TestIndexCommand:
+    """Test the index subcommand."""
+
+    def test_index(self, sboms, indexes):
+        packages, _ = parse_sbom(sboms[0])
+        assert dict(open_table(indexes[0]).items()) == packages
+
+    def test_default_filename(self, sboms):
+        assert main(["sbomdiff", "index", sboms[0]]) == 0
+        assert dict(open_table(sboms[0] + ".sbomidx").items())
+
+    def test_missing(self, temp_dir, capsys):
+        assert main(["sbomdiff", "index", str(temp_dir / "missing.json")]) == -1
+        assert "does not exist" in capsys.readouterr().out
+
+
+class TestDiffIndexes:
+    """Test comparing index files."""
+
+    def test_same_output(self, sboms, indexes, capsys):
+        assert main(["sbomdiff", *sboms]) == 1
+        expected = capsys.readouterr().out
+        assert main(["sbomdiff", *indexes]) == 1
+        assert capsys.readouterr().out == expected
+
+    def test_index_and_sbom(self, sboms, indexes, capsys):
+        assert main(["sbomdiff", *sboms]) == 1
+        expected = capsys.readouterr().out
+        assert main(["sbomdiff", indexes[0], sboms[1]]) == 1
+        assert capsys.readouterr().out == expected
+
+    def test_summary_only(self, indexes, capsys):
+        assert main(["sbomdiff", "--summary-only", *indexes]) == 1
+        output = capsys.readouterr().out
+        assert "Version changes:  1" in output
+        assert "New packages:     1" in output
+
+    def test_fail_fast(self, indexes, capsys):
+        assert main(["sbomdiff", "--quiet", "--fail-fast", *indexes]) == 1
+        assert capsys.readouterr().out == ""
+
+    def test_no_differences(self, indexes, temp_dir):
+        copy = temp_dir / "copy.sbomidx"
+        with open(indexes[0], "rb") as f:
+            copy.write_bytes(f.read())
+        assert main(["sbomdiff", indexes[0], str(copy)]) == 0
+
+    def test_dependencies_not_supported(self, indexes, capsys):
+        assert main(["sbomdiff", "--dependencies", *indexes]) == -1
+        assert "index files" in capsys.readouterr().out
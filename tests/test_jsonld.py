@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for streaming the elements of a JSON-LD graph."""
+
+import io
+import json
+
+import pytest
+
+from sbomdiff.jsonld import iter_graph
+
+GRAPH = [
+    {"type": "software_Package", "name": "lib", "software_packageVersion": "1.0"},
+    {"type": "Relationship", "from": "a", "to": ["b", "c"]},
+    12345,
+    "text with \"quotes\" and , [ ] { }",
+]
+
+
+class TestIterGraph:
+    """Test reading the elements of @graph."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+    def test_elements(self, chunk_size):
+        document = json.dumps(
+            {"@context": {"nested": [1, 2]}, "@graph": GRAPH, "after": True}, indent=2
+        )
+        stream = io.StringIO(document)
+        assert list(iter_graph(stream, chunk_size)) == GRAPH
+
+    def test_empty_graph(self):
+        assert list(iter_graph(io.StringIO('{"@graph": []}'))) == []
+
+    def test_no_graph(self):
+        assert list(iter_graph(io.StringIO('{"@context": "x"}'))) == []
+        assert list(iter_graph(io.StringIO("{}"))) == []
+
+    def test_elements_read_lazily(self):
+        stream = io.StringIO('{"@graph": [1, 2, ' + " " * 100000 + "3]}")
+        elements = iter_graph(stream, chunk_size=10)
+        assert next(elements) == 1
+        assert stream.tell() < 100
+
+    def test_large_element(self):
+        element = {"files": [f"file{index}" for index in range(100000)]}
+        stream = io.StringIO(json.dumps({"@graph": [element, 1]}))
+        reads = []
+        read = stream.read
+        stream.read = lambda size: reads.append(size) or read(size)
+        assert list(iter_graph(stream, chunk_size=1024)) == [element, 1]
+        # Each read is twice the size of the last while an element is incomplete
+        assert len(reads) < 20
+
+    def test_invalid_document(self):
+        with pytest.raises(ValueError):
+            list(iter_graph(io.StringIO('{"@graph": [1 2]}')))
+        with pytest.raises(ValueError):
+            list(iter_graph(io.StringIO('{"@graph": [{"truncated": ')))
@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for canonicalisation of license expressions."""
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.license import (
+    canonicalise_license,
+    licenses_equivalent,
+    normalise_license_id,
+)
+
+
+class TestCanonicaliseLicense:
+    """Test the canonical form of license expressions."""
+
+    @pytest.mark.parametrize(
+        "license1, license2",
+        [
+            ("MIT OR Apache-2.0", "Apache-2.0 OR MIT"),
+            ("MIT AND BSD-3-Clause", "(BSD-3-Clause AND MIT)"),
+            ("mit and bsd-3-clause", "MIT AND BSD-3-Clause"),
+            ("A AND (B OR C) AND D", "D AND (C OR B) AND A"),
+            ("A OR (B OR C)", "(A OR B) OR C"),
+            ("MIT OR MIT", "MIT"),
+            ("http://spdx.org/licenses/MIT", "MIT"),
+            ("http://spdx.org/rdf/terms#noassertion", "NOASSERTION"),
+            (
+                "GPL-2.0-only WITH Classpath-exception-2.0 OR MIT",
+                "MIT OR GPL-2.0-only WITH Classpath-exception-2.0",
+            ),
+        ],
+    )
+    def test_equivalent_expressions(self, license1, license2):
+        assert licenses_equivalent(license1, license2)
+
+    @pytest.mark.parametrize(
+        "license1, license2",
+        [
+            ("MIT OR Apache-2.0", "MIT AND Apache-2.0"),
+            ("(A AND B) OR C", "A AND (B OR C)"),
+            ("GPL-2.0-only WITH Classpath-exception-2.0", "GPL-2.0-only"),
+            ("MIT", None),
+        ],
+    )
+    def test_different_expressions(self, license1, license2):
+        assert not licenses_equivalent(license1, license2)
+
+    def test_invalid_expression_normalised(self):
+        """Text which is not an expression should only be normalised."""
+        assert canonicalise_license("Apache  License 2.0") == "APACHE LICENSE 2.0"
+        assert canonicalise_license("(MIT") == "(MIT"
+
+    def test_normalise_license_uri(self):
+        assert normalise_license_id('"http://spdx.org/licenses/Apache-2.0"') == (
+            "APACHE-2.0"
+        )
+
+    def test_canonical_form_is_cached(self):
+        canonicalise_license.cache_clear()
+        canonicalise_license("MIT OR Apache-2.0")
+        canonicalise_license("MIT OR Apache-2.0")
+        assert canonicalise_license.cache_info().hits == 1
+
+
+class TestLicenseComparison:
+    """License differences should be based on the canonical form."""
+
+    def test_reordered_expression_not_reported(self, write_cyclonedx, capsys):
+        old, new = (
+            write_cyclonedx(
+                name,
+                [
+                    {
+                        "name": "example-lib",
+                        "version": "1.0.0",
+                        "licenses": [{"expression": license}],
+                    }
+                ],
+            )
+            for name, license in (
+                ("old.json", "MIT OR Apache-2.0"),
+                ("new.json", "Apache-2.0 OR MIT"),
+            )
+        )
+        result = main(["sbomdiff", old, new])
+        captured = capsys.readouterr()
+        assert "[LICENSE]" not in captured.out
+        assert result == 0
@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for package tables with several instances of a package key."""
+
+import pytest
+
+from sbomdiff import diff
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.multimap import Instances, add_instance, diff_instances, get_instances
+from sbomdiff.spdx_parser import SPDXParser
+
+KEY = ("openssl", "")
+
+
+class TestAddInstance:
+    """Test storing instances in a package table."""
+
+    def test_single_instance_stored_directly(self):
+        packages = {}
+        add_instance(packages, KEY, ["1.0", "MIT", None])
+        assert packages[KEY] == ["1.0", "MIT", None]
+        assert not isinstance(packages[KEY], Instances)
+
+    def test_every_instance_kept(self):
+        packages = {}
+        add_instance(packages, KEY, ["1.0", "MIT", None])
+        add_instance(packages, KEY, ["1.1", "MIT", None])
+        add_instance(packages, KEY, ["1.0", "MIT", None])
+        assert isinstance(packages[KEY], Instances)
+        assert get_instances(packages[KEY]) == [
+            ["1.0", "MIT", None],
+            ["1.1", "MIT", None],
+            ["1.0", "MIT", None],
+        ]
+
+    def test_none_instance_kept(self):
+        packages = {}
+        add_instance(packages, KEY, None)
+        add_instance(packages, KEY, None)
+        add_instance(packages, KEY, "parent")
+        assert get_instances(packages[KEY]) == [None, None, "parent"]
+
+    def test_get_instances_single(self):
+        assert get_instances(["1.0", "MIT", None]) == [["1.0", "MIT", None]]
+
+
+class TestDiffInstances:
+    """Test the multiset difference of instances."""
+
+    def test_common_instances_ignored(self):
+        instances1 = [["1.0", "MIT", None], ["1.1", "MIT", None]]
+        instances2 = [["1.1", "MIT", None], ["1.0", "MIT", None]]
+        assert diff_instances(instances1, instances2) == ([], [])
+
+    def test_duplicate_instances_counted(self):
+        instances1 = [["1.0", "MIT", None], ["1.0", "MIT", None]]
+        instances2 = [["1.0", "MIT", None]]
+        assert diff_instances(instances1, instances2) == (
+            [["1.0", "MIT", None]],
+            [],
+        )
+
+    def test_checksums_compared(self):
+        instances1 = [["1.0", "MIT", [["SHA256", "aa"]]]]
+        instances2 = [["1.0", "MIT", [["SHA256", "bb"]]]]
+        assert diff_instances(instances1, instances2) == (instances1, instances2)
+
+
+class TestMultisetDiff:
+    """Test the differences reported for keys with several instances."""
+
+    def compare(self, packages1, packages2):
+        return list(SBOMDiff().compare(packages1, packages2))
+
+    def test_unchanged_instances(self):
+        packages = {KEY: Instances([["1.0", "MIT", None], ["1.1", "MIT", None]])}
+        assert self.compare(packages, packages) == []
+
+    def test_single_instance_changed(self):
+        packages1 = {KEY: Instances([["1.0", "MIT", None], ["1.1", "MIT", None]])}
+        packages2 = {KEY: Instances([["1.0", "MIT", None], ["1.2", "MIT", None]])}
+        records = self.compare(packages1, packages2)
+        assert len(records) == 1
+        assert records[0]["status"] == "change"
+        assert records[0]["version"]["from"] == "1.1"
+        assert records[0]["version"]["to"] == "1.2"
+
+    def test_instance_added(self):
+        packages1 = {KEY: ["1.0", "MIT", None]}
+        packages2 = {KEY: Instances([["1.0", "MIT", None], ["1.1", "MIT", None]])}
+        sbom_diff = SBOMDiff()
+        records = list(sbom_diff.compare(packages1, packages2))
+        assert [record["status"] for record in records] == ["add"]
+        assert records[0]["version"]["from"] == "1.1"
+        assert sbom_diff.new_packages == 1
+
+    def test_instances_removed(self):
+        packages1 = {KEY: Instances([["1.0", "MIT", None], ["1.1", "MIT", None]])}
+        sbom_diff = SBOMDiff()
+        records = list(sbom_diff.compare(packages1, {}))
+        assert [record["version"]["from"] for record in records] == ["1.0", "1.1"]
+        assert sbom_diff.removed_packages == 2
+
+    def test_license_change_of_instance(self):
+        packages1 = {KEY: Instances([["1.0", "MIT", None], ["1.1", "MIT", None]])}
+        packages2 = {
+            KEY: Instances(
+                [
+                    ["1.0", "Apache-2.0", None],
+                    ["1.2", "MIT", None],
+                    ["1.3", "MIT", None],
+                ]
+            )
+        }
+        records = self.compare(packages1, packages2)
+        assert records[0]["license"] == {"from": "MIT", "to": "Apache-2.0"}
+        assert "version" not in records[0]
+        assert [record["status"] for record in records[1:]] == [
+            "remove",
+            "add",
+            "add",
+        ]
+
+
+class TestParserInstances:
+    """Parsers should keep every instance of a package key."""
+
+    def test_cyclonedx_duplicate_names(self, write_cyclonedx):
+        sbom = write_cyclonedx("sbom.json", [("openssl", "1.0"), ("openssl", "1.1")])
+        packages = CycloneDXParser().parse(sbom)
+        assert get_instances(packages[KEY]) == [
+            ["1.0", "NOT FOUND"],
+            ["1.1", "NOT FOUND"],
+        ]
+
+    def test_spdx_tag_duplicate_names(self, temp_dir):
+        sbom = """SPDXVersion: SPDX-2.3
+PackageName: openssl
+PackageVersion: 1.0
+PackageLicenseConcluded: MIT
+PackageName: openssl
+PackageVersion: 1.1
+PackageLicenseConcluded: MIT
+"""
+        filepath = temp_dir / "sbom.spdx"
+        filepath.write_text(sbom)
+        packages = SPDXParser().parse(str(filepath))
+        assert get_instances(packages[KEY]) == [["1.0", "MIT"], ["1.1", "MIT"]]
+
+
+class TestMergedComponents:
+    """Components which lib4sbom merges should be kept at each location."""
+
+    @pytest.fixture
+    def find_locations(self, monkeypatch):
+        calls = []
+
+        def find_locations(*args):
+            calls.append(args)
+            return original(*args)
+
+        original = diff.find_locations
+        monkeypatch.setattr(diff, "find_locations", find_locations)
+        return calls
+
+    def test_merged_components_located(self, write_cyclonedx, find_locations):
+        sbom = write_cyclonedx(
+            "sbom.json",
+            [
+                {"name": "stdlib", "version": "go1.25.6", "path": "/bin/a"},
+                {"name": "stdlib", "version": "go1.25.6", "path": "/bin/b"},
+            ],
+        )
+        packages, _ = parse_sbom(sbom)
+        assert sorted(packages) == [("stdlib", "/bin/a"), ("stdlib", "/bin/b")]
+        assert len(find_locations) == 1
+
+    def test_not_parsed_again_without_merges(self, write_cyclonedx, find_locations):
+        sbom = write_cyclonedx("sbom.json", [("openssl", "1.0"), ("openssl", "1.1")])
+        packages, _ = parse_sbom(sbom)
+        assert len(get_instances(packages[KEY])) == 2
+        assert find_locations == []
+
+    def test_incomplete_components_ignored(self, write_cyclonedx):
+        sbom = write_cyclonedx(
+            "sbom.json",
+            [
+                {"name": "stdlib", "version": "go1.25.6", "path": "/bin/a"},
+                {"name": "stdlib", "version": "go1.25.6", "path": "/bin/b"},
+                {"version": "1.0"},
+            ],
+        )
+        assert diff.find_locations(sbom) == {
+            ("stdlib", "go1.25.6"): ["/bin/a", "/bin/b"]
+        }
+        # Packages are still read by lib4sbom without an error
+        parse_sbom(sbom)
+        parser = CycloneDXParser(component_types=None)
+        assert parser._get_package_json({"name": "untyped", "version": "1.0"}) is None
@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for comparing package tables using several worker processes."""
+
+import random
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.multimap import Instances
+from sbomdiff.parallel import (
+    parallel_compare,
+    parallel_count,
+    shard_range,
+    shard_tables,
+)
+from sbomdiff.purl import PurlIndex
+from sbomdiff.table import PackageTable, encode_table
+from sbomdiff.versions import UPGRADE
+
+LICENSES = ["MIT", "Apache-2.0", "BSD-3-Clause"]
+
+
+def generate_tables(count):
+    random.seed(4)
+    packages1 = {}
+    packages2 = {}
+    for i in range(count):
+        key = (f"pkg{random.randrange(count * 10)}", f"/usr/bin/binary{i % 7}")
+        packages1[key] = [f"1.{i % 10}.0", random.choice(LICENSES), None]
+        change = random.random()
+        if change < 0.1:
+            continue
+        if change < 0.3:
+            packages2[key] = [f"1.{i % 10}.1", random.choice(LICENSES), None]
+        else:
+            packages2[key] = packages1[key]
+    for i in range(count // 10):
+        packages2[(f"new{i}", "")] = ["1.0.0", "MIT", None]
+    packages1[("stdlib", "")] = Instances(
+        [["go1.24.1", "BSD", None], ["go1.25.1", "BSD", None]]
+    )
+    packages2[("stdlib", "")] = Instances(
+        [["go1.24.2", "BSD", None], ["go1.25.1", "BSD", None], ["go1.26", "BSD", None]]
+    )
+    return packages1, packages2
+
+
+PACKAGES1, PACKAGES2 = generate_tables(500)
+
+
+class TestBuildShard:
+    """Test partitioning package tables into shards."""
+
+    def test_shard_range(self):
+        ranges = [shard_range(10, index, 3) for index in range(3)]
+        assert ranges == [(0, 3), (3, 6), (6, 10)]
+        assert shard_range(0, 0, 2) == (0, 0)
+
+    @pytest.mark.parametrize("encode", [False, True])
+    def test_each_key_in_one_shard(self, encode):
+        tables = (PACKAGES1, PACKAGES2)
+        if encode:
+            tables = [PackageTable(encode_table(table)) for table in tables]
+        shards = [shard_tables(*tables, index, 4) for index in range(4)]
+        assert [key for shard1, _, _ in shards for key in shard1] == list(PACKAGES1)
+        new_keys = [key for key in PACKAGES2 if key not in PACKAGES1]
+        assert [
+            key for shard1, shard2, _ in shards for key in shard2 if key not in shard1
+        ] == new_keys
+        for shard1, shard2, _ in shards:
+            for key in shard1:
+                assert shard2.get(key) == PACKAGES2.get(key)
+        # Keys of the first table, then keys of the second table
+        order = sorted(item for _, _, order in shards for item in order)
+        assert order == list(enumerate(list(PACKAGES1) + list(PACKAGES2)))
+
+
+class TestParallelCompare:
+    """The records and counts should be the same as a single process."""
+
+    @pytest.mark.parametrize("sort", [None, "name", "path", "status"])
+    def test_same_records(self, sort):
+        sbom_diff = SBOMDiff()
+        if sort is None:
+            expected = list(sbom_diff.compare(PACKAGES1, PACKAGES2))
+        else:
+            expected = list(sbom_diff.compare_sorted(PACKAGES1, PACKAGES2, sort))
+        parallel = SBOMDiff()
+        records = list(parallel_compare(parallel, PACKAGES1, PACKAGES2, 3, sort))
+        assert records == expected
+        assert parallel.get_summary() == sbom_diff.get_summary()
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"exclude_license": True}, {"version_filter": UPGRADE}]
+    )
+    def test_same_counts(self, options):
+        sbom_diff = SBOMDiff(**options)
+        sbom_diff.count_differences(PACKAGES1, PACKAGES2)
+        parallel = SBOMDiff(**options)
+        parallel_count(parallel, PACKAGES1, PACKAGES2, 2)
+        assert parallel.get_summary() == sbom_diff.get_summary()
+
+    def test_without_fork(self, monkeypatch):
+        # Tables are shared in memory if they cannot be inherited
+        monkeypatch.setattr(
+            "multiprocessing.get_all_start_methods", lambda: ["spawn"]
+        )
+        expected = list(SBOMDiff().compare(PACKAGES1, PACKAGES2))
+        assert list(parallel_compare(SBOMDiff(), PACKAGES1, PACKAGES2, 2)) == expected
+
+    def test_purl_index(self):
+        purl_index = PurlIndex()
+        key = purl_index.get_key("zlib", "", "pkg:generic/zlib@1.2.11")
+        packages1 = {key: ["1.2.11", "Zlib", None]}
+        packages2 = {key: ["1.2.13", "Zlib", None]}
+        records = list(
+            parallel_compare(SBOMDiff(purl_index=purl_index), packages1, packages2, 2)
+        )
+        assert records == list(
+            SBOMDiff(purl_index=purl_index).compare(packages1, packages2)
+        )
+        assert records[0]["package"] == "zlib"
+
+
+class TestJobsOption:
+    """Test the --jobs option."""
+
+    @pytest.fixture
+    def sboms(self, write_cyclonedx):
+        components = [(f"pkg{i}", "1.0") for i in range(20)]
+        return [
+            write_cyclonedx(name, components + [("zlib", version)])
+            for name, version in (("old.json", "1.2.11"), ("new.json", "1.2.13"))
+        ]
+
+    def test_same_output(self, sboms, capsys):
+        assert main(["sbomdiff", *sboms]) == 1
+        expected = capsys.readouterr().out
+        assert main(["sbomdiff", "--jobs", "2", *sboms]) == 1
+        assert capsys.readouterr().out == expected
+
+    @pytest.mark.parametrize("jobs", ["0", "-1"])
+    def test_invalid(self, sboms, jobs, capsys):
+        assert main(["sbomdiff", "--jobs", jobs, *sboms]) == -1
+        assert "jobs" in capsys.readouterr().out
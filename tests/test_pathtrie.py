@@ -0,0 +1,187 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for grouping differences by package location."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.pathtrie import PathTrie, classify, format_counts, split_path
+
+RECORDS = [
+    {
+        "package": "stdlib",
+        "path": "/usr/bin/service-a",
+        "status": "change",
+        "version": {"from": "GO1.24.1", "to": "GO1.24.2", "direction": "upgrade"},
+    },
+    {
+        "package": "golang.org/x/net",
+        "path": "/usr/bin/service-a",
+        "status": "change",
+        "version": {"from": "V0.20.0", "to": "V0.21.0", "direction": "upgrade"},
+    },
+    {
+        "package": "golang.org/x/text",
+        "path": "/usr/bin/service-a",
+        "status": "remove",
+        "version": {"from": "V0.14.0"},
+    },
+    {
+        "package": "stdlib",
+        "path": "/usr/bin/service-b",
+        "status": "change",
+        "version": {"from": "GO1.24.2", "to": "GO1.24.1", "direction": "downgrade"},
+    },
+    {
+        "package": "libc",
+        "path": "/var/lib/dpkg/status",
+        "status": "change",
+        "license": {"from": "GPL-2.0", "to": "GPL-2.0-only"},
+    },
+    {"package": "zlib", "status": "add", "version": {"from": "1.3"}},
+]
+
+
+@pytest.fixture
+def path_trie():
+    trie = PathTrie()
+    trie.add_records(RECORDS)
+    return trie
+
+
+class TestClassify:
+    """Test the category of each difference record."""
+
+    def test_categories(self):
+        assert [classify(record) for record in RECORDS] == [
+            "upgraded",
+            "upgraded",
+            "removed",
+            "downgraded",
+            "changed",
+            "added",
+        ]
+
+    def test_rename(self):
+        assert classify({"package": "b", "status": "rename"}) == "renamed"
+
+    def test_format_counts(self):
+        assert format_counts({"removed": 1, "upgraded": 3}) == "3 upgraded, 1 removed"
+
+
+class TestSplitPath:
+    """Test splitting paths into components."""
+
+    @pytest.mark.parametrize(
+        "path,components",
+        [
+            ("/usr/bin/app", ["/usr", "bin", "app"]),
+            ("app/node_modules", ["app", "node_modules"]),
+            ("//usr//bin/", ["/usr", "bin"]),
+            ("", []),
+        ],
+    )
+    def test_split(self, path, components):
+        assert split_path(path) == components
+
+
+class TestPathTrie:
+    """Test the counts of differences for each path prefix."""
+
+    def test_locations(self, path_trie):
+        assert list(path_trie.groups()) == [
+            ("", {"added": 1}),
+            ("/usr/bin/service-a", {"upgraded": 2, "removed": 1}),
+            ("/usr/bin/service-b", {"downgraded": 1}),
+            ("/var/lib/dpkg/status", {"changed": 1}),
+        ]
+
+    def test_depth(self, path_trie):
+        assert list(path_trie.groups(1)) == [
+            ("", {"added": 1}),
+            ("/usr", {"upgraded": 2, "removed": 1, "downgraded": 1}),
+            ("/var", {"changed": 1}),
+        ]
+        assert list(path_trie.groups(0)) == [("", path_trie.get_counts())]
+
+    def test_depth_below_location(self, path_trie):
+        groups = dict(path_trie.groups(4))
+        assert groups["/usr/bin/service-a"] == {"upgraded": 2, "removed": 1}
+        assert groups["/var/lib/dpkg/status"] == {"changed": 1}
+
+    def test_get_counts(self, path_trie):
+        assert path_trie.get_counts("/usr/bin") == {
+            "upgraded": 2,
+            "removed": 1,
+            "downgraded": 1,
+        }
+        assert sum(path_trie.get_counts().values()) == len(RECORDS)
+        assert path_trie.get_counts("/opt") == {}
+
+    def test_directory_and_location(self):
+        trie = PathTrie()
+        trie.add("/app", "added")
+        trie.add("/app/bin/tool", "removed")
+        assert list(trie.groups()) == [
+            ("/app", {"added": 1}),
+            ("/app/bin/tool", {"removed": 1}),
+        ]
+        assert list(trie.groups(1)) == [("/app", {"added": 1, "removed": 1})]
+
+    def test_collect(self):
+        trie = PathTrie()
+        assert list(trie.collect(RECORDS)) == RECORDS
+        assert sum(trie.get_counts().values()) == len(RECORDS)
+
+    def test_summary_lines(self, path_trie):
+        lines = path_trie.summary_lines()
+        assert "/usr/bin/service-a: 2 upgraded, 1 removed" in lines
+        assert "(no path): 1 added" in lines
+
+    def test_generate_document(self, path_trie):
+        document = path_trie.generate_document(2)
+        assert document["/usr/bin"] == {"upgraded": 2, "downgraded": 1, "removed": 1}
+        assert document["(no path)"] == {"added": 1}
+
+
+class TestGroupByPath:
+    """Test reporting differences by path from the command line."""
+
+    def test_text(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        args = [cyclonedx_version_change_old, cyclonedx_version_change_new]
+        assert main(["sbomdiff", "--group-by-path", *args]) == 1
+        output = capsys.readouterr().out
+        assert "[VERSION] stdlib (myapp)" in output
+        assert "/app/bin/myapp: 1 upgraded" in output
+        assert "/var/lib/dpkg/status: 1 upgraded" in output
+
+    def test_summary_only_depth(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        args = [cyclonedx_version_change_old, cyclonedx_version_change_new]
+        options = ["--summary-only", "--group-by-path", "--path-depth", "1"]
+        assert main(["sbomdiff", *options, *args]) == 1
+        output = capsys.readouterr().out
+        assert "[VERSION]" not in output
+        assert "/app: 1 upgraded" in output
+        assert "Version changes:  2" in output
+
+    def test_json(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        args = [cyclonedx_version_change_old, cyclonedx_version_change_new]
+        assert main(["sbomdiff", "-f", "json", "--group-by-path", *args]) == 1
+        output = json.loads(capsys.readouterr().out)
+        assert output["paths"]["/app/bin/myapp"] == {"upgraded": 1}
+        assert len(output["differences"]) == 2
+
+    def test_depth_requires_group(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        args = [cyclonedx_version_change_old, cyclonedx_version_change_new]
+        assert main(["sbomdiff", "--path-depth", "2", *args]) == -1
+        assert "--group-by-path" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for identification of location properties."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.properties import PathPropertyClassifier
+
+
+class TestPathPropertyClassifier:
+    """Test classification of property names."""
+
+    @pytest.mark.parametrize(
+        "property_name, expected",
+        [
+            ("syft:location:0:path", True),
+            ("Syft:Location:0:Path", True),
+            ("custom:path", True),
+            ("syft:location:0:layerID", False),
+            ("syft:package:type", False),
+            ("aquasecurity:trivy:FilePath", False),
+            ("SrcFile", False),
+        ],
+    )
+    def test_default_rules(self, property_name, expected):
+        assert PathPropertyClassifier().is_path(property_name) is expected
+
+    def test_tool_properties(self):
+        classifier = PathPropertyClassifier(["trivy", "cdxgen"])
+        assert classifier.is_path("aquasecurity:trivy:FilePath")
+        assert classifier.is_path("SrcFile")
+
+    def test_property_names(self):
+        classifier = PathPropertyClassifier(["acme:binary"])
+        assert classifier.is_path("ACME:Binary")
+        assert not classifier.is_path("acme:version")
+
+    def test_verdict_cached(self):
+        classifier = PathPropertyClassifier()
+        classifier.is_path("syft:package:type")
+        assert classifier._verdicts == {"syft:package:type": False}
+
+    def test_find_path(self):
+        classifier = PathPropertyClassifier()
+        properties = [
+            ("syft:package:type", "go-module"),
+            ("syft:location:0:path", "/usr/bin/app"),
+            ("syft:location:1:path", "/usr/bin/other"),
+        ]
+        assert classifier.find_path(properties) == "/usr/bin/app"
+        assert classifier.find_path([("syft:package:type", "go-module")]) == ""
+
+
+class TestToolProperties:
+    """Test location properties of other tools."""
+
+    @pytest.fixture
+    def trivy_sbom(self, write_cyclonedx):
+        return write_cyclonedx(
+            "trivy.json",
+            [
+                {
+                    "name": "stdlib",
+                    "version": version,
+                    "properties": [
+                        {"name": "aquasecurity:trivy:FilePath", "value": path},
+                    ],
+                }
+                for version, path in [
+                    ("go1.25.6", "usr/bin/agent"),
+                    ("go1.24.2", "usr/bin/gcs"),
+                ]
+            ],
+        )
+
+    def test_parser_uses_classifier(self, trivy_sbom):
+        packages = CycloneDXParser().parse(trivy_sbom)
+        assert list(packages) == [("stdlib", "")]
+        classifier = PathPropertyClassifier(["trivy"])
+        packages = CycloneDXParser(path_classifier=classifier).parse(trivy_sbom)
+        assert sorted(packages) == [
+            ("stdlib", "usr/bin/agent"),
+            ("stdlib", "usr/bin/gcs"),
+        ]
+
+    def test_path_property_option(self, trivy_sbom, temp_dir, capsys):
+        with open(trivy_sbom) as f:
+            sbom = json.load(f)
+        sbom["components"][1]["version"] = "go1.25.7"
+        new_file = temp_dir / "trivy_new.json"
+        new_file.write_text(json.dumps(sbom))
+        main(["sbomdiff", "--path-property", "trivy", trivy_sbom, str(new_file)])
+        captured = capsys.readouterr()
+        assert "[VERSION] stdlib (gcs): Version changed" in captured.out
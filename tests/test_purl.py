@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for matching packages using package URLs."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.purl import PurlIndex, canonical_purl
+from sbomdiff.spdx_parser import SPDXParser
+
+
+class TestCanonicalPurl:
+    """Test the canonical form of package URLs."""
+
+    @pytest.mark.parametrize(
+        "purl, expected",
+        [
+            ("pkg:npm/lodash@4.17.21", "pkg:npm/lodash"),
+            ("pkg:npm/%40angular/core@16.0.0", "pkg:npm/@angular/core"),
+            ("pkg:PyPI/Django_Rest@3.0", "pkg:pypi/django-rest"),
+            ("pkg:maven/org.Apache/Commons@1.0", "pkg:maven/org.Apache/Commons"),
+            (
+                "pkg:deb/debian/curl@7.50.3-1?distro=jessie&arch=i386",
+                "pkg:deb/debian/curl?arch=i386&distro=jessie",
+            ),
+            (
+                "pkg:golang/github.com/gorilla/context@v1.1#api",
+                "pkg:golang/github.com/gorilla/context",
+            ),
+            (
+                "pkg:github/Package-URL/purl-spec@244fd47#everybody",
+                "pkg:github/package-url/purl-spec",
+            ),
+            ("pkg:generic/openssl?download_url=", "pkg:generic/openssl"),
+        ],
+    )
+    def test_canonical_form(self, purl, expected):
+        assert canonical_purl(purl) == expected
+
+    def test_version_ignored(self):
+        assert canonical_purl("pkg:pypi/rich@11.0.0") == canonical_purl(
+            "pkg:pypi/rich@12.5.1"
+        )
+
+    @pytest.mark.parametrize("purl", ["", "lodash", "pkg:npm", None])
+    def test_invalid_purl(self, purl):
+        assert canonical_purl(purl) is None
+
+    def test_canonical_purl_interned(self):
+        purl1 = canonical_purl("pkg:pypi/rich@11.0.0")
+        purl2 = canonical_purl("pkg:pypi/Rich@12.5.1")
+        assert purl1 is purl2
+
+
+class TestPurlIndex:
+    """Test package keys created by the purl index."""
+
+    def test_key_uses_purl(self):
+        index = PurlIndex()
+        key = index.get_key("lodash", "", "pkg:npm/lodash@1.0")
+        assert key == ("pkg:npm/lodash", "")
+        assert index.get_name(key[0]) == "lodash"
+        assert index.get_purl(key[0]) == "pkg:npm/lodash"
+
+    def test_retain(self):
+        index = PurlIndex()
+        index.get_key("lodash", "", "pkg:npm/lodash@1.0")
+        index.get_key("requests", "", "pkg:pypi/requests@2.0")
+        index.retain(["pkg:npm/lodash", "zlib"])
+        assert index.names == {"pkg:npm/lodash": "lodash"}
+
+    def test_key_falls_back_to_name(self):
+        index = PurlIndex()
+        key = index.get_key("lodash", "/app", None)
+        assert key == ("lodash", "/app")
+        assert index.get_name("lodash") == "lodash"
+        assert index.get_purl("lodash") is None
+
+    def test_parsers_use_purl(self, write_cyclonedx):
+        sbom_file = write_cyclonedx(
+            "sbom.json",
+            [
+                {"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"},
+                {"name": "lodash", "version": "2.0", "purl": "pkg:pypi/lodash@2.0"},
+            ],
+        )
+        assert len(CycloneDXParser().parse(sbom_file)) == 1
+        packages = CycloneDXParser(purl_index=PurlIndex()).parse(sbom_file)
+        assert packages == {
+            ("pkg:npm/lodash", ""): ["1.0", "NOT FOUND"],
+            ("pkg:pypi/lodash", ""): ["2.0", "NOT FOUND"],
+        }
+
+    def test_spdx_parser_uses_purl(self, temp_dir):
+        sbom = {
+            "spdxVersion": "SPDX-2.3",
+            "packages": [
+                {
+                    "SPDXID": "SPDXRef-a",
+                    "name": "lodash",
+                    "versionInfo": "1.0",
+                    "externalRefs": [
+                        {
+                            "referenceCategory": "PACKAGE-MANAGER",
+                            "referenceType": "purl",
+                            "referenceLocator": "pkg:npm/lodash@1.0",
+                        }
+                    ],
+                },
+                {"SPDXID": "SPDXRef-b", "name": "other", "versionInfo": "1.0"},
+            ],
+        }
+        filepath = temp_dir / "sbom.spdx.json"
+        filepath.write_text(json.dumps(sbom))
+        packages = SPDXParser(purl_index=PurlIndex()).parse(str(filepath))
+        assert sorted(packages) == [("other", ""), ("pkg:npm/lodash", "")]
+
+
+class TestMatchOption:
+    """Test the --match option."""
+
+    def test_same_name_different_ecosystems(self, write_cyclonedx, capsys):
+        old = write_cyclonedx(
+            "old.json",
+            [
+                {"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"},
+                {"name": "lodash", "version": "2.0", "purl": "pkg:pypi/lodash@2.0"},
+                ("nopurl", "1.0"),
+            ],
+        )
+        new = write_cyclonedx(
+            "new.json",
+            [
+                {"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"},
+                {"name": "lodash", "version": "2.1", "purl": "pkg:pypi/lodash@2.1"},
+                ("nopurl", "1.1"),
+            ],
+        )
+        result = main(["sbomdiff", "--match", "purl", "-f", "json", old, new])
+        document = json.loads(capsys.readouterr().out)
+        assert document["differences"] == [
+            {
+                "package": "lodash",
+                "purl": "pkg:pypi/lodash",
+                "status": "change",
+                "version": {"from": "2.0", "to": "2.1", "direction": "upgrade"},
+            },
+            {
+                "package": "nopurl",
+                "status": "change",
+                "version": {"from": "1.0", "to": "1.1", "direction": "upgrade"},
+            },
+        ]
+        assert result == 1
+
+    def test_name_match_by_default(self, write_cyclonedx, capsys):
+        old = write_cyclonedx(
+            "old.json",
+            [
+                {"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"},
+                {"name": "lodash", "version": "2.0", "purl": "pkg:pypi/lodash@2.0"},
+            ],
+        )
+        new = write_cyclonedx(
+            "new.json",
+            [
+                {"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"},
+                {"name": "lodash", "version": "2.1", "purl": "pkg:pypi/lodash@2.1"},
+            ],
+        )
+        main(["sbomdiff", old, new])
+        captured = capsys.readouterr()
+        assert "[VERSION] lodash: Version changed from 2.0 to 2.1" in captured.out
+
+    def test_text_output_includes_purl(self, write_cyclonedx, capsys):
+        old = write_cyclonedx(
+            "old.json",
+            [{"name": "lodash", "version": "1.0", "purl": "pkg:npm/lodash@1.0"}],
+        )
+        new = write_cyclonedx(
+            "new.json",
+            [{"name": "lodash", "version": "1.1", "purl": "pkg:npm/lodash@1.1"}],
+        )
+        main(["sbomdiff", "--match", "purl", old, new])
+        captured = capsys.readouterr()
+        assert "[VERSION] lodash [pkg:npm/lodash]: Version changed" in captured.out
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for detection of renamed packages."""
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.rename import RenameIndex, match_renames, normalise_name
+
+
+class TestNormaliseName:
+    """Test normalisation of package names."""
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("PyYAML", "pyyaml"),
+            ("requests_oauthlib", "requests-oauthlib"),
+            ("zope.interface", "zope-interface"),
+            ("@babel/core", "core"),
+            ("org.apache.commons:commons-lang3", "commons-lang3"),
+            ("github.com/Sirupsen/logrus", "logrus"),
+        ],
+    )
+    def test_normalise(self, name, expected):
+        assert normalise_name(name) == expected
+
+
+class TestMatchRenames:
+    """Test matching removed and added packages."""
+
+    def test_same_normalised_name(self):
+        matches = match_renames([("", "PyYAML")], [("", "pyyaml")])
+        assert matches == [(0, 0, 1.0)]
+
+    def test_similar_name(self):
+        matches = match_renames([("", "python-dateutil")], [("", "python-dateutils")])
+        assert len(matches) == 1
+        assert matches[0][2] == pytest.approx(0.91, abs=0.01)
+
+    def test_dissimilar_names_not_matched(self):
+        assert match_renames([("", "openssl")], [("", "zlib")]) == []
+
+    def test_different_paths_not_matched(self):
+        assert match_renames([("/bin/a", "PyYAML")], [("/bin/b", "pyyaml")]) == []
+
+    def test_same_name_not_matched(self):
+        assert match_renames([("", "zlib")], [("", "zlib")]) == []
+
+    def test_each_package_matched_once(self):
+        matches = match_renames(
+            [("", "foo_bar"), ("", "foo-bar")], [("", "Foo-Bar"), ("", "unrelated")]
+        )
+        assert matches == [(0, 0, 1.0)]
+
+    def test_most_similar_matched(self):
+        matches = match_renames(
+            [("", "libfoobar")], [("", "libfoobaz"), ("", "libfoobar2")]
+        )
+        assert [added for _, added, _ in matches] == [1]
+
+    def test_common_trigrams_not_used(self):
+        index = RenameIndex()
+        for number in range(300):
+            index.add("", f"lib{number}")
+        assert index.candidates("", "libx") == []
+
+
+class TestDetectRenames:
+    """Test rename records reported by SBOMDiff."""
+
+    def test_rename_record(self):
+        packages1 = {
+            ("PyYAML", ""): ["6.0", "MIT", None],
+            ("zlib", ""): ["1.0", "", None],
+        }
+        packages2 = {("pyyaml", ""): ["6.0.1", "MIT", None]}
+        sbom_diff = SBOMDiff()
+        records = sbom_diff.detect_renames(sbom_diff.compare(packages1, packages2))
+        assert records == [
+            {
+                "package": "PyYAML",
+                "status": "rename",
+                "name": {"from": "PyYAML", "to": "pyyaml", "similarity": 1.0},
+                "version": {"from": "6.0", "to": "6.0.1"},
+            },
+            {"package": "zlib", "status": "remove", "version": {"from": "1.0"}},
+        ]
+        assert sbom_diff.renamed_packages == 1
+        assert sbom_diff.removed_packages == 1
+        assert sbom_diff.new_packages == 0
+        assert sbom_diff.get_summary()["renamed_packages"] == 1
+
+    def test_not_reported_by_default(self):
+        sbom_diff = SBOMDiff()
+        list(sbom_diff.compare({}, {}))
+        assert "renamed_packages" not in sbom_diff.get_summary()
+
+
+class TestRenamesOption:
+    """Test the --renames option."""
+
+    def test_renamed_package(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", [("requests_oauthlib", "1.3")])
+        new = write_cyclonedx("new.json", [("requests-oauthlib", "1.3.1")])
+        assert main(["sbomdiff", "--renames", old, new]) == 1
+        captured = capsys.readouterr()
+        assert (
+            "[RENAMED] requests_oauthlib: Renamed to requests-oauthlib "
+            "(Version 1.3 to 1.3.1) (Similarity 1.00)"
+        ) in captured.out
+        assert "Renamed packages: 1" in captured.out
+        assert "[REMOVED]" not in captured.out
+        assert "[ADDED  ]" not in captured.out
+
+    def test_without_option(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", [("requests_oauthlib", "1.3")])
+        new = write_cyclonedx("new.json", [("requests-oauthlib", "1.3")])
+        main(["sbomdiff", old, new])
+        captured = capsys.readouterr()
+        assert "[REMOVED] requests_oauthlib" in captured.out
+        assert "Renamed packages" not in captured.out
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for buffered rendering of text output."""
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff, format_record, parse_sbom
+from sbomdiff.render import TextRenderer
+
+
+def expected_output(file1, file2):
+    # Output produced by writing each line separately
+    packages1, _ = parse_sbom(file1)
+    packages2, _ = parse_sbom(file2)
+    sbom_diff = SBOMDiff()
+    lines = []
+    for record in sbom_diff.compare(packages1, packages2):
+        lines.extend(format_record(record))
+    lines.extend(sbom_diff.summary_lines())
+    return "".join(f"{line}\n" for line in lines)
+
+
+class TestTextRenderer:
+    """Test the buffered text renderer."""
+
+    def test_lines_buffered(self, capsys):
+        renderer = TextRenderer(buffer_size=1024)
+        renderer.write_line("first")
+        renderer.write_line("second")
+        assert capsys.readouterr().out == ""
+        renderer.close()
+        assert capsys.readouterr().out == "first\nsecond\n"
+
+    def test_flushed_in_chunks(self, capsys):
+        renderer = TextRenderer(buffer_size=10)
+        renderer.write_lines(["line1", "line2", "line3"])
+        assert capsys.readouterr().out == "line1\nline2\n"
+        renderer.close()
+        assert capsys.readouterr().out == "line3\n"
+
+    def test_output_file(self, temp_dir):
+        filename = temp_dir / "output.txt"
+        renderer = TextRenderer(str(filename))
+        renderer.write_lines(["line1", "\nSummary\n-------"])
+        renderer.close()
+        assert filename.read_text() == "line1\n\nSummary\n-------\n"
+
+    def test_missing_directory_uses_console(self, temp_dir, capsys):
+        renderer = TextRenderer(str(temp_dir / "missing" / "output.txt"))
+        renderer.write_line("line1")
+        renderer.close()
+        assert capsys.readouterr().out == "line1\n"
+
+
+class TestTextOutput:
+    """Text output should be identical to writing each line."""
+
+    def test_stdout(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        expected = expected_output(
+            cyclonedx_version_change_old, cyclonedx_version_change_new
+        )
+        main(["sbomdiff", cyclonedx_version_change_old, cyclonedx_version_change_new])
+        assert capsys.readouterr().out == expected
+
+    def test_output_file(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, temp_dir
+    ):
+        expected = expected_output(
+            cyclonedx_version_change_old, cyclonedx_version_change_new
+        )
+        filename = temp_dir / "output.txt"
+        main(
+            [
+                "sbomdiff",
+                "-o",
+                str(filename),
+                cyclonedx_version_change_old,
+                cyclonedx_version_change_new,
+            ]
+        )
+        assert filename.read_text() == expected
@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the long running diff service."""
+
+import json
+import socket
+import threading
+import urllib.request
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.server import DiffService, PackageCache, create_server, is_loopback
+
+
+class TestPackageCache:
+    """Test the memory bounded LRU cache."""
+
+    def test_get_returns_cached_value(self):
+        """Should return a previously stored entry."""
+        cache = PackageCache(max_bytes=100)
+        cache.put("a", {"pkg": 1}, 10)
+        assert cache.get("a") == {"pkg": 1}
+        assert cache.get("b") is None
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Should evict the least recently used entry when full."""
+        cache = PackageCache(max_bytes=25)
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        # Access a so that b becomes least recently used
+        cache.get("a")
+        cache.put("c", 3, 10)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats()["size"] == 20
+
+    def test_oversized_entry_not_cached(self):
+        """Should not cache an entry larger than the cache."""
+        cache = PackageCache(max_bytes=5)
+        cache.put("a", 1, 10)
+        assert cache.get("a") is None
+
+
+class TestDiffService:
+    """Test processing of diff requests."""
+
+    def test_diff_matches_json_output(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, temp_dir
+    ):
+        """Should return the same document as --format json."""
+        output_file = str(temp_dir / "output.json")
+        main(
+            [
+                "sbomdiff",
+                "-f",
+                "json",
+                "-o",
+                output_file,
+                cyclonedx_version_change_old,
+                cyclonedx_version_change_new,
+            ]
+        )
+        with open(output_file) as f:
+            expected = json.load(f)
+
+        service = DiffService()
+        document = service.diff(
+            {
+                "file1": cyclonedx_version_change_old,
+                "file2": cyclonedx_version_change_new,
+            }
+        )
+        assert document == expected
+
+    def test_diff_uploaded_content(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        """Should accept SBOM content in the request."""
+        service = DiffService()
+        with open(cyclonedx_version_change_old) as f:
+            content1 = f.read()
+        with open(cyclonedx_version_change_new) as f:
+            content2 = f.read()
+        document = service.diff(
+            {"content1": content1, "name1": "old.json", "content2": content2}
+        )
+        assert document["file_1"] == "old.json"
+        assert document["summary"]["version_changes"] == 2
+
+    def test_same_content_parsed_once(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        """Should reuse the parsed package table for repeated requests."""
+        service = DiffService()
+        request = {
+            "file1": cyclonedx_version_change_old,
+            "file2": cyclonedx_version_change_new,
+        }
+        service.diff(request)
+        service.diff(request)
+        stats = service.cache.get_stats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+
+    def test_missing_sbom_rejected(self, cyclonedx_single_package):
+        """Should reject a request which does not identify both SBOMs."""
+        service = DiffService()
+        with pytest.raises(ValueError):
+            service.diff({"file1": cyclonedx_single_package})
+
+
+class TestDiffServer:
+    """Test the HTTP interface."""
+
+    def test_http_diff_request(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        """Should respond to a diff request with the difference document."""
+        server = create_server(DiffService(), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address
+            request = urllib.request.Request(
+                f"http://{host}:{port}/diff",
+                data=json.dumps(
+                    {
+                        "file1": cyclonedx_version_change_old,
+                        "file2": cyclonedx_version_change_new,
+                    }
+                ).encode("utf-8"),
+                method="POST",
+            )
+            with urllib.request.urlopen(request) as response:
+                document = json.load(response)
+            assert document["summary"]["version_changes"] == 2
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_invalid_content_length(self):
+        """Should reject a request with an invalid Content-Length."""
+        server = create_server(DiffService(), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address
+            with socket.create_connection((host, port)) as connection:
+                connection.sendall(
+                    b"POST /diff HTTP/1.1\r\nHost: localhost\r\n"
+                    b"Content-Length: abc\r\n\r\n"
+                )
+                response = connection.makefile("rb").readline()
+            assert response.split()[1] == b"400"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    @pytest.mark.parametrize(
+        "host, expected",
+        [
+            ("127.0.0.1", True),
+            ("::1", True),
+            ("localhost", True),
+            ("0.0.0.0", False),
+            ("192.168.1.10", False),
+            ("example.com", False),
+        ],
+    )
+    def test_is_loopback(self, host, expected):
+        assert is_loopback(host) == expected
+
+    def test_remote_host_refused(self, capsys):
+        assert main(["sbomdiff", "serve", "--host", "0.0.0.0"]) == -1
+        assert "not a loopback address" in capsys.readouterr().out
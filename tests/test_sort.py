@@ -0,0 +1,135 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for deterministic ordering of differences."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SORT_KEYS, SBOMDiff, merge_keys
+from sbomdiff.multimap import Instances
+
+OLD = [
+    {"name": "zlib", "version": "1.2.11"},
+    {"name": "stdlib", "version": "go1.24.2", "path": "/usr/bin/b-app"},
+    {"name": "stdlib", "version": "go1.25.6", "path": "/usr/bin/a-app"},
+    {"name": "openssl", "version": "3.0.1"},
+    {"name": "bash", "version": "5.1"},
+]
+
+NEW = [
+    {"name": "curl", "version": "8.0.1"},
+    {"name": "stdlib", "version": "go1.25.7", "path": "/usr/bin/a-app"},
+    {"name": "zlib", "version": "1.2.13"},
+    {"name": "stdlib", "version": "go1.24.2", "path": "/usr/bin/b-app"},
+    {"name": "bash", "version": "5.1"},
+]
+
+
+class TestMergeKeys:
+    """Test merging the sorted keys of two package tables."""
+
+    def test_each_key_generated_once(self):
+        packages1 = {("b", ""): 1, ("a", ""): 1, ("d", ""): 1}
+        packages2 = {("c", ""): 1, ("b", ""): 1, ("a", ""): 1}
+        assert list(merge_keys(packages1, packages2, SORT_KEYS["name"])) == [
+            (("a", ""), True, True),
+            (("b", ""), True, True),
+            (("c", ""), False, True),
+            (("d", ""), True, False),
+        ]
+
+    def test_sort_by_path(self):
+        packages = {("a", "/z"): 1, ("b", "/y"): 1, ("c", ""): 1}
+        keys = [key for key, _, _ in merge_keys(packages, {}, SORT_KEYS["path"])]
+        assert keys == [("c", ""), ("b", "/y"), ("a", "/z")]
+
+
+class TestCompareSorted:
+    """Test the order of sorted differences."""
+
+    def records(self, sort):
+        packages1 = {
+            ("zlib", ""): ["1.0", "MIT", None],
+            ("bash", ""): ["1.0", "MIT", None],
+            ("attr", ""): ["1.0", "MIT", None],
+        }
+        packages2 = {
+            ("curl", ""): ["1.0", "MIT", None],
+            ("zlib", ""): ["1.1", "MIT", None],
+            ("attr", ""): ["1.0", "MIT", None],
+        }
+        return list(SBOMDiff().compare_sorted(packages1, packages2, sort))
+
+    def test_sort_by_name(self):
+        records = self.records("name")
+        assert [record["package"] for record in records] == ["bash", "curl", "zlib"]
+
+    def test_sort_by_status(self):
+        records = self.records("status")
+        assert [(record["status"], record["package"]) for record in records] == [
+            ("add", "curl"),
+            ("change", "zlib"),
+            ("remove", "bash"),
+        ]
+
+    def test_sort_by_status_merges_once(self, monkeypatch):
+        calls = []
+
+        def counted_merge_keys(*args):
+            calls.append(args)
+            return merge_keys(*args)
+
+        monkeypatch.setattr("sbomdiff.diff.merge_keys", counted_merge_keys)
+        self.records("status")
+        assert len(calls) == 1
+
+    def test_summary_counts(self):
+        sbom_diff = SBOMDiff()
+        packages1 = {("a", ""): ["1.0", "MIT", None]}
+        packages2 = {("b", ""): ["1.0", "MIT", None]}
+        list(sbom_diff.compare_sorted(packages1, packages2, "status"))
+        assert sbom_diff.new_packages == 1
+        assert sbom_diff.removed_packages == 1
+
+    def test_instances_in_deterministic_order(self):
+        instances1 = [["1.0", "MIT", None], ["2.0", "MIT", None]]
+        instances2 = [["3.0", "MIT", None], ["4.0", "MIT", None]]
+        packages1 = {("a", ""): Instances(instances1)}
+        packages2 = {("a", ""): Instances(instances2)}
+        reordered1 = {("a", ""): Instances(reversed(instances1))}
+        reordered2 = {("a", ""): Instances(reversed(instances2))}
+        assert list(SBOMDiff().compare_sorted(packages1, packages2)) == list(
+            SBOMDiff().compare_sorted(reordered1, reordered2)
+        )
+
+
+class TestSortOption:
+    """Re-ordered SBOMs should produce identical reports."""
+
+    @pytest.mark.parametrize("sort", ["name", "path", "status"])
+    def test_reordered_sboms(self, sort, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", OLD)
+        new = write_cyclonedx("new.json", NEW)
+        old_reordered = write_cyclonedx("old2.json", list(reversed(OLD)))
+        new_reordered = write_cyclonedx("new2.json", list(reversed(NEW)))
+        main(["sbomdiff", "--sort", sort, old, new])
+        report = capsys.readouterr().out
+        main(["sbomdiff", "--sort", sort, old_reordered, new_reordered])
+        assert capsys.readouterr().out == report
+
+    def test_sorted_json(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", OLD)
+        new = write_cyclonedx("new.json", NEW)
+        main(["sbomdiff", "--sort", "path", "-f", "json", old, new])
+        document = json.loads(capsys.readouterr().out)
+        assert [
+            (record["package"], record.get("path", ""))
+            for record in document["differences"]
+        ] == [
+            ("curl", ""),
+            ("openssl", ""),
+            ("zlib", ""),
+            ("stdlib", "/usr/bin/a-app"),
+        ]
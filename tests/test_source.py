@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for parsing SBOMs from buffers and streams."""
+
+import io
+import json
+import sys
+import tempfile
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.cyclonedx_parser import CycloneDXParser
+from sbomdiff.diff import parse_sbom
+from sbomdiff.server import DiffService
+from sbomdiff.source import open_text, read_text, rereadable, source_name
+from sbomdiff.spdx_parser import SPDXParser
+
+
+class PipeReader(io.RawIOBase):
+    """Stream which cannot be seeked, like a pipe."""
+
+    def __init__(self, content):
+        self.content = io.BytesIO(content)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.content.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def read_bytes(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def no_temporary_files(monkeypatch):
+    def mkstemp(*args, **kwargs):
+        raise AssertionError("Temporary file created")
+
+    monkeypatch.setattr(tempfile, "mkstemp", mkstemp)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", mkstemp)
+
+
+@pytest.fixture
+def stdin(monkeypatch):
+    def set_stdin(content):
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(content)))
+
+    return set_stdin
+
+
+class TestSource:
+    """Test reading the content of a source."""
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            b"\xef\xbb\xbfcontent",
+            bytearray(b"content"),
+            memoryview(b"content"),
+            io.BytesIO(b"content"),
+            io.StringIO("content"),
+        ],
+    )
+    def test_read_text(self, source):
+        assert read_text(source) == "content"
+
+    def test_stream_not_closed(self):
+        stream = io.BytesIO(b"content")
+        with open_text(stream) as f:
+            assert f.read() == "content"
+        assert not stream.closed
+
+    def test_rereadable(self):
+        assert rereadable("sbom.json") == "sbom.json"
+        assert rereadable(b"content") == b"content"
+        assert rereadable(io.BytesIO(b"content")) == b"content"
+        assert rereadable(io.StringIO("content")) == b"content"
+
+    def test_source_name(self):
+        assert source_name("sbom.json") == "sbom.json"
+        assert source_name(b"{}") == "<bytes>"
+        assert source_name(io.BytesIO(b"{}")) == "<stream>"
+
+
+class TestParsers:
+    """Parsers should accept buffers and binary file objects."""
+
+    @pytest.mark.parametrize("wrap", [bytes, memoryview, io.BytesIO, PipeReader])
+    def test_cyclonedx_json(self, cyclonedx_with_path, wrap):
+        expected = CycloneDXParser().parse(cyclonedx_with_path)
+        content = wrap(read_bytes(cyclonedx_with_path))
+        if isinstance(content, PipeReader):
+            content = io.BufferedReader(content)
+        assert CycloneDXParser().parse(content) == expected
+
+    def test_cyclonedx_xml(self, cyclonedx_xml_with_path):
+        expected = CycloneDXParser().parse(cyclonedx_xml_with_path)
+        content = read_bytes(cyclonedx_xml_with_path)
+        assert CycloneDXParser().parse(content) == expected
+        assert CycloneDXParser().parse(content, "xml") == expected
+
+    @pytest.mark.parametrize("fixture", ["spdx_tag_file", "spdx_rdf_file"])
+    def test_spdx(self, fixture, request):
+        sbom_file = request.getfixturevalue(fixture)
+        expected = SPDXParser().parse(sbom_file)
+        assert SPDXParser().parse(read_bytes(sbom_file)) == expected
+        assert SPDXParser().parse(io.BytesIO(read_bytes(sbom_file))) == expected
+
+    def test_explicit_format(self, spdx_tag_file):
+        content = read_bytes(spdx_tag_file)
+        packages = SPDXParser().parse(content, "tag")
+        assert packages[("example-lib", "")] == ["1.0.0", "MIT"]
+        # Content is not examined when the format is specified
+        with pytest.raises(ValueError):
+            SPDXParser().parse(content, "json")
+
+    def test_other_type(self, spdx_tag_file):
+        assert CycloneDXParser().parse(read_bytes(spdx_tag_file)) == {}
+
+
+class TestParseSBOM:
+    """parse_sbom should accept buffers and streams."""
+
+    @pytest.mark.parametrize(
+        "fixture",
+        ["cyclonedx_with_path", "cyclonedx_xml_with_path", "spdx_tag_file"],
+    )
+    def test_parse_sbom(self, fixture, request, no_temporary_files):
+        sbom_file = request.getfixturevalue(fixture)
+        expected = parse_sbom(sbom_file)
+        content = read_bytes(sbom_file)
+        assert parse_sbom(content) == expected
+        assert parse_sbom(io.BytesIO(content)) == expected
+
+    def test_merged_components(self, cyclonedx_duplicate_names):
+        # lib4sbom merges components with the same name and version
+        with open(cyclonedx_duplicate_names) as f:
+            sbom = json.load(f)
+        sbom["components"][0]["version"] = "go1.25.7"
+        content = json.dumps(sbom).encode()
+        packages, _ = parse_sbom(io.BufferedReader(PipeReader(content)))
+        assert sorted(packages) == [
+            ("stdlib", "/app/bin/service-a"),
+            ("stdlib", "/app/bin/service-b"),
+            ("stdlib", "/app/bin/service-c"),
+        ]
+
+
+class TestStandardInput:
+    """The CLI should read a SBOM from standard input."""
+
+    def test_stdin(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, stdin
+    ):
+        expected = main(
+            ["sbomdiff", cyclonedx_version_change_old, cyclonedx_version_change_new]
+        )
+        stdin(read_bytes(cyclonedx_version_change_new))
+        assert main(["sbomdiff", cyclonedx_version_change_old, "-"]) == expected
+
+    def test_stdin_json_output(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, stdin, capsys
+    ):
+        stdin(read_bytes(cyclonedx_version_change_old))
+        main(["sbomdiff", "-f", "json", "-", cyclonedx_version_change_new])
+        output = json.loads(capsys.readouterr().out)
+        assert output["summary"]["version_changes"] == 2
+
+    def test_stdin_fail_fast(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, stdin
+    ):
+        stdin(read_bytes(cyclonedx_version_change_new))
+        args = ["sbomdiff", "-q", "--fail-fast", cyclonedx_version_change_old, "-"]
+        assert main(args) == 1
+
+    def test_watch_rejected(self, cyclonedx_version_change_old, capsys):
+        assert main(["sbomdiff", "--watch", cyclonedx_version_change_old, "-"]) == -1
+        assert "standard input" in capsys.readouterr().out
+
+
+class TestServiceContent:
+    """The service should parse uploaded content in memory."""
+
+    def test_tag_value_content(self, spdx_tag_file, no_temporary_files):
+        with open(spdx_tag_file) as f:
+            content = f.read()
+        document = DiffService().diff(
+            {"content1": content, "content2": content.replace("1.0.0", "1.1.0")}
+        )
+        assert document["summary"]["version_changes"] == 1
@@ -93,6 +93,120 @@ class TestSPDXParserJSON:
         assert license == "MIT"
 
 
+class TestSPDXParserJSONLD:
+    """Test SPDX 3.0 JSON-LD parsing."""
+
+    @pytest.fixture
+    def spdx3_file(self, temp_dir):
+        """Create a sample SPDX 3.0 JSON-LD file."""
+        sbom = {
+            "@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",
+            "@graph": [
+                {"type": "CreationInfo", "@id": "_:creationinfo0"},
+                {
+                    "type": "Relationship",
+                    "spdxId": "urn:rel-1",
+                    "relationshipType": "hasConcludedLicense",
+                    "from": "urn:pkg-1",
+                    "to": ["urn:license-1"],
+                },
+                {
+                    "type": "simplelicensing_LicenseExpression",
+                    "spdxId": "urn:license-1",
+                    "simplelicensing_licenseExpression": "MIT",
+                },
+                {
+                    "type": "software_Package",
+                    "spdxId": "urn:pkg-1",
+                    "name": "example-lib",
+                    "software_packageVersion": "1.0.0",
+                },
+                {
+                    "type": "software_Package",
+                    "spdxId": "urn:pkg-2",
+                    "name": "another-lib",
+                    "software_packageVersion": "2.0.0",
+                },
+                {
+                    "type": "Relationship",
+                    "spdxId": "urn:rel-2",
+                    "relationshipType": "hasDeclaredLicense",
+                    "from": "urn:pkg-2",
+                    "to": ["https://spdx.org/licenses/Apache-2.0"],
+                },
+                {
+                    "type": "Relationship",
+                    "spdxId": "urn:rel-3",
+                    "relationshipType": "dependsOn",
+                    "from": "urn:pkg-2",
+                    "to": ["urn:pkg-1"],
+                },
+            ],
+        }
+        filepath = temp_dir / "test.spdx3.json"
+        filepath.write_text(json.dumps(sbom, indent=2))
+        return str(filepath)
+
+    def test_parse_jsonld(self, spdx3_file):
+        """Licenses should be resolved from license elements."""
+        parser = SPDXParser()
+        packages = parser.parse(spdx3_file)
+
+        assert packages == {
+            ("example-lib", ""): ["1.0.0", "MIT"],
+            ("another-lib", ""): ["2.0.0", "Apache-2.0"],
+        }
+
+    def test_parse_jsonld_dependencies(self, spdx3_file):
+        """Relationships should be resolved to package names."""
+        parser = SPDXParser()
+        parser.parse(spdx3_file)
+
+        assert parser.get_dependencies() == [("another-lib", "example-lib")]
+
+    def test_parse_jsonld_listed_license(self, temp_dir):
+        """Listed licenses should be reported by their identifier."""
+        sbom = {
+            "@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",
+            "@graph": [
+                {
+                    "type": "software_Package",
+                    "spdxId": "urn:pkg",
+                    "name": "lib",
+                    "software_packageVersion": "1.0",
+                },
+                {
+                    "type": "expandedlicensing_ListedLicense",
+                    "spdxId": "https://spdx.org/licenses/Apache-2.0",
+                    "name": "Apache License 2.0",
+                },
+                {
+                    "type": "Relationship",
+                    "relationshipType": "hasConcludedLicense",
+                    "from": "urn:pkg",
+                    "to": ["https://spdx.org/licenses/Apache-2.0"],
+                },
+            ],
+        }
+        filepath = temp_dir / "test.jsonld"
+        filepath.write_text(json.dumps(sbom))
+        parser = SPDXParser()
+
+        assert parser.parse(str(filepath)) == {("lib", ""): ["1.0", "Apache-2.0"]}
+
+    def test_parse_jsonld_without_license(self, temp_dir):
+        """Packages without a license relationship have no license."""
+        sbom = {
+            "@context": "https://spdx.org/rdf/3.0.1/spdx-context.jsonld",
+            "@graph": [{"@type": "Package", "@id": "urn:pkg", "name": "lib"}],
+        }
+        filepath = temp_dir / "test.jsonld"
+        filepath.write_text(json.dumps(sbom))
+        parser = SPDXParser()
+
+        assert parser.parse(str(filepath)) == {("lib", ""): ["UNKNOWN", "NOT FOUND"]}
+
+
 class TestSPDXParserYAML:
     """Test SPDX YAML parsing with tuple keys."""
 
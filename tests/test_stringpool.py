@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the pool of strings shared by parsed SBOMs."""
+
+import sys
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff, parse_sbom
+from sbomdiff.multimap import Instances
+from sbomdiff.stringpool import StringPool, table_strings
+
+
+def copy(value):
+    # Create a distinct string object with the same value
+    return "".join(list(value))
+
+
+class TestStringPool:
+    """Test interning of strings."""
+
+    def test_equal_strings_shared(self):
+        pool = StringPool()
+        first = pool.intern(copy("BSD-3-Clause"))
+        second = pool.intern(copy("BSD-3-Clause"))
+        assert first is second
+        assert len(pool) == 1
+
+    def test_bytes_saved(self):
+        pool = StringPool()
+        value = copy("go1.25.6")
+        pool.intern(value)
+        assert pool.saved == 0
+        pool.intern(copy("go1.25.6"))
+        assert pool.saved == sys.getsizeof(value)
+
+    def test_non_string_unchanged(self):
+        pool = StringPool()
+        assert pool.intern(None) is None
+        assert len(pool) == 0
+
+    def test_intern_checksums(self):
+        pool = StringPool()
+        checksums1 = pool.intern_checksums([[copy("SHA256"), copy("abc")]])
+        checksums2 = pool.intern_checksums([[copy("SHA256"), copy("abc")]])
+        assert checksums1 == [["SHA256", "abc"]]
+        assert checksums1[0][0] is checksums2[0][0]
+        assert pool.intern_checksums(None) is None
+
+    def test_retain(self):
+        pool = StringPool()
+        used = pool.intern(copy("1.0"))
+        pool.intern(copy("2.0"))
+        pool.retain([copy("1.0"), "3.0"])
+        assert len(pool) == 1
+        assert pool.intern(copy("1.0")) is used
+
+    def test_table_strings(self):
+        packages = {
+            ("zlib", ""): ["1.3", "Zlib", [["SHA256", "abc"]]],
+            ("stdlib", "/bin/a"): Instances([["go1.24", None, None], None]),
+        }
+        assert list(table_strings(packages)) == [
+            "zlib",
+            "",
+            "1.3",
+            "Zlib",
+            "SHA256",
+            "abc",
+            "stdlib",
+            "/bin/a",
+            "go1.24",
+            None,
+            None,
+        ]
+
+
+class TestSharedPool:
+    """Strings should be shared between the parsed SBOMs."""
+
+    def test_strings_shared_between_sboms(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new
+    ):
+        pool = StringPool()
+        packages1, _ = parse_sbom(cyclonedx_version_change_old, string_pool=pool)
+        packages2, _ = parse_sbom(cyclonedx_version_change_new, string_pool=pool)
+        for key1, package1 in packages1.items():
+            key2 = next(key for key in packages2 if key == key1)
+            assert key1[0] is key2[0]
+            assert package1[1] is packages2[key2][1]
+        assert pool.saved > 0
+
+    def test_identical_packages_not_reported(self):
+        pool = StringPool()
+        package = [pool.intern(copy("1.0")), pool.intern(copy("MIT")), None]
+        same = [pool.intern(copy("1.0")), pool.intern(copy("MIT")), None]
+        assert SBOMDiff().changed_record(("lib", ""), package, same) is None
+
+    def test_debug_reports_saving(
+        self, cyclonedx_version_change_old, cyclonedx_version_change_new, capsys
+    ):
+        main(
+            [
+                "sbomdiff",
+                "-d",
+                cyclonedx_version_change_old,
+                cyclonedx_version_change_new,
+            ]
+        )
+        captured = capsys.readouterr()
+        assert "String pool - bytes saved" in captured.out
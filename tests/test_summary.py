@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for reporting only the summary of differences."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.multimap import Instances
+from sbomdiff.render import TextRenderer
+from sbomdiff.versions import DOWNGRADE, UPGRADE
+
+PACKAGES1 = {
+    ("zlib", ""): ["1.2.11", "Zlib", [["SHA256", "aaa"]]],
+    ("openssl", ""): ["3.0.2", "Apache-2.0", [["SHA256", "bbb"]]],
+    ("bash", ""): ["5.2", "GPL-3.0-or-later", None],
+    ("curl", ""): ["8.0.1", "curl", None],
+    ("stdlib", ""): Instances([["go1.24.1", "BSD", None], ["go1.25.1", "BSD", None]]),
+}
+
+PACKAGES2 = {
+    ("zlib", ""): ["1.2.13", "Zlib", [["SHA256", "ccc"]]],
+    ("openssl", ""): ["3.0.1", "OpenSSL", [["SHA256", "bbb"]]],
+    ("bash", ""): ["5.2", "GPL-3.0-only", None],
+    ("wget", ""): ["1.21", "GPL-3.0-or-later", None],
+    ("stdlib", ""): Instances([["go1.24.2", "BSD", None], ["go1.25.1", "BSD", None]]),
+}
+
+
+class TestCountDifferences:
+    """Counting should give the same summary as generating the records."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"exclude_license": True},
+            {"checksum": "SHA256"},
+            {"version_filter": UPGRADE},
+            {"version_filter": DOWNGRADE, "checksum": "SHA256"},
+        ],
+    )
+    def test_same_summary(self, options):
+        sbom_diff = SBOMDiff(**options)
+        list(sbom_diff.compare(PACKAGES1, PACKAGES2))
+        counter = SBOMDiff(**options)
+        counter.count_differences(PACKAGES1, PACKAGES2)
+        assert counter.get_summary() == sbom_diff.get_summary()
+        assert counter.has_differences() == sbom_diff.has_differences()
+
+    def test_no_differences(self):
+        sbom_diff = SBOMDiff()
+        sbom_diff.count_differences(PACKAGES1, PACKAGES1)
+        assert not sbom_diff.has_differences()
+
+
+class TestSummaryOutput:
+    """Test the output of the summary."""
+
+    def test_render_summary(self, capsys):
+        sbom_diff = SBOMDiff()
+        sbom_diff.count_differences(PACKAGES1, PACKAGES2)
+        TextRenderer().render_summary(sbom_diff)
+        assert capsys.readouterr().out == (
+            "\nSummary\n-------\n"
+            "Version changes:  3\n"
+            "License changes:  2\n"
+            "Removed packages: 1\n"
+            "New packages:     1\n"
+        )
+
+    def test_document_without_differences(self):
+        sbom_diff = SBOMDiff()
+        sbom_diff.count_differences(PACKAGES1, PACKAGES2)
+        document = sbom_diff.generate_document("a.json", "b.json")
+        assert "differences" not in document
+        assert document["summary"]["version_changes"] == 3
+
+
+class TestSummaryOnlyOption:
+    """Test the --summary-only option."""
+
+    @pytest.fixture
+    def sboms(self, write_cyclonedx):
+        return [
+            write_cyclonedx(name, [("zlib", version), ("bash", "5.2")])
+            for name, version in (("old.json", "1.2.11"), ("new.json", "1.2.13"))
+        ]
+
+    def test_text(self, sboms, capsys):
+        assert main(["sbomdiff", "--summary-only", *sboms]) == 1
+        captured = capsys.readouterr()
+        assert captured.out.startswith("\nSummary\n")
+        assert "Version changes:  1" in captured.out
+        assert "[VERSION]" not in captured.out
+
+    def test_json(self, sboms, capsys):
+        main(["sbomdiff", "--summary-only", "-f", "json", *sboms])
+        document = json.loads(capsys.readouterr().out)
+        assert "differences" not in document
+        assert document["summary"]["version_changes"] == 1
@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the flat encoding of package tables."""
+
+import multiprocessing
+
+import pytest
+
+from sbomdiff.diff import SBOMDiff
+from sbomdiff.multimap import Instances
+from sbomdiff.table import (
+    PackageTable,
+    SharedPackageTable,
+    encode_table,
+    is_table_file,
+    match_keys,
+    open_table,
+    write_table,
+)
+
+PACKAGES = {
+    ("zlib", ""): ["1.2.13", "Zlib", [["SHA256", "aaa"], ["MD5", "bbb"]]],
+    ("bash", "/usr/bin/bash"): ["5.2", None, None],
+    ("stdlib", "/usr/bin/app"): Instances(
+        [["go1.24.1", "BSD-3-Clause", []], ["go1.25.1", "BSD-3-Clause", None]]
+    ),
+    ("pkg:npm/%40babel/core", ""): ["7.0.0", "MIT", None],
+    ("bibliothèque", "/opt/données"): ["1.0", "MIT", None],
+}
+
+
+def read_shared(name):
+    shared = SharedPackageTable.attach(name)
+    try:
+        return dict(shared.table.items())
+    finally:
+        shared.close()
+
+
+class TestPackageTable:
+    """Test reading an encoded package table."""
+
+    def test_round_trip(self):
+        table = PackageTable(encode_table(PACKAGES))
+        assert len(table) == len(PACKAGES)
+        # Keys are in the order of the encoded table
+        assert list(table) == list(PACKAGES)
+        assert dict(table.items()) == PACKAGES
+        assert isinstance(table[("stdlib", "/usr/bin/app")], Instances)
+
+    def test_lookup(self):
+        table = PackageTable(encode_table(PACKAGES))
+        assert table[("bash", "/usr/bin/bash")] == ["5.2", None, None]
+        assert ("bash", "") not in table
+        assert table.get(("bash", "")) is None
+        with pytest.raises(KeyError):
+            table[("wget", "")]
+
+    def test_hash_collisions(self, monkeypatch):
+        monkeypatch.setattr("sbomdiff.table.key_hash", lambda key_bytes: 42)
+        table = PackageTable(encode_table(PACKAGES))
+        for package_key, package in PACKAGES.items():
+            assert table[package_key] == package
+        assert ("wget", "") not in table
+
+    def test_ranges(self):
+        table = PackageTable(encode_table(PACKAGES))
+        assert list(table.keys_range(1, 3)) == list(PACKAGES)[1:3]
+        assert dict(table.items_range(3, 10)) == dict(list(PACKAGES.items())[3:])
+
+    def test_empty(self):
+        table = PackageTable(encode_table({}))
+        assert len(table) == 0
+        assert ("zlib", "") not in table
+
+    def test_shared_strings(self):
+        packages = {(f"pkg{i}", ""): ["1.0.0", "Apache-2.0", None] for i in range(100)}
+        single = len(encode_table({("pkg0", ""): ["1.0.0", "Apache-2.0", None]}))
+        # Version and license are only held once
+        assert len(encode_table(packages)) < 100 * single
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            PackageTable(bytes(64))
+
+    def test_compare(self):
+        packages2 = dict(PACKAGES)
+        packages2[("zlib", "")] = ["1.3", "Zlib", None]
+        del packages2[("bash", "/usr/bin/bash")]
+        expected = list(SBOMDiff().compare(PACKAGES, packages2))
+        table1 = PackageTable(encode_table(PACKAGES))
+        table2 = PackageTable(encode_table(packages2))
+        assert list(SBOMDiff().compare(table1, table2)) == expected
+
+
+class TestSharedPackageTable:
+    """Test sharing an encoded package table between processes."""
+
+    def test_attach(self):
+        with SharedPackageTable.create(PACKAGES) as shared:
+            attached = SharedPackageTable.attach(shared.name)
+            assert dict(attached.table.items()) == PACKAGES
+            attached.close()
+
+    def test_worker_process(self):
+        context = multiprocessing.get_context("spawn")
+        with SharedPackageTable.create(PACKAGES) as shared:
+            with context.Pool(1) as pool:
+                assert pool.apply(read_shared, (shared.name,)) == PACKAGES
+
+
+class TestMatchKeys:
+    """Test matching the keys of two encoded tables."""
+
+    def test_match(self):
+        packages2 = dict(PACKAGES)
+        del packages2[("bash", "/usr/bin/bash")]
+        packages2[("wget", "")] = ["1.21", "GPL-3.0-or-later", None]
+        table1 = PackageTable(encode_table(PACKAGES))
+        table2 = PackageTable(encode_table(packages2))
+        partners, matched = match_keys(table1, table2)
+        for number, partner in enumerate(partners):
+            key = table1.key(number)
+            if key in packages2:
+                assert table2.key(partner) == key
+            else:
+                assert partner == -1
+        assert [table2.key(n) for n, found in enumerate(matched) if not found] == [
+            ("wget", "")
+        ]
+
+    def test_hash_collisions(self, monkeypatch):
+        monkeypatch.setattr("sbomdiff.table.key_hash", lambda key_bytes: 7)
+        packages2 = dict(reversed(list(PACKAGES.items())))
+        table1 = PackageTable(encode_table(PACKAGES))
+        table2 = PackageTable(encode_table(packages2))
+        partners, matched = match_keys(table1, table2)
+        assert [table2.key(partner) for partner in partners] == list(PACKAGES)
+        assert all(matched)
+
+    def test_same_value(self):
+        packages2 = dict(PACKAGES)
+        packages2[("zlib", "")] = ["1.2.13", "Zlib", [["SHA256", "aaa"]]]
+        table1 = PackageTable(encode_table(PACKAGES))
+        table2 = PackageTable(encode_table(packages2))
+        partners, _ = match_keys(table1, table2)
+        same = [
+            table1.same_value(number, table2, partner)
+            for number, partner in enumerate(partners)
+        ]
+        assert same == [key != ("zlib", "") for key in PACKAGES]
+
+
+class TestTableFile:
+    """Test writing and memory mapping an encoded table."""
+
+    def test_open(self, temp_dir):
+        filename = str(temp_dir / "sbom.sbomidx")
+        write_table(PACKAGES, filename)
+        assert is_table_file(filename)
+        table = open_table(filename)
+        assert dict(table.items()) == PACKAGES
+
+    def test_not_table(self, spdx_tag_file):
+        assert not is_table_file(spdx_tag_file)
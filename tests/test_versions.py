@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for version ordering and classification of version changes."""
+
+import json
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.versions import (
+    DOWNGRADE,
+    EQUIVALENT,
+    INCOMPARABLE,
+    UPGRADE,
+    classify_version_change,
+    guess_ecosystem,
+    parse_version,
+    purl_ecosystem,
+)
+
+
+class TestClassifyVersionChange:
+    """Test ordering of versions for each ecosystem."""
+
+    @pytest.mark.parametrize(
+        "version1, version2, ecosystem, expected",
+        [
+            ("1.0.0", "1.0.1", "semver", UPGRADE),
+            ("1.0.0", "1.0.0-rc.1", "semver", DOWNGRADE),
+            ("1.0.0-alpha.1", "1.0.0-alpha.beta", "semver", UPGRADE),
+            ("1.0.0+build1", "1.0.0+build2", "semver", EQUIVALENT),
+            ("1.0", "1.0.0", "pep440", EQUIVALENT),
+            ("1.0.dev1", "1.0a1", "pep440", UPGRADE),
+            ("1.0rc1", "1.0", "pep440", UPGRADE),
+            ("1.0.post1", "1.0", "pep440", DOWNGRADE),
+            ("1!1.0", "2.0", "pep440", DOWNGRADE),
+            ("2.35-0ubuntu3.12", "2.35-0ubuntu3.13", "debian", UPGRADE),
+            ("1.0~rc1", "1.0", "debian", UPGRADE),
+            ("1:1.0", "2.0", "debian", DOWNGRADE),
+            ("1.0", "1.0a", "debian", UPGRADE),
+            ("4.18.0-348.el8", "4.18.0-305.el8", "rpm", DOWNGRADE),
+            ("1.0^git1", "1.0.1", "rpm", UPGRADE),
+            ("1.0", "1.0^git1", "rpm", UPGRADE),
+            ("go1.25.6", "go1.25.7", "golang", UPGRADE),
+            ("go1.21rc2", "go1.21.0", "golang", UPGRADE),
+            (
+                "v0.0.0-20191109021931-daa7c04131f5",
+                "v0.0.0-20200101000000-aaaaaaaaaaaa",
+                "golang",
+                UPGRADE,
+            ),
+            ("v1.2.0-0.20191109021931-daa7c04131f5", "v1.2.0", "golang", UPGRADE),
+            ("3.0.2-r9", "3.0.2-r10", "apk", UPGRADE),
+            ("1.0_rc1-r0", "1.0-r0", "apk", UPGRADE),
+            ("1.0_p1", "1.0", "apk", DOWNGRADE),
+            ("latest", "1.0", "semver", INCOMPARABLE),
+        ],
+    )
+    def test_ecosystem_ordering(self, version1, version2, ecosystem, expected):
+        assert classify_version_change(version1, version2, ecosystem) == expected
+
+    def test_guess_ecosystem(self):
+        """Should identify the ecosystem from the syntax of the versions."""
+        assert guess_ecosystem("go1.25.6", "go1.25.7") == "golang"
+        assert guess_ecosystem("1.2.3", "1.2.4") == "semver"
+        assert guess_ecosystem("1.2.3-1ubuntu1", "1.2.3-2ubuntu1") == "debian"
+        assert guess_ecosystem("4.18.0-348.el8", "4.18.0-305.el8") == "rpm"
+        assert guess_ecosystem("1.0", "1.0rc1") == "pep440"
+        assert guess_ecosystem("2.4.1", "2.4.1-r0") == "apk"
+
+    @pytest.mark.parametrize(
+        "version1, version2, expected",
+        [
+            ("3.0.2-r9", "3.0.2-r10", UPGRADE),
+            ("1.36.1-r2", "1.36.1-r15", UPGRADE),
+            ("2.4.1", "2.4.1-r0", EQUIVALENT),
+        ],
+    )
+    def test_apk_revisions(self, version1, version2, expected):
+        """Alpine revisions should not be ordered as semver pre-releases."""
+        assert classify_version_change(version1, version2) == expected
+
+    def test_purl_ecosystem(self):
+        assert purl_ecosystem("pkg:apk/alpine/busybox") == "apk"
+        assert purl_ecosystem("pkg:pypi/requests") == "pep440"
+        assert purl_ecosystem("pkg:generic/zlib") is None
+        assert purl_ecosystem(None) is None
+
+    def test_non_numeric_versions_incomparable(self):
+        assert classify_version_change("abc", "def") == INCOMPARABLE
+
+    def test_parsed_versions_are_memoised(self):
+        """Repeated parsing of a version should be served from the cache."""
+        parse_version.cache_clear()
+        parse_version("9.9.9", "semver")
+        parse_version("9.9.9", "semver")
+        info = parse_version.cache_info()
+        assert info.hits == 1
+        assert info.maxsize is not None
+
+
+class TestVersionDirectionReporting:
+    """Test reporting of the direction of version changes."""
+
+    @pytest.fixture
+    def sboms(self, write_cyclonedx):
+        old = write_cyclonedx(
+            "old.json", [("up", "1.0.0"), ("down", "2.0.0"), ("gone", "1.0.0")]
+        )
+        new = write_cyclonedx(
+            "new.json", [("up", "1.1.0"), ("down", "1.9.0"), ("new", "1.0.0")]
+        )
+        return old, new
+
+    def test_text_output_shows_direction(self, sboms, capsys):
+        main(["sbomdiff", *sboms])
+        captured = capsys.readouterr()
+        assert "Version changed from 1.0.0 to 1.1.0 (upgrade)" in captured.out
+        assert "Version changed from 2.0.0 to 1.9.0 (downgrade)" in captured.out
+
+    def test_json_output_includes_direction(self, sboms, temp_dir):
+        output_file = str(temp_dir / "output.json")
+        main(["sbomdiff", "-f", "json", "-o", output_file, *sboms])
+        with open(output_file) as f:
+            output = json.load(f)
+        directions = {
+            d["package"]: d["version"].get("direction") for d in output["differences"]
+        }
+        assert directions["up"] == UPGRADE
+        assert directions["down"] == DOWNGRADE
+
+    def test_only_downgrades(self, sboms, capsys):
+        """Should only report packages which have been downgraded."""
+        result = main(["sbomdiff", "--only-downgrades", *sboms])
+        captured = capsys.readouterr()
+        assert "down" in captured.out
+        assert "[REMOVED]" not in captured.out
+        assert "[ADDED  ]" not in captured.out
+        assert "Version changes:  1" in captured.out
+        assert result == 1
+
+    def test_only_upgrades(self, sboms, capsys):
+        main(["sbomdiff", "--only-upgrades", *sboms])
+        captured = capsys.readouterr()
+        assert "(upgrade)" in captured.out
+        assert "(downgrade)" not in captured.out
+
+    def test_purl_selects_ecosystem(self, write_cyclonedx, capsys):
+        """The ecosystem of a purl should be used when matching on purls."""
+        old = write_cyclonedx(
+            "old.json",
+            [{"name": "lib", "version": "1.0.0-r1", "purl": "pkg:npm/lib@1.0.0-r1"}],
+        )
+        new = write_cyclonedx(
+            "new.json",
+            [{"name": "lib", "version": "1.0.0", "purl": "pkg:npm/lib@1.0.0"}],
+        )
+        main(["sbomdiff", "--match", "purl", old, new])
+        assert "(upgrade)" in capsys.readouterr().out
+        args = ["sbomdiff", "--only-upgrades", "--quiet", old, new]
+        assert main(args[:1] + ["--match", "purl"] + args[1:]) == 1
+        # Versions alone are ordered as apk revisions
+        assert main(args) == 0
@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for watch mode."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from sbomdiff.cli import main
+from sbomdiff.watch import WatchedFile, watch
+
+
+def set_mtime(filepath, mtime_ns):
+    os.utime(filepath, ns=(mtime_ns, mtime_ns))
+
+
+class TestWatchedFile:
+    """Test detection of changes to a file."""
+
+    def watched_file(self, temp_dir):
+        filepath = temp_dir / "data.txt"
+        filepath.write_text("first")
+        loads = []
+
+        def load(filename):
+            loads.append(filename)
+            with open(filename) as f:
+                return f.read()
+
+        return filepath, WatchedFile(str(filepath), load), loads
+
+    def test_initial_load(self, temp_dir):
+        _, watched, loads = self.watched_file(temp_dir)
+        assert watched.refresh()
+        assert watched.data == "first"
+        assert len(loads) == 1
+
+    def test_unchanged_file_not_loaded(self, temp_dir):
+        _, watched, loads = self.watched_file(temp_dir)
+        watched.refresh()
+        assert not watched.refresh()
+        assert len(loads) == 1
+
+    def test_touched_file_not_loaded(self, temp_dir):
+        filepath, watched, loads = self.watched_file(temp_dir)
+        watched.refresh()
+        set_mtime(filepath, 1_000_000_000)
+        assert not watched.refresh()
+        assert len(loads) == 1
+
+    def test_changed_file_loaded(self, temp_dir):
+        filepath, watched, loads = self.watched_file(temp_dir)
+        watched.refresh()
+        filepath.write_text("second")
+        set_mtime(filepath, 2_000_000_000)
+        assert watched.refresh()
+        assert watched.data == "second"
+        assert len(loads) == 2
+
+    def test_missing_file_ignored(self, temp_dir):
+        filepath, watched, loads = self.watched_file(temp_dir)
+        watched.refresh()
+        filepath.unlink()
+        assert not watched.refresh()
+        assert watched.data == "first"
+
+    def test_load_error_keeps_data(self, temp_dir):
+        filepath = temp_dir / "data.txt"
+        filepath.write_text("first")
+        errors = []
+
+        def load(filename):
+            with open(filename) as f:
+                content = f.read()
+            if content == "partial":
+                raise ValueError("incomplete")
+            return content
+
+        watched = WatchedFile(
+            str(filepath), load, lambda watched, error: errors.append(error)
+        )
+        watched.refresh()
+        filepath.write_text("partial")
+        set_mtime(filepath, 2_000_000_000)
+        assert not watched.refresh()
+        assert watched.data == "first"
+        assert [str(error) for error in errors] == ["incomplete"]
+        # Loaded again once the file has changed
+        filepath.write_text("second")
+        set_mtime(filepath, 3_000_000_000)
+        assert watched.refresh()
+        assert watched.data == "second"
+
+    def test_first_load_error_raised(self, temp_dir):
+        filepath = temp_dir / "data.txt"
+        filepath.write_text("partial")
+
+        def load(filename):
+            raise ValueError("incomplete")
+
+        with pytest.raises(ValueError):
+            WatchedFile(str(filepath), load).refresh()
+
+
+class TestWatch:
+    """Test polling of files."""
+
+    def test_only_changed_file_reported(self, temp_dir):
+        file1 = temp_dir / "one.txt"
+        file2 = temp_dir / "two.txt"
+        file1.write_text("one")
+        file2.write_text("two")
+        watched1 = WatchedFile(str(file1), lambda filename: None)
+        watched2 = WatchedFile(str(file2), lambda filename: None)
+        watched1.refresh()
+        watched2.refresh()
+
+        def sleep(interval):
+            file2.write_text("changed")
+            set_mtime(file2, 3_000_000_000)
+
+        changes = []
+        result = watch(
+            [watched1, watched2],
+            lambda changed: changes.append(changed) or len(changes),
+            max_changes=1,
+            sleep=sleep,
+        )
+        assert result == 1
+        assert changes == [[watched2]]
+
+    def test_interrupted(self):
+        def sleep(interval):
+            raise KeyboardInterrupt
+
+        assert watch([], lambda changed: 1, sleep=sleep) is None
+
+
+class TestWatchOption:
+    """Test the --watch option."""
+
+    def test_report_repeated(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", [("zlib", "1.2.11")])
+        new = write_cyclonedx("new.json", [("zlib", "1.2.11")])
+        polls = []
+
+        def sleep(interval):
+            polls.append(interval)
+            if len(polls) == 1:
+                write_cyclonedx("new.json", [("zlib", "1.2.13")])
+                set_mtime(new, 4_000_000_000)
+            else:
+                raise KeyboardInterrupt
+
+        with patch("sbomdiff.watch.time.sleep", sleep):
+            result = main(["sbomdiff", "--watch", "--interval", "0.5", old, new])
+        captured = capsys.readouterr()
+        assert result == 1
+        assert polls == [0.5, 0.5]
+        assert captured.out.count("Summary") == 2
+        assert "[VERSION] zlib: Version changed from 1.2.11 to 1.2.13" in captured.out
+
+    def test_partially_written_file(self, write_cyclonedx, capsys):
+        old = write_cyclonedx("old.json", [("zlib", "1.2.11")])
+        new = write_cyclonedx("new.json", [("zlib", "1.2.11")])
+        polls = []
+
+        def sleep(interval):
+            polls.append(interval)
+            if len(polls) == 1:
+                with open(new) as f:
+                    content = f.read()
+                with open(new, "w") as f:
+                    f.write(content[: len(content) // 2])
+                set_mtime(new, 4_000_000_000)
+            elif len(polls) == 2:
+                write_cyclonedx("new.json", [("zlib", "1.2.13")])
+                set_mtime(new, 5_000_000_000)
+            else:
+                raise KeyboardInterrupt
+
+        with patch("sbomdiff.watch.time.sleep", sleep):
+            result = main(["sbomdiff", "--watch", old, new])
+        captured = capsys.readouterr()
+        assert result == 1
+        assert f"Unable to load {new}" in captured.out
+        assert captured.out.count("Summary") == 2
+        assert "[VERSION] zlib: Version changed from 1.2.11 to 1.2.13" in captured.out
+
+    @pytest.mark.parametrize("interval", ["0", "-1"])
+    def test_invalid_interval(self, write_cyclonedx, interval, capsys):
+        old = write_cyclonedx("old.json", [("zlib", "1.2.11")])
+        new = write_cyclonedx("new.json", [("zlib", "1.2.13")])
+        assert main(["sbomdiff", "--watch", "--interval", interval, old, new]) == -1
+        assert "Interval" in capsys.readouterr().out